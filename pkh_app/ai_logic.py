@@ -1,4 +1,5 @@
 import logging
+from pkh_app.battle_engine.damage import calc_fingerprint, field_fingerprint
 
 class MoveScorer:
     def __init__(self):
@@ -107,11 +108,104 @@ class MoveScorer:
         return scored_moves
 
 
+def _max_roll(results):
+    """Highest max roll over a list of calc results (0 if none)."""
+    best = 0
+    for res in results or []:
+        dmg = (res.get('damage_rolls') or [0])[-1]
+        if dmg > best:
+            best = dmg
+    return best
+
+
+# Moves whose damage reads exact HP beyond calc_fingerprint's thresholds
+USER_HP_MOVES = frozenset(('Eruption', 'Water Spout', 'Dragon Energy', 'Flail', 'Reversal', 'Final Gambit'))
+TARGET_HP_MOVES = frozenset(("Super Fang", "Nature's Madness", 'Ruination', 'Endeavor',
+                             'Crush Grip', 'Wring Out', 'Hard Press'))
+
+
+class MatchupMatrix:
+    """
+    Max damage of every AI party member against the player's active and of
+    the player's active against every party member, for SwitchPredictor.
+
+    Rows are cached per opponent team and keyed by party slot. On update
+    only the members whose calc inputs changed (HP thresholds, stat stages,
+    status, item...) are recomputed; a change to the player's active that
+    the calc can see, or to the field, recomputes every row. Exact HP is
+    part of a key only when some move in the matchup reads it (Eruption,
+    Super Fang...), so ordinary chip damage on the player keeps the rows.
+    Both directions are one batched call each (calc_matchups /
+    calc_attackers) when the calc client supports it.
+    """
+
+    def __init__(self, calc_client):
+        self.calc_client = calc_client
+        self.team = None
+        self.context = None
+        # party slot -> (mon key, max damage dealt to player, max damage taken)
+        self.rows = {}
+        self.rows_computed = 0
+
+    def update(self, candidates, player_active, field):
+        team = tuple(mon.get('species') for mon in candidates)
+        player_moves = player_active.get('moves') or ()
+        team_moves = set()
+        for mon in candidates:
+            team_moves.update(mon.get('moves') or ())
+        context = (_mon_key(player_active, team_moves), field_fingerprint(field))
+        if team != self.team or context != self.context:
+            self.team, self.context = team, context
+            self.rows = {}
+
+        dirty, slots = [], []
+        for i, mon in enumerate(candidates):
+            if mon.get('current_hp', 0) <= 0:
+                continue
+            row = self.rows.get(i)
+            if row is None or row[0] != _mon_key(mon, player_moves):
+                dirty.append(mon)
+                slots.append(i)
+        if not dirty:
+            return self
+
+        client = self.calc_client
+        batch = getattr(client, 'calc_matchups', None)
+        if batch is not None:
+            taken = batch(player_active, dirty, list(player_moves), field)
+        else:
+            taken = [client.get_damage_rolls(player_active, mon, list(player_moves), field) for mon in dirty]
+        reverse = getattr(client, 'calc_attackers', None)
+        if reverse is not None:
+            dealt = reverse(dirty, player_active, field)
+        else:
+            dealt = [client.get_damage_rolls(mon, player_active, mon.get('moves', []), field) for mon in dirty]
+        for i, mon, mon_res, player_res in zip(slots, dirty, dealt, taken):
+            self.rows[i] = (_mon_key(mon, player_moves), _max_roll(mon_res), _max_roll(player_res))
+        self.rows_computed += len(dirty)
+        return self
+
+    def dealt(self, slot):
+        """Max damage the party member in `slot` deals to the player's active."""
+        return self.rows[slot][1]
+
+    def taken(self, slot):
+        """Max damage the player's active deals to the party member in `slot`."""
+        return self.rows[slot][2]
+
+
+def _mon_key(mon, opponent_moves):
+    moves = tuple(mon.get('moves') or ())
+    # Exact HP only when a move in the matchup reads it
+    reads_hp = not USER_HP_MOVES.isdisjoint(moves) or not TARGET_HP_MOVES.isdisjoint(opponent_moves)
+    return (calc_fingerprint(mon), mon.get('current_hp') if reads_hp else None, moves)
+
+
 class SwitchPredictor:
     def __init__(self):
-        pass
+        self.matchups = None
 
-    def predict_switch(self, candidates, player_active, calc_client):
+    def predict_switch(self, candidates, player_active, calc_client, field=None):
         """
         Evaluates potential switch-ins using the Switch Score Matrix.
         
@@ -119,6 +213,7 @@ class SwitchPredictor:
             candidates (list): List of opponent party pokemon (dicts).
             player_active (dict): Player's active pokemon.
             calc_client (object): Object with get_damage_rolls method.
+            field (dict): Field conditions (weather, screens...) for the calcs.
             
         Returns:
             dict: The best candidate and the logic breakdown.
@@ -127,6 +222,10 @@ class SwitchPredictor:
         best_candidate = None
         explanations = []
         
+        if self.matchups is None or self.matchups.calc_client is not calc_client:
+            self.matchups = MatchupMatrix(calc_client)
+        matchups = self.matchups.update(candidates, player_active, field or {})
+        
         player_speed = player_active.get('stats', {}).get('spe', 0)
         player_hp = player_active.get('current_hp', 1)
         player_max_hp = player_active.get('max_hp', 1)
@@ -144,40 +243,12 @@ class SwitchPredictor:
             am_fast = mon_speed >= player_speed
             
             # 2. Get Calcs
-            # We need:
             # - Max damage Mon deals to Player (to check OHKO)
             # - Max damage Player deals to Mon (to check Survival)
-            
-            # This is synchronous and expensive if real HTTP calls. 
-            # In a real app this should be batched.
-            # Assuming calc_client.get_damage_rolls returns a struct including max_damage
-            
-            # Mon -> Player
-            mon_moves = mon.get('moves', [])
-            mon_atk_res = calc_client.get_damage_rolls(mon, player_active, mon_moves, {})
-            
-            max_dmg_to_player = 0
-            if mon_atk_res:
-                # Find move with highest max damage
-                for res in mon_atk_res:
-                    dmg = res.get('damage_rolls', [0])[-1]
-                    if dmg > max_dmg_to_player:
-                        max_dmg_to_player = dmg
-            
+            max_dmg_to_player = matchups.dealt(i)
             mon_kills_player = max_dmg_to_player >= player_hp
             
-            # Player -> Mon
-            # We need to test all Player moves against THIS candidate
-            player_moves = player_active.get('moves', []) # Should be list of names
-            player_atk_res = calc_client.get_damage_rolls(player_active, mon, player_moves, {})
-            
-            max_dmg_to_mon = 0
-            if player_atk_res:
-                for res in player_atk_res:
-                    dmg = res.get('damage_rolls', [0])[-1]
-                    if dmg > max_dmg_to_mon:
-                        max_dmg_to_mon = dmg
-            
+            max_dmg_to_mon = matchups.taken(i)
             player_kills_mon = max_dmg_to_mon >= mon_hp
             
             # 3. Apply Scoring Matrix
@@ -1,10 +1,150 @@
+from typing import Dict
+from collections import OrderedDict
 from pkh_app.mechanics import Mechanics
+from pkh_app.game_data import slugify
+from pkh_app.battle_engine.damage import calc_fingerprint, context_fingerprint, freeze
+
+# Move and ability groups used by the damage-move scorer
+SPEED_CONTROL_MOVES = frozenset(['Icy Wind', 'Electroweb', 'Rock Tomb', 'Mud Shot', 'Low Sweep', 'Bulldoze', 'Glaciate'])
+SPEED_DROP_BLOCKERS = frozenset(['Contrary', 'Clear Body', 'White Smoke', 'Full Metal Body'])
+STAT_DROP_MOVES = frozenset(['Trop Kick', 'Skitter Smack', 'Lunge', 'Spirit Break', 'Snarl', 'Struggle Bug', 'Breaking Swipe', 'Chilling Water', 'Mystical Fire'])
+STAT_DROP_BLOCKERS = SPEED_DROP_BLOCKERS | {'Hyper Cutter'} # Hyper Cutter for Atk drops?
+COUNTER_MOVES = frozenset(['Counter', 'Mirror Coat', 'Metal Burst'])
+SELF_KO_MOVES = frozenset(['Explosion', 'Self-Destruct', 'Self Destruct', 'Misty Explosion'])
+NO_KILL_BONUS_MOVES = SELF_KO_MOVES | {'Final Gambit', 'Rollout', 'Relic Song', 'Meteor Beam', 'Future Sight', 'Doom Desire'}
+KILL_BONUS_ABILITIES = frozenset(['Moxie', 'Beast Boost', 'Grim Neigh', 'Chilling Neigh'])
+# Damage moves with their own rules in _score_damage_move; every other damage
+# move is scored from its profile alone
+SPECIAL_DAMAGE_MOVES = COUNTER_MOVES | SELF_KO_MOVES | {'Sucker Punch', 'Fake Out', 'Fell Stinger', 'Rollout', 'Fling', 'Final Gambit', 'Pursuit', 'Relic Song'}
+HIGHEST_DAMAGE_SCORES = (6, 6, 6, 6, 8)
+
+
+def _scored_mon_key(mon):
+    # calc_fingerprint only keeps HP thresholds; scoring compares exact HP
+    return (calc_fingerprint(mon), mon.get('current_hp'), tuple(mon.get('moves') or ()), freeze(mon.get('stages')))
+
+
+def _party_mon_key(mon):
+    # Forced/active switch logic reads liveness, speed and damage taken
+    return (calc_fingerprint(mon), mon.get('current_hp'))
+
+
+def scoring_fingerprint(state, side) -> tuple:
+    """
+    Key of everything score_moves reads: both actives, the scoring side's
+    party (HP plus speed and damage-calc inputs), fields and last moves.
+    """
+    fields = state.fields
+    party = state.ai_party if side == 'ai' else state.player_party
+    return (
+        side,
+        _scored_mon_key(state.ai_active),
+        _scored_mon_key(state.player_active),
+        tuple(_party_mon_key(m) for m in party),
+        state.last_moves.get('player'),
+        state.last_moves.get('ai'),
+        freeze({k: v for k, v in fields.items() if k != 'context'}),
+        context_fingerprint(fields),
+    )
+
 
 class AIScorer:
-    def __init__(self, calc_client):
+    def __init__(self, calc_client, cache_size=4096):
         self.calc_client = calc_client
+        # Memo of scored positions (0 disables); see scoring_fingerprint
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
+
+    def clear_cache(self):
+        self._cache.clear()
+        self.cache_hits = self.cache_misses = self.cache_evictions = 0
+
+    def cache_stats(self):
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'entries': len(self._cache),
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'evictions': self.cache_evictions,
+            'hit_rate': self.cache_hits / lookups if lookups else 0.0,
+        }
+
+    def _cached_entry(self, state, side):
+        """
+        Cache entry of this position, scoring it on a miss: the column plan
+        from _score_columns plus the matrix result and action distribution,
+        each filled in the first time it is asked for.
+        """
+        if self.cache_size <= 0:
+            return {'plan': self._score_columns(state, side), 'scored': None, 'probs': None}
+        key = scoring_fingerprint(state, side)
+        entry = self._cache.get(key)
+        if entry is not None:
+            self.cache_hits += 1
+            self._cache.move_to_end(key)
+            return entry
+        self.cache_misses += 1
+        entry = self._cache[key] = {'plan': self._score_columns(state, side), 'scored': None, 'probs': None}
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+            self.cache_evictions += 1
+        return entry
 
     def score_moves(self, state, side):
+        """
+        Full 80-row score matrix (16 rolls x 5 variants, row r * 5 + v; one
+        column per move) for display and inspection. The search only needs
+        action_distribution, which never builds the matrix.
+        """
+        entry = self._cached_entry(state, side)
+        if entry['scored'] is None:
+            plan = entry['plan']
+            columns = plan['columns']
+            entry['scored'] = {
+                'moves': plan['moves'],
+                'matrix': self._build_matrix(columns) if columns is not None else [],
+                'results': plan['results'],
+                'variant_weights': plan['variant_weights'],
+            }
+        scored = entry['scored']
+        # Callers may edit the result; the cached copy stays pristine
+        out = dict(scored)
+        out['moves'] = list(scored['moves'])
+        out['matrix'] = [list(row) for row in scored['matrix']]
+        out['results'] = [dict(res) for res in scored['results']]
+        return out
+
+    def action_distribution(self, state, side='ai'):
+        """
+        {action: probability} of the move (or switch) `side` picks, as used by
+        the search: moves are reported as "Move: <name>", switches keep their
+        "Switch: <species>" name, and near-zero entries are dropped.
+        """
+        entry = self._cached_entry(state, side)
+        if entry['probs'] is None:
+            plan = entry['plan']
+            if not plan['columns']:
+                probs = {"Move: Struggle": 1.0}
+            else:
+                win = self._column_win_probabilities(plan['columns'], plan['variant_weights'])
+                action_probs = {}
+                for name, prob in zip(plan['moves'], win):
+                    act = name if name.startswith("Switch:") else f"Move: {name}"
+                    action_probs[act] = action_probs.get(act, 0) + prob
+                probs = {k: v for k, v in action_probs.items() if v > 0.001}
+            entry['probs'] = probs
+        return dict(entry['probs'])
+
+    def _score_columns(self, state, side):
+        """
+        Scores every option of `side` as a column plan: {'moves', 'results',
+        'variant_weights', 'columns'} with one (key per roll, {key: 5 variant
+        scores}) pair per move. 'columns' is None when a forced switch has no
+        valid target (an empty matrix).
+        """
         attacker = state.ai_active if side == 'ai' else state.player_active
         defender = state.player_active if side == 'ai' else state.ai_active
         
@@ -20,10 +160,13 @@ class AIScorer:
         
         # Phase 2 Awareness: Apply rich modifiers to calc results
         # This makes the AI decision-making aware of ROM-specific values
+        rich_moves = attacker.get('_rich_moves', {})
+        priorities = []
         for res in calc_res:
              m_name = res.get('moveName', '')
-             m_slug = m_name.lower().replace(" ", "").replace("-", "").replace("'", "")
-             m_data = attacker.get('_rich_moves', {}).get(m_slug, {})
+             m_slug = slugify(m_name)
+             m_data = rich_moves.get(m_slug, {})
+             priorities.append(m_data.get('priority', 0))
              
              bp_mod = Mechanics.get_modifier(attacker, 'onBasePower', m_data, state.fields)
              dmg_mod = Mechanics.get_modifier(attacker, 'onModifyDamage', m_data, state.fields)
@@ -41,41 +184,22 @@ class AIScorer:
 
         damage_info = self._analyze_damage(calc_res, ctx['target_hp'])
         
-        # 3. Scoring Matrix Construction
-        matrix = [[0] * len(calc_res) for _ in range(80)]
+        # 3. Scoring Columns
+        # One column per move; see score_moves for the matrix layout
         move_names = [r.get('moveName') for r in calc_res]
+        scored = []
         
         for m_idx, res in enumerate(calc_res):
             name = res.get('moveName')
             cat = res.get('category', 'Physical')
-            my_rolls = damage_info[m_idx]['rolls']
             
             # Validity Check
             if not self._is_move_valid(state, attacker, defender, name, cat, side):
-                for row in range(80): matrix[row][m_idx] = -20
+                scored.append(([None] * 16, {None: [-20] * 5}))
                 continue
             
-            # Scoring Loop (16 Rolls * 5 Variants)
-            for r_idx in range(16):
-                dmg = my_rolls[r_idx]
-                max_d = damage_info['max_dmgs'][r_idx]
-                any_k = damage_info['any_kill_in_roll'][r_idx]
-                kills = dmg >= ctx['target_hp']
-                
-                # "Is Highest" Logic
-                is_highest = (kills and any_k) or (not any_k and dmg >= max_d)
-                
-                # Context for this specific roll
-                roll_ctx = {
-                    'dmg': dmg,
-                    'kills': kills,
-                    'is_highest': is_highest,
-                    'roll_idx': r_idx
-                }
-
-                for v_idx in range(5):
-                    score = self._score_single_move(state, name, cat, res, v_idx, ctx, roll_ctx)
-                    matrix[r_idx * 5 + v_idx][m_idx] = score
+            profile = self._move_profile(state, name, cat, priorities[m_idx], ctx)
+            scored.append(self._score_move_rows(state, profile, ctx, damage_info[m_idx]['rolls'], damage_info))
 
         # 4. Active Switch Logic (Lines 29-43)
         if side == 'ai':
@@ -83,10 +207,7 @@ class AIScorer:
              # We need to check the "Best Score" across all variants/rolls?
              # Doc: "First, the AI must only be able to use ineffective moves (score <= -5)"
              # Implementation: Find max score in matrix.
-             max_matrix_score = -999
-             for row in matrix:
-                  for val in row:
-                       if val > max_matrix_score: max_matrix_score = val
+             max_matrix_score = max((max(row) for _, rows in scored for row in rows.values()), default=-999)
              
              if max_matrix_score <= -5:
                   # Condition 3: AI HP > 50%
@@ -117,41 +238,81 @@ class AIScorer:
                             # Perfect.
                             
                             switch_res = self._handle_forced_switch(state, side, attacker)
-                            # _handle_forced_switch returns matrix of 10s.
+                            # _handle_forced_switch scores every switch 10.
                             # I need to merge this into current result.
                             # But wait, forced switch returns ONLY switches.
                             # I want to MIX switches with current moves.
                             
                             sw_names = switch_res['moves']
-                            sw_matrix = switch_res['matrix'] 
-                            # sw_matrix is 80 rows x N switches. All 10s.
                             
-                            # Modify sw_matrix to be 10 only for first 50% weight (Variants 0, 1? No, 0=25, 1=25. So 0,1 = 50%.)
-                            # row index % 5 gives variant.
+                            # Switch columns score 10 only for first 50% weight (Variants 0, 1? No, 0=25, 1=25. So 0,1 = 50%.)
                             # 0, 1 -> Keep 10.
                             # 2, 3, 4 -> Set to -20 (or -6, just below max -5? No, -20 to avoid selection).
-                            for r in range(80):
-                                 v = r % 5
-                                 if v > 1: # Variants 2,3,4
-                                      for c in range(len(sw_names)):
-                                           sw_matrix[r][c] = -20
+                            sw_column = ([None] * 16, {None: [10, 10, -20, -20, -20]})
                             
                             # Merge
                             move_names.extend(sw_names)
-                            # Extend matrix rows
-                            for r in range(80):
-                                 matrix[r].extend(sw_matrix[r])
+                            scored.extend([sw_column] * len(sw_names))
                             
                             # Update results list with dummies
                             calc_res.extend([{'moveName': n} for n in sw_names])
 
         return {
             'moves': move_names, 
-            'matrix': matrix, 
+            'columns': scored, 
             'results': calc_res, 
             'variant_weights': [0.25, 0.25, 0.25, 0.05, 0.20]
         }
     
+    @staticmethod
+    def _column_win_probabilities(columns, variant_weights):
+        """
+        win_probabilities computed from the per-move (roll keys, rows by key)
+        columns directly: rolls are grouped by their key signature across all
+        moves, and each distinct signature's winners are found once per
+        variant and weighted by how many of the 16 rolls share it.
+        """
+        signatures = {}
+        for signature in zip(*[keys for keys, _ in columns]):
+            signatures[signature] = signatures.get(signature, 0) + 1
+
+        probs = [0.0] * len(columns)
+        for signature, count in signatures.items():
+            rows = [by_key[key] for key, (_, by_key) in zip(signature, columns)]
+            for v_idx, v_weight in enumerate(variant_weights):
+                scores = [row[v_idx] for row in rows]
+                max_s = max(scores)
+                winners = [i for i, s in enumerate(scores) if s == max_s]
+                share = count / 16.0 * v_weight / len(winners)
+                for w in winners:
+                    probs[w] += share
+        return probs
+
+    @staticmethod
+    def win_probabilities(matrix, variant_weights):
+        """
+        Probability that each column (move) has the top score, over the 16
+        equally likely rolls x weighted variants of a score_moves matrix.
+        Ties split the row's weight evenly. Identical rows are pooled first,
+        so the argmax/tie scan runs once per distinct row.
+        """
+        if not matrix or not matrix[0]:
+            return []
+        num_variants = len(variant_weights)
+        pooled = {}
+        for row_idx, scores in enumerate(matrix):
+            key = tuple(scores)
+            pooled[key] = pooled.get(key, 0.0) + (1.0 / 16.0) * variant_weights[row_idx % num_variants]
+
+        probs = [0.0] * len(matrix[0])
+        for scores, weight in pooled.items():
+            max_s = max(scores)
+            winners = [i for i, s in enumerate(scores) if s == max_s]
+            share = weight / len(winners)
+            for w in winners:
+                probs[w] += share
+        return probs
+
     def _check_active_switch_party(self, state, player_mon):
          # Check party for candidates
          # Bugged Logic: "If AI sees 1 mon in back faster... thinks every mon after is faster"
@@ -176,38 +337,46 @@ class AIScorer:
          party = state.ai_party
          active_speed = Mechanics.get_effective_speed(player_mon, state.fields)
          
+         candidates = [mon for mon in party
+                       if mon.get('species') != state.ai_active.get('species') # Skip self
+                       and mon.get('current_hp', 0) > 0]
+         if not candidates: return False
+         
+         # Survival Check: player's best roll against every candidate, in one batch
+         max_taken = self._max_damage_taken(state, player_mon, candidates)
+         
          seen_faster = False
-         valid_found = False
          
-         for mon in party:
-              if mon.get('species') == state.ai_active.get('species'): continue # Skip self
-              if mon.get('current_hp', 0) <= 0: continue
-              
+         for mon, dmg in zip(candidates, max_taken):
               mon_speed = Mechanics.get_effective_speed(mon, state.fields)
               is_faster = mon_speed > active_speed
               
               if is_faster: seen_faster = True
               
               effective_faster = is_faster or seen_faster
-              
-              # Survival Check
-              # Need logic to check OHKO/2HKO.
-              # Pass for now (assume valid if healthy?)
-              # Proper way: calc damage.
-              # Simplified: If HP > 70%?
+              hp = mon.get('current_hp', 0)
               
               if effective_faster:
                    # Check OHKO
-                   # If not OHKO -> valid_found = True
-                   valid_found = True # Simplified
+                   if dmg < hp: return True
               else:
                    # Check 2HKO
-                   valid_found = True # Simplified
-                   
-              if valid_found: return True
+                   if dmg * 2 < hp: return True
               
          return False
 
+    def _max_damage_taken(self, state, player_mon, candidates):
+         """Highest roll of any of the player's moves against each candidate."""
+         p_moves = player_mon.get('moves', [])
+         if not p_moves:
+              return [0] * len(candidates)
+         batch = getattr(self.calc_client, 'calc_matchups', None)
+         if batch is not None:
+              per_mon = batch(player_mon, candidates, p_moves, state.fields)
+         else:
+              per_mon = [self.calc_client.get_damage_rolls(player_mon, mon, p_moves, state.fields) for mon in candidates]
+         return [max((max(res.get('damage_rolls') or [0]) for res in results), default=0) for results in per_mon]
+
     def _analyze_context(self, state, side, attacker, defender):
         # Centralized Context Builder
         att_speed = Mechanics.get_effective_speed(attacker, state.fields)
@@ -241,45 +410,125 @@ class AIScorer:
                                break
         return ctx
 
-    def _get_move_priority(self, attacker, name):
-        """Helper to get move priority from rich move data."""
-        if not name:
-            return 0
-        m_slug = name.lower().replace(" ", "").replace("-", "").replace("'", "")
-        m_data = attacker.get('_rich_moves', {}).get(m_slug, {})
-        return m_data.get('priority', 0)
-    
-    def _score_single_move(self, state, name, cat, res, v_idx, ctx, roll_ctx):
-        # 1. Global Pre-Checks (Sucker Punch Penalty)
-        if name and "Sucker Punch" in name and ctx['sucker_penalty'] > 0:
-            if v_idx >= 2: return -20
-
-        # 2. Dispatcher
-        
-        # Specific Overrides First
-        spec_score = self._score_specific_moves(state, ctx['attacker'], ctx['defender'], name, ctx['is_faster'], ctx['ai_threatened'])
-        if spec_score == -20: return -20
-        
+    def _move_profile(self, state, name, cat, priority, ctx):
+        """
+        Everything about one move that depends neither on the roll nor on the
+        variant, computed once per score_moves call so the per-roll loop only
+        combines precomputed numbers.
+        """
+        attacker, defender = ctx['attacker'], ctx['defender']
+        is_faster = ctx['is_faster']
+        profile = {
+            'name': name,
+            'cat': cat,
+            'spec_score': self._score_specific_moves(state, attacker, defender, name, is_faster, ctx['ai_threatened']),
+            'sucker_blocked': bool(name and "Sucker Punch" in name and ctx['sucker_penalty'] > 0),
+            'desperation': 11 if (ctx['ai_threatened'] and not is_faster and priority > 0 and cat != 'Status') else 0,
+        }
         if cat == 'Status':
-            base_score = self._score_status_move(state, ctx['attacker'], ctx['defender'], name, v_idx, ctx['is_faster'], ctx['is_first_turn'], ctx['ai_threatened'])
-        else:
-            base_score = self._score_damage_move(
-                state, name, res, v_idx, roll_ctx['is_highest'], roll_ctx['kills'], 
-                ctx['is_faster'], ctx['is_first_turn'], ctx['attacker'], ctx['defender'], 
-                ctx['att_hp_pct'], ctx['ai_threatened']
-            )
-            
-        score = base_score + spec_score
-        
-        # 3. Global Post-Modifiers
-        # Priority Desperation - Use helper method
-        priority = self._get_move_priority(ctx['attacker'], name)
-        if ctx['ai_threatened'] and not ctx['is_faster'] and priority > 0 and cat != 'Status':
-             score += 11
-             
-        return score
+            return profile
+
+        # Speed control / guaranteed stat drop override when not the highest damage move
+        drop_score = None
+        if name in SPEED_CONTROL_MOVES:
+            if defender.get('ability') not in SPEED_DROP_BLOCKERS:
+                drop_score = 6 if not is_faster else 5
+            else:
+                drop_score = 5 # Contrary or Blocked
+        elif name in STAT_DROP_MOVES:
+            # Simplified generic check
+            # Doc: "If player mon has corresponding move... +6, Else +5"
+            drop_score = 6 if defender.get('ability') not in STAT_DROP_BLOCKERS else 5
+        elif name == 'Acid Spray':
+            drop_score = 6 # Doc: "+6"
+        profile['drop_score'] = drop_score
+
+        # Kill Bonuses (applies to "All damaging moves")
+        kill_bonus = 0
+        if name not in NO_KILL_BONUS_MOVES:
+            kill_bonus = 6 if (is_faster or priority > 0) else 3
+            if attacker.get('ability') in KILL_BONUS_ABILITIES: kill_bonus += 1
+        profile['kill_bonus'] = kill_bonus
 
-    def _score_damage_move(self, state, name, res, v_idx, is_highest, kills, is_faster, is_first_turn, attacker, defender, hp_pct, ai_threatened):
+        if name in COUNTER_MOVES:
+            profile['counter_score'] = self._score_counter_moves(state, attacker, defender, name, is_faster, ctx['ai_threatened'])
+        if name == 'Sucker Punch':
+            profile['sucker_score'] = self._score_sucker_punch(state, name)
+        return profile
+
+    @staticmethod
+    def _build_matrix(scored):
+        """
+        Expands per-move (roll keys, rows by key) into the 80-row matrix.
+        Rolls whose keys agree for every move share their 5 variant rows, so
+        each distinct roll signature is assembled once and copied.
+        """
+        if not scored:
+            return [[] for _ in range(80)]
+        by_signature = {}
+        matrix = []
+        for signature in zip(*[keys for keys, _ in scored]):
+            variants = by_signature.get(signature)
+            if variants is None:
+                variants = by_signature[signature] = [
+                    [rows[key][v_idx] for key, (_, rows) in zip(signature, scored)] for v_idx in range(5)
+                ]
+            matrix.extend([list(row) for row in variants])
+        return matrix
+
+    def _score_move_rows(self, state, profile, ctx, my_rolls, damage_info):
+        """
+        Scores one move as (key per roll, {key: 5 variant scores}).
+        Damage scores depend on the roll only through (is_highest, kills), so
+        each distinct combination is scored once and shared by every roll
+        that produces it.
+        """
+        name = profile['name']
+        spec_score = profile['spec_score']
+        sucker_blocked = profile['sucker_blocked']
+        bonus = spec_score + profile['desperation']
+        is_status = profile['cat'] == 'Status'
+
+        plain = not is_status and name not in SPECIAL_DAMAGE_MOVES and spec_score != -20
+
+        def variant_row(is_highest, kills):
+            if plain:
+                kill_bonus = profile['kill_bonus'] if kills else 0
+                if is_highest:
+                    return [s + kill_bonus + bonus for s in HIGHEST_DAMAGE_SCORES]
+                if profile['drop_score'] is not None:
+                    return [profile['drop_score'] + bonus] * 5
+                return [kill_bonus + bonus] * 5
+            row = []
+            for v_idx in range(5):
+                # 1. Global Pre-Checks (Sucker Punch Penalty)
+                if sucker_blocked and v_idx >= 2:
+                    row.append(-20)
+                    continue
+                if spec_score == -20:
+                    row.append(-20)
+                    continue
+                if is_status:
+                    base_score = self._score_status_move(state, ctx['attacker'], ctx['defender'], name, v_idx, ctx['is_faster'], ctx['is_first_turn'], ctx['ai_threatened'])
+                else:
+                    base_score = self._score_damage_move(state, profile, v_idx, is_highest, kills, ctx)
+                row.append(base_score + bonus)
+            return row
+
+        if is_status:
+            # Status scores ignore the roll entirely
+            return [None] * 16, {None: variant_row(False, False)}
+
+        # (is_highest, kills) per roll
+        target_hp = ctx['target_hp']
+        keys = [((dmg >= target_hp and any_k) or (not any_k and dmg >= top), dmg >= target_hp)
+                for dmg, any_k, top in zip(my_rolls[:16], damage_info['any_kill_in_roll'], damage_info['max_dmgs'])]
+        return keys, {key: variant_row(*key) for key in set(keys)}
+
+    def _score_damage_move(self, state, profile, v_idx, is_highest, kills, ctx):
+        name = profile['name']
+        is_faster = ctx['is_faster']
+        attacker, defender = ctx['attacker'], ctx['defender']
         score = 0
         
         # Standard High Damage Score
@@ -289,62 +538,23 @@ class AIScorer:
         # Batch 4: Speed Control & Stat Drops (When NOT highest damage)
         # "If this is highest damaging move, none of below bonuses applied... gets usual +6/+8"
         # So we only apply overrides if NOT is_highest.
-        
-        if not is_highest:
-             # Speed Control
-             speed_control = ['Icy Wind', 'Electroweb', 'Rock Tomb', 'Mud Shot', 'Low Sweep', 'Bulldoze', 'Glaciate']
-             if name in speed_control:
-                  # Ability Check
-                  blockers = ['Contrary', 'Clear Body', 'White Smoke', 'Full Metal Body']
-                  if defender.get('ability') not in blockers:
-                       if not is_faster: score = 6
-                       else: score = 5
-                  else:
-                       score = 5 # Contrary or Blocked
-                  return score
-
-             # Stat Drops (Guaranteed)
-             stat_drop_moves = ['Trop Kick', 'Skitter Smack', 'Lunge', 'Spirit Break', 'Snarl', 'Struggle Bug', 'Breaking Swipe', 'Chilling Water', 'Mystical Fire']
-             if name in stat_drop_moves:
-                  blockers = ['Contrary', 'Clear Body', 'White Smoke', 'Full Metal Body', 'Hyper Cutter'] # Hyper Cutter for Atk drops?
-                  # Simplified generic check
-                  if defender.get('ability') not in blockers:
-                       score = 6 # Split match logic? Doc: "If player mon has corresponding move... +6, Else +5"
-                       # We need move category analysis. 
-                       # Fallback to +5? Or +6 generic.
-                       return 6
-                  else:
-                       return 5
-
-             # Acid Spray (-2 SpD)
-             if name == 'Acid Spray':
-                  return 6 # Additive? Or Base?
-                  # Doc: "+6". 
-
-        if name in ['Counter', 'Mirror Coat', 'Metal Burst']:
-             score = self._score_counter_moves(state, attacker, defender, name, is_faster, ai_threatened)
+        elif profile['drop_score'] is not None:
+             return profile['drop_score']
+
+        if name in COUNTER_MOVES:
+             score = profile['counter_score']
              if v_idx == 0 and is_faster: score -= 1 
              return score
 
         if name == 'Sucker Punch':
-             sp_score = self._score_sucker_punch(state, name)
-             if sp_score == -20 and v_idx < 3: return -20
+             if profile['sucker_score'] == -20 and v_idx < 3: return -20
 
 
         if name == 'Fake Out':
-             if is_first_turn: return 9
+             if ctx['is_first_turn']: return 9
         
-        # Kill Bonuses (applies to "All damaging moves")
-        standard_kill_moves = True
-        if name in ['Explosion', 'Self-Destruct', 'Self Destruct', 'Misty Explosion', 'Final Gambit', 'Rollout', 'Relic Song', 'Meteor Beam', 'Future Sight', 'Doom Desire']:
-             standard_kill_moves = False
-
-        if standard_kill_moves and kills:
-             # Use helper method for priority lookup
-             priority = self._get_move_priority(attacker, name)
-             if is_faster or priority > 0: score += 6 
-             else: score += 3
-             if attacker.get('ability') in ['Moxie', 'Beast Boost', 'Grim Neigh', 'Chilling Neigh']: score += 1
+        if kills:
+             score += profile['kill_bonus']
 
         # Specific: Fell Stinger / Final Gambit / Rollout / Pursuit
         if name == 'Fell Stinger':
@@ -380,7 +590,8 @@ class AIScorer:
                      if v_idx <= 1: score = 8 
                  if is_faster: score += 3
         
-        if name in ['Explosion', 'Self-Destruct', 'Self Destruct', 'Misty Explosion']:
+        if name in SELF_KO_MOVES:
+             hp_pct = ctx['att_hp_pct']
              score = 0
              if hp_pct < 0.10: score += 10
              elif hp_pct < 0.33: 
@@ -685,11 +896,11 @@ class AIScorer:
     def _handle_forced_switch(self, state, side, attacker):
         party = state.ai_party if side == 'ai' else state.player_party
         valid_switches = [p.get('species') for p in party if p.get('current_hp', 0) > 0 and p.get('species') != attacker.get('species')]
-        if not valid_switches: return {'moves': [], 'matrix': [], 'variant_weights': [1.0], 'results': []}
+        if not valid_switches: return {'moves': [], 'columns': None, 'variant_weights': [1.0], 'results': []}
         move_names = [f"Switch: {s}" for s in valid_switches]
-        matrix = [[10] * len(valid_switches) for _ in range(80)]
+        columns = [([None] * 16, {None: [10] * 5})] * len(valid_switches)
         results = [{'moveName': n, 'damage_rolls': [0]} for n in move_names]
-        return {'moves': move_names, 'matrix': matrix, 'results': results, 'variant_weights': [0.2]*5}
+        return {'moves': move_names, 'columns': columns, 'results': results, 'variant_weights': [0.2]*5}
 
     def _analyze_damage(self, calc_res, target_hp):
         info = {}
@@ -1,55 +1,76 @@
 from typing import Dict, List, Optional, Tuple, Any
 import logging
-import json
-import os
 import random
 import math
 import copy
+import threading
 
+from pkh_app.game_data import GAME_DATA, slugify, species_slugify
 from pkh_app.mechanics import Mechanics
+from pkh_app.type_chart import type_effectiveness
 from .state import BattleState, TYPE_CHART
+from .mon import Mon, StatBlock, VolatileSet
+from .registry import RichRegistry
 from .enricher import StateEnricher
 from .triggers import TriggerHandler
 from .damage import DamageCalculator
+from .chance import ChanceStream, RandomStream, EnumeratingStream, enumerate_outcomes
 
 class BattleEngine:
-    def __init__(self, calc_client=None, species_names=None, move_names=None):
+    def __init__(self, calc_client=None, species_names=None, move_names=None, seed=None):
         self.calc_client = calc_client
         self.species_names = species_names or {}
         self.move_names = move_names or {}
 
-        # Load JSON Data
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        
-        pokedex_path = os.path.join(base_dir, "data", "pokedex_rich.json")
-        try:
-            with open(pokedex_path, "r", encoding="utf-8") as f:
-                self.pokedex = json.load(f)
-        except Exception:
-            logging.warning("Failed to load pokedex_rich.json")
-            self.pokedex = {}
-
-        mechanics_path = os.path.join(base_dir, "data", "mechanics_rich.json")
-        try:
-             with open(mechanics_path, "r", encoding="utf-8") as f:
-                self.mechanics = json.load(f)
-        except Exception:
-             logging.warning("Failed to load mechanics_rich.json")
-             self.mechanics = {}
+        # Static data is parsed once per process (GAME_DATA); the engine gets
+        # its own top-level tables so in-place edits (tests, tools) stay local,
+        # while the records themselves are shared
+        self.pokedex = dict(GAME_DATA.pokedex)
+        self.mechanics = {key: dict(table) if isinstance(table, dict) else table
+                          for key, table in GAME_DATA.mechanics.items()}
 
         # rich_data is an alias for mechanics (used throughout the codebase)
         self.rich_data = self.mechanics
 
+        # Shared read-only rich data; mons only carry references into it
+        self.registry = RichRegistry(self.rich_data, self.pokedex)
+
         # Initialize Helpers
-        self.enricher = StateEnricher(self.pokedex, self.rich_data, self.move_names, self.species_names)
+        self.enricher = StateEnricher(self.pokedex, self.rich_data, self.move_names, self.species_names, self.registry)
         self.triggers = TriggerHandler(self.enricher, self.rich_data)
+        # Every random decision of a turn goes through this stream;
+        # a seed makes the engine reproducible across processes
+        self._turn = threading.local()
+        self.rng = RandomStream(seed)
         self.damage_calculator = DamageCalculator(self.calc_client, self.enricher, self.rich_data, self.move_names)
 
+    @property
+    def rng(self) -> ChanceStream:
+        # apply_turn's override only applies to the thread resolving that turn
+        stream = getattr(self._turn, 'rng', None)
+        return self._rng if stream is None else stream
+
+    @rng.setter
+    def rng(self, stream: ChanceStream):
+        self._rng = stream
+        self.triggers.rng = stream
+
+    def __getstate__(self):
+        # Process pool workers receive the engine pickled; a turn in flight
+        # on this thread is not part of it
+        state = self.__dict__.copy()
+        del state['_turn']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._turn = threading.local()
+
     def _ensure_types(self, mon):
         if not mon or mon.get("types"): return
         s = mon.get("name", mon.get("species"))
         if s:
-             slug = s.lower().replace(" ", "").replace("-", "")
+             slug = species_slugify(s)
              d = self.pokedex.get(slug)
              mon["types"] = d.get("types", ["Normal"]) if d else ["Normal"]
         else:
@@ -61,6 +82,12 @@ class BattleEngine:
     def calc_damage_for_moves(self, attacker, defender, move_names, field_conditions=None):
         return self.damage_calculator.calc_damage_for_moves(attacker, defender, move_names, field_conditions)
 
+    def calc_matchups(self, attacker, defenders, move_names, field_conditions=None):
+        return self.damage_calculator.calc_matchups(attacker, defenders, move_names, field_conditions)
+
+    def calc_attackers(self, attackers, defender, field_conditions=None):
+        return self.damage_calculator.calc_attackers(attackers, defender, field_conditions)
+
     def get_state_log_lines(self, state: BattleState) -> List[str]:
         lines = []
         p = state.player_active
@@ -218,13 +245,7 @@ class BattleEngine:
 
                 # Assault Vest Check
                 if rich_item and rich_item.get("name") == "Assault Vest":
-                    m_slug = (
-                        str(m)
-                        .lower()
-                        .replace(" ", "")
-                        .replace("-", "")
-                        .replace("'", "")
-                    )
+                    m_slug = slugify(m)
                     rd = active.get("_rich_moves", {}).get(m_slug)
                     if rd and rd.get("category") == "Status":
                         continue
@@ -240,11 +261,67 @@ class BattleEngine:
         return actions
 
     def apply_turn(
-        self, state: BattleState, player_action: str, ai_action: str
+        self, state: BattleState, player_action: str, ai_action: str,
+        rng: Optional[ChanceStream] = None, seed: Optional[int] = None,
     ) -> Tuple[BattleState, List[str]]:
         """
         Simulates one ply/turn.
+        `rng` (or a fresh stream seeded with `seed`) overrides the engine's
+        chance stream for this turn only; the same state and seed always
+        resolve the same way.
+        """
+        if rng is None and seed is not None:
+            rng = RandomStream(seed)
+        previous = getattr(self._turn, 'rng', None)
+        if rng is not None:
+            self._turn.rng = rng
+        # Static Mechanics helpers (and triggers) draw from the same stream
+        # during the turn
+        previous_mech = Mechanics.set_turn_rng(self.rng)
+        try:
+            return self._resolve_turn(state, player_action, ai_action)
+        finally:
+            self._turn.rng = previous
+            Mechanics.set_turn_rng(previous_mech)
+
+    def apply_turn_distribution(
+        self, state: BattleState, player_action: str, ai_action: str,
+        max_outcomes: int = 8, roll_buckets: int = 3, min_prob: float = 0.0,
+    ) -> List[Tuple[float, BattleState, List[str]]]:
         """
+        Expands one turn into its most likely outcomes instead of sampling.
+
+        Crits, damage rolls (bucketed into `roll_buckets` groups), accuracy,
+        multi-hit counts and secondary effects become explicit chance nodes.
+        Outcomes that lead to the same state are merged; at most
+        `max_outcomes` turns are simulated and the result is renormalized
+        over the explored probability mass.
+
+        Returns [(probability, state, log)], most likely first.
+        """
+        outcomes, explored = enumerate_outcomes(
+            lambda stream: self.apply_turn(state, player_action, ai_action, rng=stream),
+            max_outcomes=max_outcomes,
+            roll_buckets=roll_buckets,
+            min_prob=min_prob,
+        )
+        merged: Dict[int, list] = {}
+        for prob, (new_state, log) in outcomes:
+            key = new_state.get_hash()
+            entry = merged.get(key)
+            if entry is None:
+                merged[key] = [prob, new_state, log]
+            else:
+                # Keep the log of the first (most likely) path to this state
+                entry[0] += prob
+        total = explored or 1.0
+        result = [(p / total, st, lg) for p, st, lg in merged.values()]
+        result.sort(key=lambda o: -o[0])
+        return result
+
+    def _resolve_turn(
+        self, state: BattleState, player_action: str, ai_action: str
+    ) -> Tuple[BattleState, List[str]]:
         new_state = state.deep_copy()
         self.enrich_state(new_state)
         log = []
@@ -820,7 +897,7 @@ class BattleEngine:
                     ms.sort(key=lambda x: x[0], reverse=True)
                     max_bp = ms[0][0]
                     candidates = [name for b, name in ms if b == max_bp]
-                    warn_move = random.choice(candidates)
+                    warn_move = self.rng.choice(candidates)
                     log.append(
                         f"  {mon.get('species')}'s Forewarn alerted it to {warn_move}!"
                     )
@@ -896,26 +973,7 @@ class BattleEngine:
 
         # 1. Stealth Rock
         if "Stealth Rock" in hazards:
-            # Type Effectiveness
-            # Simplified: We need a type chart or ask calc client?
-            # For now, simplistic hardcoded check or skip effectiveness?
-            # We can use Mechanics helper if available, or just hardcode checking "Rock" vs types.
-            # Checking `calc_client` for 1 move is expensive.
-            # Let's implement basic type chart for Rock.
-            factor = 1.0
-            rock_eff = {
-                "Fire": 2,
-                "Ice": 2,
-                "Flying": 2,
-                "Bug": 2,
-                "Water": 0.5,
-                "Grass": 0.5,
-                "Fighting": 0.5,
-                "Ground": 0.5,
-                "Steel": 0.5,
-            }
-            for t in mon.get("types", []):
-                factor *= rock_eff.get(t, 1.0)
+            factor = type_effectiveness("Rock", mon.get("types", []))
 
             dmg = int(max_hp * 0.125 * factor)
             if dmg > 0:
@@ -1140,8 +1198,8 @@ class BattleEngine:
 
         # Freeze
         elif status == "frz":
-            # 20% thaw chance (Simple hash-based determinism)
-            if hash(move_name + str(attacker["current_hp"])) % 100 < 20:
+            # 20% thaw chance
+            if self.rng.chance(0.2):
                 attacker["status"] = None
                 log.append(
                     f"[{attacker_side.upper()}] {attacker.get('species')} thawed out!"
@@ -1169,7 +1227,7 @@ class BattleEngine:
         # Paralysis
         elif status == "par":
             # 25% Full Paralysis
-            if hash(move_name + str(attacker["current_hp"])) % 100 < 25:
+            if self.rng.chance(0.25):
                 log.append(
                     f"[{attacker_side.upper()}] {attacker.get('species')} is paralyzed! It can't move!"
                 )
@@ -1209,7 +1267,7 @@ class BattleEngine:
                 log.append(f"  {attacker.get('species')} snapped out of its confusion!")
             else:
                 # 33% Self Hit
-                if hash(move_name + str(attacker["current_hp"])) % 100 < 33:
+                if self.rng.chance(0.33):
                     log.append(f"  It hurt itself in its confusion!")
                 # Self Hit Damage (Typeless 40 BP Physical)
                 level = 100  # Approx
@@ -1380,8 +1438,8 @@ class BattleEngine:
 
         # Attract Check
         if "attract" in volatiles:
-            # 50% chance to fail (Deterministic hash for consistency)
-            if (hash(str(attacker.get("current_hp")) + move_name) % 100) < 50:
+            # 50% chance to fail
+            if self.rng.chance(0.5):
                 log.append(f"  {attacker.get('species')} is in love and can't move!")
                 return
 
@@ -1403,7 +1461,8 @@ class BattleEngine:
                 if move_data and move_data.get("category") != "Status":
                     if "Shield" in attacker.get("species", ""):
                         # Swap stats
-                        stats = attacker.get("stats", {})
+                        stats = attacker.get("stats", {}).copy()
+                        attacker["stats"] = stats
                         stats["atk"], stats["def"] = stats["def"], stats["atk"]
                         stats["spa"], stats["spd"] = stats["spd"], stats["spa"]
                         # Change species name for identification
@@ -1455,7 +1514,8 @@ class BattleEngine:
                 and attacker.get("ability") == "Stance Change"
             ):
                 if "Blade" in attacker.get("species", ""):
-                    stats = attacker.get("stats", {})
+                    stats = attacker.get("stats", {}).copy()
+                    attacker["stats"] = stats
                     stats["atk"], stats["def"] = stats["def"], stats["atk"]
                     stats["spa"], stats["spd"] = stats["spd"], stats["spa"]
                     attacker["species"] = attacker["species"].replace("Blade", "Shield")
@@ -1780,8 +1840,6 @@ class BattleEngine:
                 move_bp = 100
             else:
                 move_bp = 120
-            # Update move_data so damage calculator uses this power
-            move_data["basePower"] = move_bp
 
         elif move_name in ["Heavy Slam", "Heat Crash"]:
             # Get both weights
@@ -1815,8 +1873,6 @@ class BattleEngine:
                 move_bp = 60
             else:
                 move_bp = 40
-            # Update move_data so damage calculator uses this power
-            move_data["basePower"] = move_bp
 
         # Ion Deluge (Normal -> Electric)
         if state.fields.get("ion_deluge") and move_type == "Normal":
@@ -2052,7 +2108,7 @@ class BattleEngine:
                 damage_dealt = attacker.get("level", 50)
                 if move_name == "Psywave":
                     # Psywave: Level * (random 0.5 to 1.5)
-                    rnd = random.randint(50, 150)
+                    rnd = self.rng.randint(50, 150)
                     damage_dealt = int(damage_dealt * rnd / 100)
             elif isinstance(fixed_damage, int):
                 damage_dealt = fixed_damage
@@ -2218,7 +2274,7 @@ class BattleEngine:
             ):  # Assuming side check logic
                 pass  # TODO: Access side name properly, ignoring for minimal patch
 
-            is_crit = random.random() < chance
+            is_crit = self.rng.chance(chance)
 
             # Force Crit if manually flagged (debug/testing)
             if attacker.get("crit_ratio") == 2:  # Legacy flag support
@@ -2231,7 +2287,7 @@ class BattleEngine:
             # FIX: Pick a random roll instead of averaging
             damage_dealt = 0
             if rolls:
-                damage_dealt = random.choice(rolls)
+                damage_dealt = self.rng.roll(rolls)
 
             # Phase 2: Apply Rich Data Modifiers (onBasePower, onModifyDamage)
             # SKIP if OHKO
@@ -2260,7 +2316,7 @@ class BattleEngine:
             # Apply only if damage > 0 and user moved first
             if damage_dealt > 0:
                 if attacker.get("item") in ["King's Rock", "Kings Rock", "Razor Fang"]:
-                    if random.random() < 0.1:
+                    if self.rng.chance(0.1):
                         defender.setdefault("volatiles", []).append("flinch")
                         log.append(f"  {defender.get('species')} flinched!")
 
@@ -2505,17 +2561,11 @@ class BattleEngine:
                         hit_count = mx
                     elif mx == 5:  # Standard 2-5 hit distribution
                         # 2: 35%, 3: 35%, 4: 15%, 5: 15%
-                        r = random.random()
-                        if r < 0.35:
-                            hit_count = 2
-                        elif r < 0.70:
-                            hit_count = 3
-                        elif r < 0.85:
-                            hit_count = 4
-                        else:
-                            hit_count = 5
+                        hit_count = self.rng.weighted(
+                            [(2, 0.35), (3, 0.35), (4, 0.15), (5, 0.15)]
+                        )
                     else:
-                        hit_count = random.randint(mn, mx)
+                        hit_count = self.rng.choice(range(mn, mx + 1))
                 else:
                     # Fixed number (e.g. Double Kick = 2)
                     hit_count = int(rich_multihit)
@@ -2719,7 +2769,7 @@ class BattleEngine:
                         defender.get("item") == "Focus Band"
                         and hit_dmg >= defender["current_hp"]
                     ):
-                        if random.random() < 0.10:
+                        if self.rng.chance(0.10):
                             survived_with_1hp = True
                             # Focus Band does NOT consume, so item_survive should remain False for consumption logic
                             log.append(
@@ -3098,7 +3148,7 @@ class BattleEngine:
 
             elif move_name == "Acupressure":
                 stats = ["atk", "def", "spa", "spd", "spe", "acc", "eva"]
-                stat = random.choice(stats)
+                stat = self.rng.choice(stats)
                 Mechanics.apply_boosts(
                     defender,
                     {stat: 2},
@@ -3141,7 +3191,7 @@ class BattleEngine:
                         log.append("  But it failed!")
                     else:
                         # Pick random target
-                        switch_mon = random.choice(valid_targets)
+                        switch_mon = self.rng.choice(valid_targets)
                         s_name = switch_mon.get("species")
                         log.append(f"  {defender.get('species')} was blown away!")
                         self.perform_switch(state, defender_side, s_name, log)
@@ -3246,14 +3296,14 @@ class BattleEngine:
 
             elif move_name == "Forest's Curse":
                 if "Grass" not in defender.get("types", []):
-                    defender.setdefault("types", []).append("Grass")
+                    defender["types"] = list(defender.get("types", [])) + ["Grass"]
                     log.append(f"  Grass type was added to {defender.get('species')}!")
                 else:
                     log.append("  But it failed!")
 
             elif move_name == "Trick-or-Treat":
                 if "Ghost" not in defender.get("types", []):
-                    defender.setdefault("types", []).append("Ghost")
+                    defender["types"] = list(defender.get("types", [])) + ["Ghost"]
                     log.append(f"  Ghost type was added to {defender.get('species')}!")
                 else:
                     log.append("  But it failed!")
@@ -3347,7 +3397,7 @@ class BattleEngine:
                                 valid_moves.append(m_key)
 
                     if valid_moves:
-                        rand_move = random.choice(valid_moves)
+                        rand_move = self.rng.choice(valid_moves)
                         log.append(f"  Waggling a finger... used {rand_move}!")
                         self.execute_turn_action(
                             state,
@@ -3369,7 +3419,7 @@ class BattleEngine:
                         valid_moves = [m for m in known_moves if m != "Sleep Talk"]
                         # Should filter Charge/etc? For now simplified.
                         if valid_moves:
-                            rand_move = random.choice(valid_moves)
+                            rand_move = self.rng.choice(valid_moves)
                             log.append(
                                 f"  {attacker.get('species')} used {rand_move} while asleep!"
                             )
@@ -3432,7 +3482,7 @@ class BattleEngine:
                                 valid_moves.append(m)
 
                     if valid_moves:
-                        rand_move = random.choice(valid_moves)
+                        rand_move = self.rng.choice(valid_moves)
                         log.append(
                             f"  {attacker.get('species')} used {rand_move} via Assist!"
                         )
@@ -3803,6 +3853,9 @@ class BattleEngine:
                     u_val = attacker.get("stats", {}).get(s, 100)
                     t_val = defender.get("stats", {}).get(s, 100)
                     avg = (u_val + t_val) // 2
+                    # Replace rather than edit: stats containers are shared between search copies
+                    attacker["stats"] = attacker.get("stats", {}).copy()
+                    defender["stats"] = defender.get("stats", {}).copy()
                     attacker["stats"][s] = avg
                     defender["stats"][s] = avg
 
@@ -4009,7 +4062,8 @@ class BattleEngine:
             elif move_name == "Power Shift":
                 atk = attacker.get("stats", {}).get("atk", 1)
                 df = attacker.get("stats", {}).get("def", 1)
-                attacker.setdefault("stats", {})["atk"] = df
+                attacker["stats"] = attacker.get("stats", {}).copy()
+                attacker["stats"]["atk"] = df
                 attacker["stats"]["def"] = atk
                 log.append(
                     f"  {attacker.get('species')} swapped its offensive and defensive stats!"
@@ -4314,7 +4368,8 @@ class BattleEngine:
             elif move_name == "Power Trick":
                 atk = attacker.get("stats", {}).get("atk", 1)
                 df = attacker.get("stats", {}).get("def", 1)
-                attacker.setdefault("stats", {})["atk"] = df
+                attacker["stats"] = attacker.get("stats", {}).copy()
+                attacker["stats"]["atk"] = df
                 attacker["stats"]["def"] = atk
                 log.append(
                     f"  {attacker.get('species')} swapped its Attack and Defense!"
@@ -5135,7 +5190,7 @@ class BattleEngine:
                 if not isinstance(sec, dict):
                     continue
                 chance = sec.get("chance", 100) / 100
-                if random.random() < (chance * chance_mult):
+                if self.rng.chance(chance * chance_mult):
                     if behind_sub and not move_bypasses_sub:
                         # Secondaries are blocked by substitute unless bypassed
                         # Special case: Self-targeting secondaries (like stat boosts) are NOT blocked.
@@ -5363,7 +5418,14 @@ class BattleEngine:
         """
         Attaches rich data objects directly to the Pokemon state dictionaries
         for faster access during simulation.
+        Records (and the per-moveset `_rich_moves` map) come from the shared
+        RichRegistry, so every state references the same objects.
         """
+        registry = self.registry
+        if registry.rich_data is not self.rich_data:
+            # rich_data was swapped out (tests do this); rebind the registry
+            registry = self.registry = RichRegistry(self.rich_data, self.pokedex)
+
         mons = [state.player_active, state.ai_active]
         mons.extend(state.player_party)
         mons.extend(state.ai_party)
@@ -5375,32 +5437,16 @@ class BattleEngine:
             # Ability
             ab_name = mon.get("ability")
             if ab_name and isinstance(ab_name, str):
-                key = ab_name.lower().replace(" ", "").replace("-", "").replace("'", "")
-                mon["_rich_ability"] = self.rich_data["abilities"].get(key)
+                mon["_rich_ability"] = registry.get("abilities", ab_name)
 
             # Item
-            itemove_name = mon.get("item")
-            if itemove_name and isinstance(itemove_name, str):
-                key = (
-                    itemove_name.lower()
-                    .replace(" ", "")
-                    .replace("-", "")
-                    .replace("'", "")
-                )
-                mon["_rich_item"] = self.rich_data["items"].get(key)
+            item_name = mon.get("item")
+            if item_name and isinstance(item_name, str):
+                mon["_rich_item"] = registry.get("items", item_name)
 
             # Moves
             if "moves" in mon:
-                rich_moves = {}
-                for m in mon["moves"]:
-                    if isinstance(m, str):
-                        key = (
-                            m.lower().replace(" ", "").replace("-", "").replace("'", "")
-                        )
-                        rd = self.rich_data["moves"].get(key)
-                        if rd:
-                            rich_moves[m] = rd
-                mon["_rich_moves"] = rich_moves
+                mon["_rich_moves"] = registry.moveset(mon["moves"], by_slug=False)
 
     def _get_mechanic(self, source_name, source_type):
         """
@@ -5409,10 +5455,7 @@ class BattleEngine:
         """
         if not source_name:
             return None
-        key = (
-            str(source_name).lower().replace(" ", "").replace("-", "").replace("'", "")
-        )
-        return self.rich_data.get(source_type, {}).get(key)
+        return GAME_DATA.index(source_type).record(source_name, None, self.rich_data.get(source_type, {}))
 
     def _check_mechanic(self, source, source_type, key):
         """
@@ -5431,7 +5474,7 @@ class BattleEngine:
         If source_type == 'items' and source is dict: return source.get('_rich_item', {}).get(key)
         """
         # Fast Path for Enriched Objects
-        if isinstance(source, dict):
+        if isinstance(source, (dict, Mon)):
             if source_type == "abilities":
                 rd = source.get("_rich_ability")
                 if rd:
@@ -5443,7 +5486,7 @@ class BattleEngine:
 
         # Standard Lookup (String Name)
         source_name = source
-        if isinstance(source, dict):
+        if isinstance(source, (dict, Mon)):
             # If dict passed but no rich data (or mismatched type), fallback to getting name string
             if source_type == "abilities":
                 source_name = source.get("ability")
@@ -5741,7 +5784,7 @@ class BattleEngine:
                     elif item_name == "Starf Berry" and hp_ratio <= 0.25:
                         # Random stat +2
                         stats = ["atk", "def", "spa", "spd", "spe"]
-                        stat = random.choice(stats)
+                        stat = self.rng.choice(stats)
                         val = 4 if ability_name == "Ripen" else 2
                         Mechanics.apply_boosts(
                             mon, {stat: val}, log, source_name=item_name
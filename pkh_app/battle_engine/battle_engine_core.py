@@ -6,6 +6,7 @@ import logging
 import json
 import random
 import os
+from pkh_app.game_data import GAME_DATA
 from pkh_app.mechanics import Mechanics
 
 # Standard Gen 8 Type Chart
@@ -116,24 +117,9 @@ class BattleEngine:
         self.species_names = species_names or {}
         self.move_names = move_names or {}
         
-        # Load rich mechanics data
-        try:
-            data_path = os.path.join(os.path.dirname(__file__), '../data/mechanics_rich.json')
-            with open(data_path, 'r') as f:
-                self.rich_data = json.load(f)
-            logging.info(f"Loaded {len(self.rich_data.get('moves', {}))} moves, {len(self.rich_data.get('abilities', {}))} abilities, {len(self.rich_data.get('items', {}))} items from mechanics_rich.json")
-        except Exception as e:
-            logging.error(f"Failed to load mechanics_rich.json: {e}")
-            self.rich_data = {"moves": {}, "abilities": {}, "items": {}}
-
-        # Load Pokedex data for form changes
-        try:
-            dex_path = os.path.join(os.path.dirname(__file__), '../data/pokedex_rich.json')
-            with open(dex_path, 'r') as f:
-                self.pokedex = json.load(f)
-        except Exception as e:
-            logging.error(f"Failed to load pokedex_rich.json: {e}")
-            self.pokedex = {}
+        # Shared, lazily loaded static data
+        self.rich_data = GAME_DATA.mechanics or {"moves": {}, "abilities": {}, "items": {}}
+        self.pokedex = GAME_DATA.pokedex
 
     def get_state_log_lines(self, state: BattleState) -> List[str]:
         """Returns a list of strings representing the detailed state for logging."""
@@ -1669,8 +1655,6 @@ class BattleEngine:
                 move_bp = 100
             else:
                 move_bp = 120
-            # Update move_data so damage calculator uses this power
-            move_data['basePower'] = move_bp
         
         elif move_name in ['Heavy Slam', 'Heat Crash']:
             # Get both weights
@@ -1688,8 +1672,6 @@ class BattleEngine:
                 move_bp = 60
             else:
                 move_bp = 40
-            # Update move_data so damage calculator uses this power
-            move_data['basePower'] = move_bp
              
         # Ion Deluge (Normal -> Electric)
         if state.fields.get('ion_deluge') and move_type == 'Normal':
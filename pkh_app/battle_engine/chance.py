@@ -0,0 +1,200 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence, Tuple
+import hashlib
+import heapq
+import random
+
+
+class ChanceStream(ABC):
+    """
+    Source of every random decision the engine makes during a turn.
+
+    Engine code asks structured questions (`chance(p)`, `choice(seq)`,
+    `roll(rolls)`, `weighted(options)`) instead of calling `random`
+    directly, so the same turn can either be sampled (RandomStream) or
+    expanded into its weighted outcomes (EnumeratingStream).
+    """
+
+    @abstractmethod
+    def chance(self, p: float) -> bool:
+        ...
+
+    @abstractmethod
+    def choice(self, seq: Sequence):
+        ...
+
+    @abstractmethod
+    def weighted(self, options: Sequence[Tuple[object, float]]):
+        ...
+
+    def roll(self, rolls: Sequence):
+        """Picks one damage roll (uniform)."""
+        return self.choice(rolls)
+
+    def randint(self, a: int, b: int) -> int:
+        return self.choice(range(a, b + 1))
+
+
+def derive_seed(seed: int, *key) -> int:
+    """Process-stable 64-bit seed for the sub-stream `key` of `seed`."""
+    digest = hashlib.blake2b(repr((seed,) + key).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class RandomStream(ChanceStream):
+    """
+    Samples outcomes. Seeded streams own a `random.Random`, so a turn
+    resolved with the same state and seed is reproducible in any process;
+    unseeded streams use the module-level `random` functions (patchable in
+    tests).
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = seed
+        self._random = random.Random(seed) if seed is not None else random
+
+    def __getstate__(self):
+        # The module-level `random` cannot be pickled; it is re-bound on load
+        state = dict(self.__dict__)
+        if state['_random'] is random:
+            state['_random'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._random is None:
+            self._random = random
+
+    def spawn(self, *key) -> "RandomStream":
+        """Independent child stream, e.g. one per worker or search branch."""
+        if self.seed is None:
+            return RandomStream()
+        return RandomStream(derive_seed(self.seed, *key))
+
+    def chance(self, p: float) -> bool:
+        return self._random.random() < p
+
+    def choice(self, seq: Sequence):
+        return self._random.choice(seq)
+
+    def weighted(self, options: Sequence[Tuple[object, float]]):
+        r = self._random.random()
+        acc = 0.0
+        for value, weight in options:
+            acc += weight
+            if r < acc:
+                return value
+        return options[-1][0]
+
+    def randint(self, a: int, b: int) -> int:
+        return self._random.randint(a, b)
+
+
+class EnumeratingStream(ChanceStream):
+    """
+    Replays a fixed prefix of choices, then takes the most likely option at
+    every further chance point while recording the alternatives, so a
+    driver can enumerate the outcome tree one apply_turn at a time.
+
+    Damage rolls (and other numeric draws) are bucketed into at most
+    `roll_buckets` equal-probability groups represented by their median.
+    """
+
+    def __init__(self, prefix: Sequence[int] = (), roll_buckets: int = 3):
+        self.prefix = list(prefix)
+        self.roll_buckets = roll_buckets
+        # One (options, chosen index) per chance point reached this turn
+        self.trace: List[Tuple[List[Tuple[object, float]], int]] = []
+
+    def _pick(self, options: List[Tuple[object, float]]):
+        pos = len(self.trace)
+        if pos < len(self.prefix):
+            idx = self.prefix[pos]
+        else:
+            idx = max(range(len(options)), key=lambda i: options[i][1])
+        self.trace.append((options, idx))
+        return options[idx][0]
+
+    def chance(self, p: float) -> bool:
+        if p <= 0:
+            return False
+        if p >= 1:
+            return True
+        return self._pick([(True, p), (False, 1.0 - p)])
+
+    def choice(self, seq: Sequence):
+        seq = list(seq)
+        if len(seq) == 1:
+            return seq[0]
+        w = 1.0 / len(seq)
+        return self._pick([(v, w) for v in seq])
+
+    def weighted(self, options: Sequence[Tuple[object, float]]):
+        options = [(v, w) for v, w in options if w > 0]
+        if len(options) == 1:
+            return options[0][0]
+        return self._pick(options)
+
+    def roll(self, rolls: Sequence):
+        return self._pick(bucket_rolls(rolls, self.roll_buckets))
+
+    def randint(self, a: int, b: int) -> int:
+        return self.roll(range(a, b + 1))
+
+
+def bucket_rolls(rolls: Sequence, buckets: int) -> List[Tuple[object, float]]:
+    """
+    Merges identical rolls and groups the rest into `buckets` contiguous
+    slices of the sorted rolls; each slice is represented by its median.
+    """
+    ordered = sorted(rolls)
+    n = len(ordered)
+    if n == 0:
+        return [(0, 1.0)]
+    distinct = sorted(set(ordered))
+    if len(distinct) <= buckets:
+        return [(v, ordered.count(v) / n) for v in distinct]
+    out = []
+    for b in range(buckets):
+        lo = b * n // buckets
+        hi = (b + 1) * n // buckets
+        group = ordered[lo:hi]
+        out.append((group[len(group) // 2], len(group) / n))
+    return out
+
+
+def enumerate_outcomes(run, max_outcomes: int = 8, roll_buckets: int = 3, min_prob: float = 0.0):
+    """
+    Best-first expansion of the chance tree of `run(stream)`.
+
+    `run` is called once per outcome with an EnumeratingStream and returns
+    the outcome. Returns ([(probability, outcome)], explored probability
+    mass); outcomes are expanded most likely first and the expansion stops
+    after `max_outcomes` leaves.
+    """
+    results = []
+    explored = 0.0
+    # Max-heap on the probability of a forced prefix (upper bound of its leaves)
+    heap = [(-1.0, 0, ())]
+    counter = 1
+    while heap and len(results) < max_outcomes:
+        neg_p, _, prefix = heapq.heappop(heap)
+        if -neg_p < min_prob:
+            break
+        stream = EnumeratingStream(prefix, roll_buckets)
+        outcome = run(stream)
+
+        prob = 1.0
+        for pos, (options, idx) in enumerate(stream.trace):
+            if pos >= len(prefix):
+                # New chance point: queue the alternatives not taken
+                chosen = [i for _, i in stream.trace[:pos]]
+                for alt in range(len(options)):
+                    if alt != idx:
+                        alt_p = prob * options[alt][1]
+                        heapq.heappush(heap, (-alt_p, counter, tuple(chosen) + (alt,)))
+                        counter += 1
+            prob *= options[idx][1]
+        results.append((prob, outcome))
+        explored += prob
+    return results, explored
@@ -1,14 +1,133 @@
 
 from typing import Dict, List, Optional
+from collections import OrderedDict
 import math
 from pkh_app.mechanics import Mechanics
+from pkh_app.game_data import GAME_DATA
+
+CALC_STATS = ('atk', 'def', 'spa', 'spd', 'spe')
+# Mon keys the local calc (stats, onBasePower/onModifyDamage conditions) reads
+CALC_MON_KEYS = ('species', 'level', 'max_hp', 'status', 'ability', 'item', 'weightkg',
+                 'side', 'unburden_active', 'took_damage_this_turn', 'stats_lowered_this_turn')
+# Field keys it reads; 'context' is handled separately
+CALC_FIELD_KEYS = ('weather', 'terrain', 'gravity', 'magic_room', 'wonder_room',
+                   'ally_fainted_last_turn', 'last_move_used_this_turn')
+# Modifiers that roll the turn's chance stream must be recomputed every time
+UNCACHED_MOVES = frozenset(('Fickle Beam',))
+
+
+_SCALARS = frozenset((int, float, str, bool, type(None)))
+
+
+def freeze(value):
+    """Hashable, order-stable copy of a nested dict/list value."""
+    if value.__class__ in _SCALARS:
+        return value
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(freeze(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def calc_fingerprint(mon) -> tuple:
+    """
+    Canonical key of everything the local damage calc reads from a mon.
+    HP enters only through the thresholds modifiers test (full HP for
+    Multiscale, 1/2 for Defeatist/Brine, 1/3 for Blaze & co.); moves whose
+    power depends on exact HP are variable-BP and never cached.
+    """
+    stats = mon.get('stats') or {}
+    stages = mon.get('stat_stages') or {}
+    hp = mon.get('current_hp', 1)
+    max_hp = mon.get('max_hp', 1) or 1
+    ratio = hp / max_hp
+    return (
+        tuple(mon.get(k) for k in CALC_MON_KEYS),
+        tuple(stats.get(k) for k in CALC_STATS),
+        tuple(sorted((k, v) for k, v in stages.items() if v)),
+        tuple(mon.get('types') or ()),
+        frozenset(mon.get('volatiles') or ()),
+        (hp > 0, hp == max_hp, ratio > 0.5, ratio > 1 / 3),
+    )
+
+
+def context_fingerprint(field):
+    context = field.get('context')
+    if isinstance(context, dict):
+        # The calc overwrites 'effectiveness' before any modifier reads it
+        context = {k: v for k, v in context.items() if k != 'effectiveness'}
+    return freeze(context)
+
+
+def field_fingerprint(field) -> tuple:
+    return (
+        tuple(freeze(field.get(k)) for k in CALC_FIELD_KEYS),
+        freeze(field.get('screens')),
+        freeze(field.get('allies')),
+        freeze(field.get('active_mons')),
+        context_fingerprint(field),
+    )
+
 
 class DamageCalculator:
-    def __init__(self, calc_client, enricher, rich_data, move_names=None):
+    def __init__(self, calc_client, enricher, rich_data, move_names=None, cache_size=4096):
         self.calc_client = calc_client
         self.enricher = enricher
         self.rich_data = rich_data
         self.move_names = move_names or {}
+        # Memo for the local calc (0 disables); see calc_fingerprint
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
+
+    def clear_cache(self):
+        self._cache.clear()
+        self.cache_hits = self.cache_misses = self.cache_evictions = 0
+
+    def cache_stats(self) -> Dict:
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'entries': len(self._cache),
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'evictions': self.cache_evictions,
+            'hit_rate': self.cache_hits / lookups if lookups else 0.0,
+        }
+
+    def _cache_key(self, move_input, move_name, move_data, overrides, fingerprint):
+        """Memo key for a local calc, or None when the move must be recomputed."""
+        if self.cache_size <= 0 or not move_data.get('basePower') or move_name in UNCACHED_MOVES:
+            # Variable-power moves depend on exact HP, weight, counters...
+            return None
+        return (move_input, overrides, fingerprint)
+
+    def _cache_get(self, key, field):
+        cached = self._cache.get(key)
+        if cached is None:
+            self.cache_misses += 1
+            return None
+        self.cache_hits += 1
+        self._cache.move_to_end(key)
+        # Same side effect as local_damage_calc.calculate_damage
+        context = field.get('context')
+        if not isinstance(context, dict):
+            context = {}
+        context['effectiveness'] = cached['effectiveness']
+        field['context'] = context
+        return _copy_result(cached)
+
+    def _cache_put(self, key, res):
+        self._cache[key] = _copy_result(res)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+            self.cache_evictions += 1
 
     def get_damage_rolls(self, attacker, defender, moves, field):
         """
@@ -25,6 +144,39 @@ class DamageCalculator:
         # Based on original implementation:
         return results
 
+    def calc_matchups(self, attacker, defenders, move_names, field_conditions=None):
+        """
+        Damage of every move of `attacker` against each of `defenders`, as one
+        calc_damage_for_moves result list per defender. The attacker and
+        field fingerprints are computed once for the whole batch.
+        """
+        if not field_conditions:
+            field_conditions = {}
+        shared = None
+        if self.cache_size > 0 and not self.calc_client:
+            shared = (calc_fingerprint(attacker), None, field_fingerprint(field_conditions))
+        return [
+            self._calc_moves(attacker, defender, move_names, field_conditions, None, None, shared)
+            for defender in defenders
+        ]
+
+    def calc_attackers(self, attackers, defender, field_conditions=None):
+        """
+        Damage of each attacker's own moves against `defender`, as one
+        calc_damage_for_moves result list per attacker (the reverse of
+        calc_matchups). The defender and field fingerprints are computed
+        once for the whole batch.
+        """
+        if not field_conditions:
+            field_conditions = {}
+        shared = None
+        if self.cache_size > 0 and not self.calc_client:
+            shared = (None, calc_fingerprint(defender), field_fingerprint(field_conditions))
+        return [
+            self._calc_moves(attacker, defender, attacker.get('moves', []), field_conditions, None, None, shared)
+            for attacker in attackers
+        ]
+
     def calc_damage_for_moves(
         self, attacker, defender, move_names, field_conditions=None, 
         move_type_override=None, move_bp_override=None
@@ -36,9 +188,20 @@ class DamageCalculator:
         """
         if not field_conditions:
             field_conditions = {}
+        return self._calc_moves(
+            attacker, defender, move_names, field_conditions,
+            move_type_override, move_bp_override, None
+        )
 
+    def _calc_moves(self, attacker, defender, move_names, field_conditions,
+                    move_type_override, move_bp_override, shared):
+        # shared: (attacker, defender, field) fingerprints precomputed by
+        # calc_matchups / calc_attackers; None entries are computed here
         results = []
+        # Computed on the first cacheable move, shared by the others
+        fingerprint = None
         for move_input in move_names:
+            key = None
             if isinstance(move_input, int):
                 move_name = self.move_names.get(str(move_input), str(move_input))
             else:
@@ -59,9 +222,8 @@ class DamageCalculator:
             else:
                 # Fallback to internal python mechanic (if existed) or returns 0
                 try:
-                    from pkh_app import local_damage_calc
-                    move_data = self.rich_data.get("moves", {}).get(
-                        str(move_name).lower().replace(" ", "").replace("-", "").replace("'", ""), {}
+                    move_data = GAME_DATA.index("moves").record(
+                        move_name, {}, self.rich_data.get("moves", {})
                     )
                     # If move_data missing, try to fetch from mechanics
                     if not move_data:
@@ -71,6 +233,29 @@ class DamageCalculator:
                         # Let's rely on what we have.
                         pass
                     
+                    if self.cache_size > 0 and fingerprint is None:
+                        if shared is not None:
+                            fingerprint = (
+                                shared[0] if shared[0] is not None else calc_fingerprint(attacker),
+                                shared[1] if shared[1] is not None else calc_fingerprint(defender),
+                                shared[2],
+                            )
+                        else:
+                            fingerprint = (
+                                calc_fingerprint(attacker), calc_fingerprint(defender),
+                                field_fingerprint(field_conditions),
+                            )
+                    key = self._cache_key(
+                        move_input, move_name, move_data,
+                        (move_type_override, move_bp_override), fingerprint
+                    )
+                    if key is not None:
+                        cached = self._cache_get(key, field_conditions)
+                        if cached is not None:
+                            results.append(cached)
+                            continue
+
+                    from pkh_app import local_damage_calc
                     result = local_damage_calc.calculate_damage(
                         attacker, defender, move_name, move_data, field_conditions,
                         move_type_override=move_type_override,
@@ -82,6 +267,7 @@ class DamageCalculator:
                     import logging
                     logging.error(f"Error in local damage calc: {e}")
                     result = {'damage': [0]}
+                    key = None
 
             damage_rolls = result.get("damage_rolls", result.get("damage", [0]))
             
@@ -104,6 +290,17 @@ class DamageCalculator:
                 "effectiveness": result.get("effectiveness", result.get("type_effectiveness", 1.0)),
                 "is_stab": result.get("is_stab", False),
             })
+            if key is not None:
+                self._cache_put(key, res)
             results.append(res)
 
         return results
+
+
+def _copy_result(result: Dict) -> Dict:
+    """Callers may edit the result and its roll lists; cached entries must not change."""
+    res = dict(result)
+    for k in ('damage', 'damage_rolls', 'crit_rolls'):
+        if isinstance(res.get(k), list):
+            res[k] = list(res[k])
+    return res
@@ -3,14 +3,17 @@ from typing import Dict, List, Optional
 import copy
 import logging
 from .state import BattleState
+from .registry import RichRegistry
+from pkh_app.game_data import slugify
 from pkh_app.mechanics import Mechanics
 
 class StateEnricher:
-    def __init__(self, pokedex, rich_data, move_names, species_names):
+    def __init__(self, pokedex, rich_data, move_names, species_names, registry=None):
         self.pokedex = pokedex
         self.rich_data = rich_data
         self.move_names = move_names
         self.species_names = species_names
+        self.registry = registry or RichRegistry(rich_data, pokedex)
 
     def enrich_state(self, state: BattleState):
         """Attaches rich data to all mons in the state."""
@@ -24,41 +27,27 @@ class StateEnricher:
     def enrich_mon(self, mon: Dict):
         if not mon:
             return
+        registry = self.registry
 
-        # Move ID to Slug mapping
+        # Move ID to Slug mapping (shared per moveset)
         if "moves" in mon:
-            mon["_rich_moves"] = {}
-            for move in mon["moves"]:
-                if isinstance(move, int):
-                    name = self.move_names.get(str(move), str(move))
-                    slug = name.lower().replace(" ", "").replace("-", "").replace("'", "")
-                elif isinstance(move, str):
-                    slug = move.lower().replace(" ", "").replace("-", "").replace("'", "")
-                else:
-                    slug = None
-
-                if slug:
-                    mon["_rich_moves"][slug] = (
-                        self.rich_data.get("moves", {}).get(slug, {})
-                    )
-
-        # Ability
+            mon["_rich_moves"] = registry.moveset(mon["moves"], self.move_names)
+
+        # Ability / Item (modifier pipelines are compiled once per record)
         ab = mon.get("ability")
         if ab:
-            slug = str(ab).lower().replace(" ", "").replace("-", "").replace("'", "")
-            mon["_rich_ability"] = self.rich_data.get("abilities", {}).get(slug, {})
+            mon["_rich_ability"] = registry.get("abilities", ab, {})
+            Mechanics.compile_modifiers(mon["_rich_ability"])
 
-        # Item
         item = mon.get("item")
         if item:
-            slug = str(item).lower().replace(" ", "").replace("-", "").replace("'", "")
-            mon["_rich_item"] = self.rich_data.get("items", {}).get(slug, {})
+            mon["_rich_item"] = registry.get("items", item, {})
+            Mechanics.compile_modifiers(mon["_rich_item"])
 
         # Species (for weight and other data)
         species = mon.get("species")
         if species:
-            slug = str(species).lower().replace(" ", "").replace("-", "")
-            mon["_rich_species"] = self.pokedex.get(slug, {})
+            mon["_rich_species"] = registry.species(species, {})
             
             # Ensure types are populated
             if not mon.get("types"):
@@ -129,12 +118,7 @@ class StateEnricher:
             if mega_species.startswith(current_species):
                 # Perform transformation
                 mon["is_mega"] = True
-                slug = (
-                    mega_species.lower()
-                    .replace(" ", "")
-                    .replace("-", "")
-                    .replace("'", "")
-                )
+                slug = slugify(mega_species)
                 self._perform_form_change(mon, slug, log, state)
 
     def _check_primal_reversion(self, state, side, log):
@@ -165,8 +149,7 @@ class StateEnricher:
             return False
 
         # Check rich data for megaStone/onPrimal flags
-        slug = item_name.lower().replace(" ", "").replace("-", "").replace("'", "")
-        rich_item = self.rich_data.get("items", {}).get(slug, {})
+        rich_item = self.registry.get("items", item_name, {})
 
         if rich_item.get("megaStone") or rich_item.get("onPrimal"):
             return True
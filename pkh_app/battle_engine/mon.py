@@ -0,0 +1,580 @@
+import threading
+from typing import Dict, Iterable, Optional
+
+from .zobrist import HASHED_MON_KEYS, scalar_key, stage_key, volatile_key
+
+# Fixed layout for stats / stat_stages arrays
+STAT_ORDER = ("hp", "atk", "def", "spa", "spd", "spe", "acc", "eva")
+STAT_INDEX = {name: idx for idx, name in enumerate(STAT_ORDER)}
+
+# Hot keys stored in the Mon value array; anything else lands in Mon.extra
+MON_SLOTS = (
+    "species", "name", "species_id", "level", "current_hp", "max_hp", "status",
+    "ability", "item", "types", "moves", "stats", "stat_stages", "volatiles",
+    "side", "status_counter", "toxic_counter", "activeTurns", "turn_priority_mod",
+    "_rich_moves", "_rich_ability", "_rich_item", "_rich_species",
+)
+_SLOT_SET = frozenset(MON_SLOTS)
+_RICH_SLOTS = frozenset(("_rich_moves", "_rich_ability", "_rich_item", "_rich_species"))
+_COMPACT_KEYS = frozenset(("stats", "stat_stages", "volatiles"))
+_UNSET = object()
+
+# Volatile name <-> bit registry, shared process-wide; registration is
+# locked so concurrent search threads never hand out the same bit twice
+_VOLATILE_BITS: Dict[str, int] = {}
+_VOLATILE_NAMES = []
+_VOLATILE_LOCK = threading.Lock()
+
+
+def volatile_bit(name) -> int:
+    bit = _VOLATILE_BITS.get(name)
+    if bit is None:
+        with _VOLATILE_LOCK:
+            bit = _VOLATILE_BITS.get(name)
+            if bit is None:
+                bit = 1 << len(_VOLATILE_NAMES)
+                _VOLATILE_NAMES.append(name)
+                _VOLATILE_BITS[name] = bit
+    return bit
+
+
+class StatBlock:
+    """
+    Array-backed replacement for the `stats` / `stat_stages` dicts.
+    Unset entries behave like missing dict keys, so `.get(stat, default)`
+    keeps its meaning. The array is only allocated on first write (most
+    stage blocks stay empty). Keys outside STAT_ORDER (e.g. pokedex
+    'at'/'df') are kept in a small side dict. `zkey` is the Zobrist key of
+    the entries, maintained on every write.
+    """
+    __slots__ = ("values", "extra", "zkey")
+
+    def __init__(self, data: Optional[Dict] = None):
+        self.values = None
+        self.extra = None
+        self.zkey = 0
+        if data:
+            for k, v in data.items():
+                self[k] = v
+
+    def get(self, key, default=None):
+        idx = STAT_INDEX.get(key)
+        if idx is not None:
+            vals = self.values
+            if vals is None:
+                return default
+            v = vals[idx]
+            return default if v is None else v
+        if self.extra:
+            return self.extra.get(key, default)
+        return default
+
+    def __getitem__(self, key):
+        v = self.get(key, _UNSET)
+        if v is _UNSET:
+            raise KeyError(key)
+        return v
+
+    def __setitem__(self, key, value):
+        idx = STAT_INDEX.get(key)
+        if idx is not None:
+            if self.values is None:
+                self.values = [None] * 8
+            old = self.values[idx]
+            self.values[idx] = value
+        else:
+            if self.extra is None:
+                self.extra = {}
+            old = self.extra.get(key)
+            self.extra[key] = value
+        self.zkey ^= stage_key(key, old) ^ stage_key(key, value)
+
+    def __delitem__(self, key):
+        if self.pop(key, _UNSET) is _UNSET:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return self.get(key, _UNSET) is not _UNSET
+
+    def items(self):
+        out = []
+        if self.values is not None:
+            out = [(STAT_ORDER[i], v) for i, v in enumerate(self.values) if v is not None]
+        if self.extra:
+            out.extend(self.extra.items())
+        return out
+
+    def keys(self):
+        return [k for k, _ in self.items()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.items())
+
+    def __bool__(self):
+        return bool(self.items())
+
+    def setdefault(self, key, default=None):
+        v = self.get(key, _UNSET)
+        if v is _UNSET:
+            self[key] = default
+            return default
+        return v
+
+    def pop(self, key, default=_UNSET):
+        idx = STAT_INDEX.get(key)
+        if idx is not None and self.values is not None and self.values[idx] is not None:
+            v = self.values[idx]
+            self.values[idx] = None
+            self.zkey ^= stage_key(key, v)
+            return v
+        if self.extra and key in self.extra:
+            v = self.extra.pop(key)
+            self.zkey ^= stage_key(key, v)
+            return v
+        if default is _UNSET:
+            raise KeyError(key)
+        return default
+
+    def update(self, other=(), **kwargs):
+        items = other.items() if hasattr(other, "items") else other
+        for k, v in items:
+            self[k] = v
+        for k, v in kwargs.items():
+            self[k] = v
+
+    def clear(self):
+        self.values = None
+        self.extra = None
+        self.zkey = 0
+
+    def copy(self):
+        new = StatBlock.__new__(StatBlock)
+        new.values = self.values[:] if self.values is not None else None
+        new.extra = dict(self.extra) if self.extra else None
+        new.zkey = self.zkey
+        return new
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, StatBlock):
+            return self.items() == other.items()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"StatBlock({self.to_dict()!r})"
+
+
+class VolatileSet:
+    """
+    Bitset of volatile conditions with the list API the engine uses
+    (in/append/remove). `zkey` is the Zobrist key of the members.
+    """
+    __slots__ = ("bits", "zkey")
+
+    def __init__(self, names: Iterable = ()):
+        self.bits = 0
+        self.zkey = 0
+        self.extend(names)
+
+    def __contains__(self, name):
+        bit = _VOLATILE_BITS.get(name)
+        return bit is not None and (self.bits & bit) != 0
+
+    def append(self, name):
+        bit = volatile_bit(name)
+        if not self.bits & bit:
+            self.bits |= bit
+            self.zkey ^= volatile_key(name)
+
+    add = append
+
+    def extend(self, names):
+        for name in names:
+            self.append(name)
+
+    def remove(self, name):
+        if name not in self:
+            raise ValueError(f"{name!r} not in volatiles")
+        self.discard(name)
+
+    def discard(self, name):
+        bit = _VOLATILE_BITS.get(name)
+        if bit is not None and self.bits & bit:
+            self.bits &= ~bit
+            self.zkey ^= volatile_key(name)
+
+    def count(self, name):
+        return 1 if name in self else 0
+
+    def clear(self):
+        self.bits = 0
+        self.zkey = 0
+
+    def __iter__(self):
+        bits = self.bits
+        idx = 0
+        while bits:
+            if bits & 1:
+                yield _VOLATILE_NAMES[idx]
+            bits >>= 1
+            idx += 1
+
+    def __len__(self):
+        return self.bits.bit_count()
+
+    def __bool__(self):
+        return self.bits != 0
+
+    def copy(self):
+        new = VolatileSet.__new__(VolatileSet)
+        new.bits = self.bits
+        new.zkey = self.zkey
+        return new
+
+    def __eq__(self, other):
+        if isinstance(other, VolatileSet):
+            return self.bits == other.bits
+        if isinstance(other, (list, tuple, set, frozenset)):
+            return set(self) == set(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"VolatileSet({list(self)!r})"
+
+
+def _coerce(key, value):
+    cls = value.__class__
+    if cls is dict and (key == "stats" or key == "stat_stages"):
+        return StatBlock(value)
+    if key == "volatiles" and (cls is list or cls is set or cls is tuple):
+        return VolatileSet(value)
+    return value
+
+
+# Mon value array layout
+MON_INDEX = {name: idx for idx, name in enumerate(MON_SLOTS)}
+_N_SLOTS = len(MON_SLOTS)
+_EMPTY_ROW = [_UNSET] * _N_SLOTS
+_RICH_IDX = frozenset(MON_INDEX[k] for k in _RICH_SLOTS)
+# Slots holding scalars (str/int/None) in practice; copied by reference
+_SCALAR_IDX = frozenset(
+    MON_INDEX[k] for k in (
+        "species", "name", "species_id", "level", "current_hp", "max_hp", "status",
+        "ability", "item", "side", "status_counter", "toxic_counter", "activeTurns",
+        "turn_priority_mod",
+    )
+)
+# Replaced wholesale by the engine (never edited in place), so clones share them
+_SHARED_IDX = _RICH_IDX | frozenset(MON_INDEX[k] for k in ("stats", "types", "moves"))
+_CONTAINER_IDX = tuple(i for i in range(_N_SLOTS) if i not in _SHARED_IDX and i not in _SCALAR_IDX)
+
+CURRENT_HP = MON_INDEX["current_hp"]
+MAX_HP = MON_INDEX["max_hp"]
+STATS = MON_INDEX["stats"]
+STAT_STAGES = MON_INDEX["stat_stages"]
+VOLATILES = MON_INDEX["volatiles"]
+ABILITY = MON_INDEX["ability"]
+ITEM = MON_INDEX["item"]
+STATUS = MON_INDEX["status"]
+RICH_ABILITY = MON_INDEX["_rich_ability"]
+RICH_ITEM = MON_INDEX["_rich_item"]
+# Writes to these invalidate Mon.stat_cache (in-place stage edits are
+# covered by the StatBlock zkeys in the cache key instead; HP only matters
+# for a few abilities, which Mechanics.get_effective_stat adds to the key)
+_STAT_DEP_IDX = frozenset(
+    MON_INDEX[k] for k in (
+        "species", "status", "ability", "item", "stats", "stat_stages", "side",
+        "_rich_ability", "_rich_item",
+    )
+)
+_STAT_DEP_EXTRA = frozenset(("unburden_active",))
+# Effective-stat cache counters (Mon.cached_stat, Mechanics.stat_cache_stats)
+STAT_CACHE_COUNTERS = {"hits": 0, "misses": 0, "invalidations": 0}
+# Slots covered by Mon.zkey (stages/volatiles carry their own keys)
+_HASHED_IDX = {MON_INDEX[k]: k for k in HASHED_MON_KEYS}
+_EMPTY_ZKEY = 0
+for _name in HASHED_MON_KEYS:
+    _EMPTY_ZKEY ^= scalar_key(_name, None)
+
+
+class Mon:
+    """
+    Compact mon record: hot keys live in one fixed-layout value array
+    (`row`, indexed by MON_INDEX), stats/stages are StatBlock arrays and
+    volatiles a VolatileSet bitset. Rare keys go to the `extra` dict.
+
+    Mon implements the dict API used across the engine (get, [], setdefault,
+    pop, copy, items, in), so BattleEngine / Mechanics / AIScorer keep
+    working on either representation. Hot paths can read `row` directly.
+    Writes keep the Zobrist key (`zkey`) of the hashed scalar slots
+    current, so `zobrist()` is O(1). `stat_cache` holds effective stats
+    (see cached_stat) and is dropped whenever an input of
+    Mechanics.get_effective_stat is written.
+    """
+    __slots__ = ("row", "extra", "zkey", "stat_cache")
+
+    def __init__(self, data: Optional[Dict] = None, memo: Optional[Dict] = None):
+        self.row = _EMPTY_ROW[:]
+        self.extra = None
+        self.zkey = _EMPTY_ZKEY
+        self.stat_cache = None
+        if data:
+            for k, v in data.items():
+                if memo is not None and k in _COMPACT_KEYS:
+                    # Containers shared between dicts (active vs party copy) stay shared
+                    oid = id(v)
+                    if oid not in memo:
+                        memo[oid] = _coerce(k, v)
+                    v = memo[oid]
+                self[k] = v
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Mon":
+        if isinstance(data, Mon):
+            return data
+        return cls(data)
+
+    def to_dict(self) -> Dict:
+        out = {}
+        for k, v in self.items():
+            if isinstance(v, StatBlock):
+                v = v.to_dict()
+            elif isinstance(v, VolatileSet):
+                v = list(v)
+            out[k] = v
+        return out
+
+    # --- dict API shim ---
+    def get(self, key, default=None):
+        idx = MON_INDEX.get(key)
+        if idx is not None:
+            v = self.row[idx]
+            return default if v is _UNSET else v
+        if self.extra:
+            return self.extra.get(key, default)
+        return default
+
+    def __getitem__(self, key):
+        idx = MON_INDEX.get(key)
+        if idx is not None:
+            v = self.row[idx]
+            if v is not _UNSET:
+                return v
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        idx = MON_INDEX.get(key)
+        if idx is not None:
+            if idx in _HASHED_IDX:
+                old = self.row[idx]
+                self.zkey ^= scalar_key(key, None if old is _UNSET else old) ^ scalar_key(key, value)
+            if self.stat_cache is not None and idx in _STAT_DEP_IDX:
+                old = self.row[idx]
+                if old is not value and old != value:
+                    self._invalidate_stats()
+            self.row[idx] = _coerce(key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            if self.stat_cache is not None and key in _STAT_DEP_EXTRA:
+                self._invalidate_stats()
+            self.extra[key] = value
+
+    def __delitem__(self, key):
+        if self.pop(key, _UNSET) is _UNSET:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        idx = MON_INDEX.get(key)
+        if idx is not None:
+            return self.row[idx] is not _UNSET
+        return bool(self.extra) and key in self.extra
+
+    def setdefault(self, key, default=None):
+        v = self.get(key, _UNSET)
+        if v is _UNSET:
+            self[key] = default
+            # Return the stored (possibly coerced) container so appends stick
+            return self[key]
+        return v
+
+    def pop(self, key, default=_UNSET):
+        idx = MON_INDEX.get(key)
+        if idx is not None:
+            v = self.row[idx]
+            if v is not _UNSET:
+                self.row[idx] = _UNSET
+                if idx in _HASHED_IDX:
+                    self.zkey ^= scalar_key(key, v) ^ scalar_key(key, None)
+                if self.stat_cache is not None and idx in _STAT_DEP_IDX:
+                    self._invalidate_stats()
+                return v
+        elif self.extra and key in self.extra:
+            if self.stat_cache is not None and key in _STAT_DEP_EXTRA:
+                self._invalidate_stats()
+            return self.extra.pop(key)
+        if default is _UNSET:
+            raise KeyError(key)
+        return default
+
+    def keys(self):
+        out = [MON_SLOTS[i] for i, v in enumerate(self.row) if v is not _UNSET]
+        if self.extra:
+            out.extend(self.extra)
+        return out
+
+    def items(self):
+        out = [(MON_SLOTS[i], v) for i, v in enumerate(self.row) if v is not _UNSET]
+        if self.extra:
+            out.extend(self.extra.items())
+        return out
+
+    def values(self):
+        return [v for _, v in self.items()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __bool__(self):
+        return True
+
+    def update(self, other=(), **kwargs):
+        items = other.items() if hasattr(other, "items") else other
+        for k, v in items:
+            self[k] = v
+        for k, v in kwargs.items():
+            self[k] = v
+
+    def copy(self) -> "Mon":
+        """Shallow copy (nested containers shared), like dict.copy()."""
+        new = Mon.__new__(Mon)
+        new.row = self.row[:]
+        new.extra = dict(self.extra) if self.extra else None
+        new.zkey = self.zkey
+        # Shared until either side writes a stat input (which drops its reference)
+        new.stat_cache = self.stat_cache
+        return new
+
+    def stat_inputs(self, stat_name):
+        """
+        Everything Mechanics.get_effective_stat reads from the mon, in one call:
+        (raw stat, stage, rich ability, ability, item, rich item, status),
+        with the same defaults as the dict path.
+        """
+        row = self.row
+        stats = row[STATS]
+        stages = row[STAT_STAGES]
+        ability = row[ABILITY]
+        item = row[ITEM]
+        status = row[STATUS]
+        return (
+            1 if stats is _UNSET else stats.get(stat_name, 1),
+            0 if stages is _UNSET else stages.get(stat_name, 0),
+            row[RICH_ABILITY] if row[RICH_ABILITY] is not _UNSET else {},
+            None if ability is _UNSET else ability,
+            "" if item is _UNSET else item,
+            row[RICH_ITEM] if row[RICH_ITEM] is not _UNSET else {},
+            None if status is _UNSET else status,
+        )
+
+    def cached_stat(self, stat_name, field_key, compute):
+        """
+        Effective stat from stat_cache, else compute() (stored). Entries are
+        keyed by the stat, the caller's key (field state, HP where it
+        matters) and the stats/stages zkeys; other inputs invalidate the
+        whole cache when written.
+        """
+        row = self.row
+        stats = row[STATS]
+        stages = row[STAT_STAGES]
+        key = (
+            stat_name, field_key,
+            stats.zkey if stats.__class__ is StatBlock else None,
+            stages.zkey if stages.__class__ is StatBlock else None,
+        )
+        cache = self.stat_cache
+        if cache is None:
+            cache = self.stat_cache = {}
+        else:
+            val = cache.get(key)
+            if val is not None:
+                STAT_CACHE_COUNTERS["hits"] += 1
+                return val
+        STAT_CACHE_COUNTERS["misses"] += 1
+        val = cache[key] = compute()
+        return val
+
+    def _invalidate_stats(self):
+        STAT_CACHE_COUNTERS["invalidations"] += 1
+        self.stat_cache = None
+
+    def clone(self, memo: Dict, copy_value) -> "Mon":
+        """
+        Deep copy used by BattleState.deep_copy. Rich references, stats,
+        types and moves are shared (the engine replaces them instead of
+        editing in place); stages, volatiles and extras are copied.
+        """
+        new = Mon.__new__(Mon)
+        memo[id(self)] = new
+        row = self.row[:]
+        for idx in _CONTAINER_IDX:
+            v = row[idx]
+            if v is not _UNSET and v is not None:
+                row[idx] = copy_value(v, memo)
+        new.row = row
+        new.extra = copy_value(self.extra, memo) if self.extra else None
+        new.zkey = self.zkey
+        new.stat_cache = self.stat_cache
+        return new
+
+    def zobrist(self) -> int:
+        """Zobrist key over HASHED_MON_KEYS, stat stages and volatiles."""
+        h = self.zkey
+        row = self.row
+        stages = row[STAT_STAGES]
+        if stages.__class__ is StatBlock:
+            h ^= stages.zkey
+        elif stages is not _UNSET and stages:
+            for stat, value in stages.items():
+                h ^= stage_key(stat, value)
+        vols = row[VOLATILES]
+        if vols.__class__ is VolatileSet:
+            h ^= vols.zkey
+        elif vols is not _UNSET and vols:
+            for name in set(vols):
+                h ^= volatile_key(name)
+        return h
+
+    def __eq__(self, other):
+        # The engine identifies mons with `==` (e.g. `mon == state.player_active`)
+        if other is self:
+            return True
+        if isinstance(other, Mon):
+            return self.row == other.row and (self.extra or {}) == (other.extra or {})
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return (Mon.from_dict, (self.to_dict(),))
+
+    def __repr__(self):
+        return f"Mon({self.get('species')!r}, hp={self.get('current_hp')}/{self.get('max_hp')})"
@@ -0,0 +1,83 @@
+from typing import Dict, Optional
+
+from pkh_app.game_data import GAME_DATA, slugify, species_slugify
+
+
+class RichRegistry:
+    """
+    Shared, read-only view over mechanics_rich.json / pokedex_rich.json.
+
+    Mons only hold references ("handles") to records owned by the registry:
+    `_rich_ability`, `_rich_item`, `_rich_species` and the `_rich_moves`
+    mapping are all shared between every state that uses the same engine,
+    so BattleState.deep_copy and get_hash never touch static data.
+    Records must not be mutated; replace the reference instead (Skill Swap,
+    Trick, etc. already do this).
+
+    Names and IDs resolve through GAME_DATA's NameIndex; records are read
+    from the engine's own tables so per-engine edits take effect.
+    """
+
+    def __init__(self, rich_data: Dict, pokedex: Dict):
+        self.rich_data = rich_data
+        self.pokedex = pokedex
+        self._movesets = {}
+
+    def slug(self, name) -> str:
+        return slugify(name)
+
+    def species_slug(self, name) -> str:
+        return species_slugify(name)
+
+    def get(self, category: str, name, default=None):
+        if not name:
+            return default
+        return GAME_DATA.index(category).record(name, default, self.rich_data.get(category, {}))
+
+    def species(self, name, default=None):
+        if not name:
+            return default
+        return GAME_DATA.index("species").record(name, default, self.pokedex)
+
+    def moveset(self, moves, move_names: Optional[Dict] = None, by_slug: bool = True) -> Dict:
+        """
+        Returns the shared `_rich_moves` mapping for a move list.
+
+        by_slug=True keys by slug and keeps unknown moves as {} (StateEnricher),
+        by_slug=False keys by display name and drops unknown moves (engine).
+        """
+        try:
+            key = (by_slug, tuple(moves))
+            cached = self._movesets.get(key)
+        except TypeError:
+            key, cached = None, None
+        if cached is not None:
+            return cached
+
+        table = self.rich_data.get("moves", {})
+        index = GAME_DATA.index("moves")
+        rich_moves = {}
+        for move in moves:
+            if by_slug:
+                if isinstance(move, int):
+                    # ROM move IDs; move_names (if given) wins over moves.json
+                    name = (move_names or {}).get(str(move))
+                    slug = index.slug(name) if name else index.slug(move) or str(move)
+                elif isinstance(move, str):
+                    slug = index.slug(move)
+                else:
+                    continue
+                if slug:
+                    rich_moves[slug] = table.get(slug, {})
+            elif isinstance(move, str):
+                rd = index.record(move, None, table)
+                if rd:
+                    rich_moves[move] = rd
+
+        if key is not None:
+            self._movesets[key] = rich_moves
+        return rich_moves
+
+    def clear(self):
+        """Drops cached lookups after rich_data/pokedex were edited in place."""
+        self._movesets.clear()
@@ -3,146 +3,15 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 import copy
 
-# Standard Gen 8 Type Chart
-TYPE_CHART = {
-    "Normal": {"Rock": 0.5, "Ghost": 0.0, "Steel": 0.5},
-    "Fire": {
-        "Fire": 0.5,
-        "Water": 0.5,
-        "Grass": 2.0,
-        "Ice": 2.0,
-        "Bug": 2.0,
-        "Rock": 0.5,
-        "Dragon": 0.5,
-        "Steel": 2.0,
-    },
-    "Water": {
-        "Fire": 2.0,
-        "Water": 0.5,
-        "Grass": 0.5,
-        "Ground": 2.0,
-        "Rock": 2.0,
-        "Dragon": 0.5,
-    },
-    "Electric": {
-        "Water": 2.0,
-        "Electric": 0.5,
-        "Grass": 0.5,
-        "Ground": 0.0,
-        "Flying": 2.0,
-        "Dragon": 0.5,
-    },
-    "Grass": {
-        "Fire": 0.5,
-        "Water": 2.0,
-        "Grass": 0.5,
-        "Poison": 0.5,
-        "Ground": 2.0,
-        "Flying": 0.5,
-        "Bug": 0.5,
-        "Rock": 2.0,
-        "Dragon": 0.5,
-        "Steel": 0.5,
-    },
-    "Ice": {
-        "Fire": 0.5,
-        "Water": 0.5,
-        "Grass": 2.0,
-        "Ice": 0.5,
-        "Ground": 2.0,
-        "Flying": 2.0,
-        "Dragon": 2.0,
-        "Steel": 0.5,
-    },
-    "Fighting": {
-        "Normal": 2.0,
-        "Ice": 2.0,
-        "Poison": 0.5,
-        "Flying": 0.5,
-        "Psychic": 0.5,
-        "Bug": 0.5,
-        "Rock": 2.0,
-        "Ghost": 0.0,
-        "Dark": 2.0,
-        "Steel": 2.0,
-        "Fairy": 0.5,
-    },
-    "Poison": {
-        "Grass": 2.0,
-        "Poison": 0.5,
-        "Ground": 0.5,
-        "Rock": 0.5,
-        "Ghost": 0.5,
-        "Steel": 0.0,
-        "Fairy": 2.0,
-    },
-    "Ground": {
-        "Fire": 2.0,
-        "Electric": 2.0,
-        "Grass": 0.5,
-        "Poison": 2.0,
-        "Flying": 0.0,
-        "Bug": 0.5,
-        "Rock": 2.0,
-        "Steel": 2.0,
-    },
-    "Flying": {
-        "Electric": 0.5,
-        "Grass": 2.0,
-        "Fighting": 2.0,
-        "Bug": 2.0,
-        "Rock": 0.5,
-        "Steel": 0.5,
-    },
-    "Psychic": {
-        "Fighting": 2.0,
-        "Poison": 2.0,
-        "Psychic": 0.5,
-        "Dark": 0.0,
-        "Steel": 0.5,
-    },
-    "Bug": {
-        "Fire": 0.5,
-        "Grass": 2.0,
-        "Fighting": 0.5,
-        "Poison": 0.5,
-        "Flying": 0.5,
-        "Psychic": 2.0,
-        "Ghost": 0.5,
-        "Dark": 2.0,
-        "Steel": 0.5,
-        "Fairy": 0.5,
-    },
-    "Rock": {
-        "Fire": 2.0,
-        "Ice": 2.0,
-        "Fighting": 0.5,
-        "Ground": 0.5,
-        "Flying": 2.0,
-        "Bug": 2.0,
-        "Steel": 0.5,
-    },
-    "Ghost": {"Normal": 0.0, "Psychic": 2.0, "Ghost": 2.0, "Dark": 0.5},
-    "Dragon": {"Dragon": 2.0, "Steel": 0.5, "Fairy": 0.0},
-    "Dark": {"Fighting": 0.5, "Psychic": 2.0, "Ghost": 2.0, "Dark": 0.5, "Fairy": 0.5},
-    "Steel": {
-        "Fire": 0.5,
-        "Water": 0.5,
-        "Electric": 0.5,
-        "Ice": 2.0,
-        "Rock": 2.0,
-        "Steel": 0.5,
-        "Fairy": 2.0,
-    },
-    "Fairy": {
-        "Fire": 0.5,
-        "Fighting": 2.0,
-        "Poison": 0.5,
-        "Dragon": 2.0,
-        "Dark": 2.0,
-        "Steel": 0.5,
-    },
-}
+from .mon import Mon, StatBlock, VolatileSet
+from .zobrist import combine_keys, mon_key, zobrist_key
+from pkh_app.type_chart import TYPE_CHART
+
+# Keys attached by StateEnricher that point into the static mechanics/pokedex
+# data. They are never mutated by the engine, so copies share them.
+RICH_KEYS = frozenset(("_rich_moves", "_rich_ability", "_rich_item", "_rich_species"))
+_COMPACT_TYPES = (Mon, StatBlock, VolatileSet)
+
 
 
 @dataclass
@@ -210,37 +79,96 @@ class BattleState:
                     self.fields[k] = v
 
     def deep_copy(self):
-        return copy.deepcopy(self)
+        """
+        Returns an independent copy of the state for search.
+        Mons and fields are copied with a JSON-aware copier; the enriched
+        `_rich_*` references are shared with the parent state instead of
+        being duplicated. Aliasing inside the state (e.g. active mon that is
+        also a party entry) is preserved, as with copy.deepcopy.
+        """
+        memo = {}
+        clone = object.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone.player_active = _copy_mon(self.player_active, memo)
+        clone.ai_active = _copy_mon(self.ai_active, memo)
+        clone.player_party = [_copy_mon(m, memo) for m in self.player_party]
+        clone.ai_party = [_copy_mon(m, memo) for m in self.ai_party]
+        clone.last_moves = _copy_tree(self.last_moves, memo)
+        clone.fields = _copy_tree(self.fields, memo)
+        return clone
 
-    def get_hash(self):
-        """Returns a stable hash for the core state variables to detect cycles."""
+    def compact(self):
+        """
+        Converts every mon to the slot-backed Mon record in place (stats and
+        stages as arrays, volatiles as a bitset). Aliasing between actives and
+        party entries is kept. Returns self.
+        """
+        memo = {}
+
+        def conv(mon):
+            if mon is None or isinstance(mon, Mon):
+                return mon
+            oid = id(mon)
+            if oid not in memo:
+                memo[oid] = Mon(mon, memo)
+            return memo[oid]
 
-        def get_mon_hash(m):
-            v_h = tuple(sorted(m.get("volatiles", [])))
-            return (
-                m.get("species"),
-                m.get("current_hp"),
-                m.get("status"),
-                tuple(sorted(m.get("stat_stages", {}).items())),
-                v_h,
-            )
+        self.player_active = conv(self.player_active)
+        self.ai_active = conv(self.ai_active)
+        self.player_party = [conv(m) for m in self.player_party]
+        self.ai_party = [conv(m) for m in self.ai_party]
+        return self
 
-        p_active_h = get_mon_hash(self.player_active)
-        a_active_h = get_mon_hash(self.ai_active)
-        p_party_h = tuple(get_mon_hash(m) for m in self.player_party)
-        a_party_h = tuple(get_mon_hash(m) for m in self.ai_party)
+    def to_dict(self):
+        """
+        JSON-serializable snapshot of the dynamic state. Enriched `_rich_*`
+        references are static game data and are left out; re-enrich after
+        loading.
+        """
+        def strip(mon):
+            if mon is None:
+                return None
+            if isinstance(mon, Mon):
+                mon = mon.to_dict()
+            return {k: v for k, v in mon.items() if k not in RICH_KEYS}
 
+        memo = {}
+        return _copy_tree({
+            "player_active": strip(self.player_active),
+            "ai_active": strip(self.ai_active),
+            "player_party": [strip(m) for m in self.player_party],
+            "ai_party": [strip(m) for m in self.ai_party],
+            "last_moves": self.last_moves,
+            "fields": self.fields,
+        }, memo)
+
+    def get_hash(self):
+        """
+        Returns a process-stable 64-bit key of the core state variables,
+        used for cycle detection, the transposition table and seed
+        derivation (so it must not depend on builtin hash(), which is
+        salted per process for strings and address-based for None).
+
+        Mons contribute Zobrist keys (species, HP, status, ability, item,
+        stat stages, volatiles) that compact Mons keep current as the engine
+        writes to them, so the per-mon part is O(1). Dict mons are keyed from
+        scratch with the same keys, so both representations hash alike.
+        Fields and last moves are keyed by blake2b of their contents
+        (memoized in zobrist). Slots are combined in order, so positions
+        are not interchangeable.
+        """
         # Fields Hash
         f = self.fields
+        screens = f.get("screens")
+        tailwind = f.get("tailwind")
+        hazards = f.get("hazards")
         screens_h = tuple(
-            sorted(
-                (k, tuple(sorted(v.items()))) for k, v in f.get("screens", {}).items()
-            )
-        )
-        tailwind_h = tuple(sorted(f.get("tailwind", {}).items()))
+            sorted((k, tuple(sorted(v.items()))) for k, v in screens.items())
+        ) if screens else ()
+        tailwind_h = tuple(sorted(tailwind.items())) if tailwind else ()
         hazards_h = tuple(
-            sorted((k, tuple(v)) for k, v in f.get("hazards", {}).items())
-        )
+            sorted((k, tuple(v)) for k, v in hazards.items())
+        ) if hazards else ()
 
         fields_h = (
             f.get("weather"),
@@ -253,14 +181,88 @@ class BattleState:
             hazards_h,
         )
 
-        return hash(
-            (
-                p_active_h,
-                a_active_h,
-                p_party_h,
-                a_party_h,
-                self.last_moves.get("player"),
-                self.last_moves.get("ai"),
-                fields_h,
-            )
-        )
+        def key(m):
+            return m.zobrist() if m.__class__ is Mon else mon_key(m)
+
+        h = combine_keys(0, key(self.player_active))
+        h = combine_keys(h, key(self.ai_active))
+        h = combine_keys(h, len(self.player_party))
+        for m in self.player_party:
+            h = combine_keys(h, key(m))
+        h = combine_keys(h, len(self.ai_party))
+        for m in self.ai_party:
+            h = combine_keys(h, key(m))
+        h = combine_keys(h, zobrist_key("last_moves", self.last_moves.get("player"), self.last_moves.get("ai")))
+        return combine_keys(h, zobrist_key("fields", fields_h))
+
+def _copy_mon(mon, memo):
+    if mon is None:
+        return None
+    oid = id(mon)
+    if oid in memo:
+        return memo[oid]
+    if mon.__class__ is Mon:
+        return mon.clone(memo, _copy_tree)
+    new = {}
+    memo[oid] = new
+    for k, v in mon.items():
+        if k in RICH_KEYS:
+            new[k] = v
+        else:
+            new[k] = _copy_tree(v, memo)
+    return new
+
+
+def _copy_tree(obj, memo):
+    """Deep copy for the JSON-like containers used in battle state."""
+    cls = obj.__class__
+    if cls is dict:
+        oid = id(obj)
+        if oid in memo:
+            return memo[oid]
+        new = {}
+        memo[oid] = new
+        for k, v in obj.items():
+            vc = v.__class__
+            if vc is dict or vc is list or vc is set or vc is tuple or vc in _COMPACT_TYPES:
+                new[k] = _copy_tree(v, memo)
+            elif vc is str or vc is int or vc is float or vc is bool or v is None:
+                new[k] = v
+            else:
+                new[k] = copy.deepcopy(v, memo)
+        return new
+    if cls is list:
+        oid = id(obj)
+        if oid in memo:
+            return memo[oid]
+        new = []
+        memo[oid] = new
+        for v in obj:
+            vc = v.__class__
+            if vc is str or vc is int or vc is float or vc is bool or v is None:
+                new.append(v)
+            else:
+                new.append(_copy_tree(v, memo))
+        return new
+    if cls is set:
+        # Set members are hashable scalars/tuples in practice
+        oid = id(obj)
+        if oid in memo:
+            return memo[oid]
+        new = set(obj)
+        memo[oid] = new
+        return new
+    if cls is tuple:
+        return tuple(_copy_tree(v, memo) for v in obj)
+    if cls is StatBlock or cls is VolatileSet:
+        oid = id(obj)
+        if oid in memo:
+            return memo[oid]
+        new = obj.copy()
+        memo[oid] = new
+        return new
+    if cls is Mon:
+        return _copy_mon(obj, memo)
+    if cls is str or cls is int or cls is float or cls is bool or obj is None:
+        return obj
+    return copy.deepcopy(obj, memo)
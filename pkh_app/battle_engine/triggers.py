@@ -1,14 +1,27 @@
 
 from typing import Dict, List, Optional
-import random
 import logging
 from .state import BattleState
+from .chance import RandomStream
 from pkh_app.mechanics import Mechanics
+from pkh_app.game_data import GAME_DATA
 
 class TriggerHandler:
     def __init__(self, enricher, rich_data):
         self.enricher = enricher
         self.rich_data = rich_data
+        # Kept in sync with BattleEngine.rng
+        self._rng = RandomStream()
+
+    @property
+    def rng(self):
+        # While a turn is resolved on this thread, its stream
+        stream = Mechanics.turn_rng()
+        return self._rng if stream is None else stream
+
+    @rng.setter
+    def rng(self, stream):
+        self._rng = stream
 
     def trigger_event(
         self,
@@ -118,8 +131,7 @@ class TriggerHandler:
         
         move_data = None
         if move_name:
-            slug = move_name.lower().replace(" ", "").replace("-", "").replace("'", "")
-            move_data = self._get_mechanic(slug, "moves")
+            move_data = self._get_mechanic(move_name, "moves")
 
         trigger = rich_data.get(event_key)
         name = rich_data.get("name", "Unknown")
@@ -223,34 +235,28 @@ class TriggerHandler:
         # 3. Status Effects (Static, Flame Body, Effect Spore)
         status_map = {"Static": "par", "Flame Body": "brn", "Poison Point": "psn"}
         if name in status_map and not other.get("status"):
-            r = random.random()
-            print(f"DEBUG: Checking {name} for {other.get('species')}. Random: {r}")
-            if r < 0.3:
+            if self.rng.chance(0.3):
                 other["status"] = status_map[name]
                 log.append(f"  {other.get('species')} was affected by {name}!")
 
         if name == "Effect Spore" and other.get("status") == None:
-            if random.random() < 0.3:
+            if self.rng.chance(0.3):
                 # 1/3 each for PSN, PAR, SLP
-                roll = random.random()
-                if roll < 0.33:
-                    other["status"] = "psn"
-                elif roll < 0.66:
-                    other["status"] = "par"
-                else:
-                    other["status"] = "slp"
+                other["status"] = self.rng.weighted(
+                    [("psn", 0.33), ("par", 0.33), ("slp", 0.34)]
+                )
                 log.append(f"  {other.get('species')} was affected by Effect Spore!")
 
         if name == "Poison Touch" and other.get("status") == None:
             if self._makes_contact(move_name, owner):  # owner attacked 'other'
-                if random.random() < 0.3:
+                if self.rng.chance(0.3):
                     other["status"] = "psn"
                     log.append(
                         f"  {other.get('species')} was poisoned by Poison Touch!"
                     )
 
         if name == "Cute Charm" and other.get("status") == None:
-            if random.random() < 0.3:
+            if self.rng.chance(0.3):
                 # Simplified infatuation as a volatile
                 vols = other.setdefault("volatiles", [])
                 if "attract" not in vols:
@@ -271,8 +277,7 @@ class TriggerHandler:
                 )
 
         if name == "Color Change" and move_name:
-            slug = move_name.lower().replace(" ", "").replace("-", "").replace("'", "")
-            move_data = self._get_mechanic(slug, "moves")
+            move_data = self._get_mechanic(move_name, "moves")
             if move_data:
                 move_type = move_data.get("type")
                 if move_type and move_type not in owner.get("types", []):
@@ -286,7 +291,7 @@ class TriggerHandler:
                 Mechanics.apply_boosts(other, {"spe": -1}, log, source_name=name)
 
         if name == "Cursed Body":
-            if random.random() < 0.3:
+            if self.rng.chance(0.3):
                 # Aroma Veil Check
                 if self._is_protected_by_aroma_veil(other, log):
                     pass
@@ -375,7 +380,7 @@ class TriggerHandler:
 
         if name == "Poison Touch" and event_key == "onDamagingHit":
             if self._makes_contact(move_name, owner):
-                if other.get("status") == None and random.random() < 0.3:
+                if other.get("status") == None and self.rng.chance(0.3):
                     other["status"] = "psn"
                     log.append(
                         f"  {other.get('species')} was poisoned by {owner.get('species')}'s Poison Touch!"
@@ -423,10 +428,7 @@ class TriggerHandler:
                        return False, "" # Not immune
 
         # Get move type
-        slug = ""
-        if move_name:
-             slug = move_name.lower().replace(" ", "").replace("-", "").replace("'", "")
-        m_data = self._get_mechanic(slug, "moves")
+        m_data = self._get_mechanic(move_name, "moves")
         move_type = m_data.get("type", "Normal") if m_data else "Normal"
         
 
@@ -606,18 +608,8 @@ class TriggerHandler:
         if item == "Full Incense" or item == "Lagging Tail":
             # Move last in bracket -> -0.1 priority (effectively)
             base -= 0.1
-        elif item == "Quick Claw":
-            # 20% chance to move first in bracket -> +0.1 priority
-            # Deterministic hash for "randomness"
-            if (
-                hash(
-                    str(attacker.get("current_hp"))
-                    + move_name
-                    + str(getattr(state, "turns", 0))
-                )
-                % 100
-            ) < 20:
-                base += 0.5
+        # Quick Claw is rolled once per turn in Mechanics.apply_start_turn_effects
+        # (turn_priority_mod); this is called several times per turn
 
         # Grassy Glide
         if move_name == "Grassy Glide":
@@ -629,11 +621,13 @@ class TriggerHandler:
         return base
 
     def _get_mechanic(self, key, category):
-        # Helper to access rich data safely
-        return self.rich_data.get(category, {}).get(key, {}) if key else {}
+        # Helper to access rich data safely; key is a name, slug or ID
+        if not key:
+            return {}
+        return GAME_DATA.index(category).record(key, {}, self.rich_data.get(category, {}))
 
     def _check_mechanic(self, key, category, subkey):
-        data = self._get_mechanic(key.lower().replace(" ", "").replace("-", "").replace("'", "") if key else None, category)
+        data = self._get_mechanic(key, category)
         if data:
             return data.get(subkey)
         return None
@@ -0,0 +1,69 @@
+from typing import Dict
+import hashlib
+
+# Zobrist keys for the per-mon features BattleState.get_hash looks at.
+# Keys are derived from the feature itself (not drawn from a shared RNG), so
+# they are identical across processes and runs; each is computed once.
+_KEYS: Dict = {}
+
+
+def zobrist_key(*feature) -> int:
+    try:
+        key = _KEYS.get(feature)
+    except TypeError:
+        # Unhashable value (e.g. a list in a scalar slot): key by its repr
+        feature = repr(feature)
+        key = _KEYS.get(feature)
+    if key is None:
+        digest = hashlib.blake2b(repr(feature).encode(), digest_size=8).digest()
+        key = int.from_bytes(digest, "little")
+        _KEYS[feature] = key
+    return key
+
+
+_MASK = (1 << 64) - 1
+
+
+def combine_keys(h: int, key: int) -> int:
+    """Order-dependent 64-bit mix of `key` into `h` (FNV-style multiply-xor)."""
+    return ((h ^ key) * 0x100000001B3 + 0x9E3779B97F4A7C15) & _MASK
+
+
+def scalar_key(name, value) -> int:
+    """Key for one of HASHED_MON_KEYS (species, HP, status, ability, item)."""
+    return zobrist_key("mon", name, value)
+
+
+def stage_key(stat, value) -> int:
+    """Key for one stat stage; neutral (0) stages hash like missing ones."""
+    if not value:
+        return 0
+    return zobrist_key("stage", stat, value)
+
+
+def volatile_key(name) -> int:
+    return zobrist_key("vol", name)
+
+
+HASHED_MON_KEYS = ("species", "current_hp", "status", "ability", "item")
+
+
+def mon_key(mon) -> int:
+    """
+    Zobrist key of a mon (HASHED_MON_KEYS, stat stages, volatiles).
+    Compact Mons keep it up to date on every write, so this is O(1) for
+    them; plain dicts are hashed from scratch with the same keys.
+    """
+    if mon is None:
+        return 0
+    fast = getattr(mon, "zobrist", None)
+    if fast is not None and mon.__class__ is not dict:
+        return fast()
+    h = 0
+    for name in HASHED_MON_KEYS:
+        h ^= scalar_key(name, mon.get(name))
+    for stat, value in (mon.get("stat_stages") or {}).items():
+        h ^= stage_key(stat, value)
+    for name in set(mon.get("volatiles") or ()):
+        h ^= volatile_key(name)
+    return h
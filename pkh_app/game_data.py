@@ -0,0 +1,326 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sys
+import threading
+from typing import Dict, Optional
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+BUNDLE_FILE = "game_data.bundle"
+# Bump when the bundle layout (not the data) changes
+BUNDLE_VERSION = 1
+
+
+def to_slug(name) -> str:
+    """Normalizes a move/ability/item display name to its rich_data key."""
+    return str(name).lower().replace(" ", "").replace("-", "").replace("'", "")
+
+
+def to_species_slug(name) -> str:
+    """Species keys in pokedex_rich.json keep apostrophes (e.g. Farfetch'd)."""
+    return str(name).lower().replace(" ", "").replace("-", "")
+
+
+# Process-wide name -> interned slug memo. The name space is small and
+# fixed (every move/ability/item/species the ROM knows), so these never
+# need evicting; lookups on the search hot path become one dict hit.
+_SLUGS: Dict = {}
+_SPECIES_SLUGS: Dict = {}
+
+
+def slugify(name) -> str:
+    """Interned to_slug(name), memoized per process."""
+    try:
+        s = _SLUGS.get(name)
+    except TypeError:  # unhashable; normalize without memoizing
+        return to_slug(name)
+    if s is None:
+        s = _SLUGS[name] = sys.intern(to_slug(name))
+    return s
+
+
+def species_slugify(name) -> str:
+    """Interned to_species_slug(name), memoized per process."""
+    try:
+        s = _SPECIES_SLUGS.get(name)
+    except TypeError:  # unhashable; normalize without memoizing
+        return to_species_slug(name)
+    if s is None:
+        s = _SPECIES_SLUGS[name] = sys.intern(to_species_slug(name))
+    return s
+
+
+class NameIndex:
+    """
+    Bidirectional index for one category of game data: display name <->
+    slug <-> integer ID <-> rich record.
+
+    IDs are the ROM's (moves.json / item_ids.json / species.json) where
+    the category has them; abilities, which have no ID table, are numbered
+    in record order. Lookups accept a display name, slug or ID.
+
+    record() reads the shared table unless given `records`: a BattleEngine
+    passes its own copy of the table, so its edits (tests, tools) layer
+    over the shared records while names and IDs still resolve here.
+    """
+
+    def __init__(self, records: Dict[str, Dict], ids: Optional[Dict[str, str]] = None, species: bool = False):
+        self._slugify = species_slugify if species else slugify
+        self.records = records
+        self.names: Dict[str, str] = {}
+        self.id_to_slug: Dict[int, str] = {}
+        self.slug_to_id: Dict[str, int] = {}
+        for key, record in records.items():
+            slug = sys.intern(key)
+            name = record.get("name") if isinstance(record, dict) else None
+            # pokedex_rich.json pads some names ("  Garchomp")
+            self.names[slug] = name.strip() if isinstance(name, str) else key
+        if ids is None:
+            ids = {str(i): key for i, key in enumerate(records, 1)}
+        for raw_id, name in ids.items():
+            try:
+                num = int(raw_id)
+            except ValueError:
+                continue
+            slug = self._slugify(name)
+            self.id_to_slug[num] = slug
+            self.slug_to_id.setdefault(slug, num)
+            self.names.setdefault(slug, name)
+
+    def slug(self, key) -> Optional[str]:
+        if isinstance(key, int):
+            return self.id_to_slug.get(key)
+        try:
+            if key in self.names:
+                return key
+        except TypeError:  # unhashable; slugify normalizes it
+            pass
+        return self._slugify(key) if key else None
+
+    def id(self, key) -> Optional[int]:
+        slug = self.slug(key)
+        return self.slug_to_id.get(slug) if slug else None
+
+    def name(self, key) -> Optional[str]:
+        slug = self.slug(key)
+        return self.names.get(slug) if slug else None
+
+    def record(self, key, default=None, records: Optional[Dict] = None):
+        slug = self.slug(key)
+        if not slug:
+            return default
+        return (self.records if records is None else records).get(slug, default)
+
+    def __len__(self):
+        return len(self.names)
+
+
+class GameData:
+    """
+    Process-wide, lazily loaded view of the static JSON files in data/.
+
+    Each table is parsed on first access and then shared by everything in
+    the process (Mechanics, every BattleEngine, state_parser, main.py).
+    The tables are read-only: callers that want to edit one (the tests
+    patch rich_data per engine) must copy it first, see BattleEngine.
+    Loading is guarded by a lock so SearchWorker threads can race the
+    watcher for the first access.
+
+    With use_bundle (the default) every table comes from one pickled
+    bundle (data/game_data.bundle, see build_bundle) instead of the JSON
+    files. The bundle records the sources' content hash: if any source
+    changed it is ignored, the JSON is parsed and the bundle rebuilt.
+    """
+
+    FILES = {
+        "pokedex": "pokedex_rich.json",
+        "mechanics": "mechanics_rich.json",
+        "moves": "moves.json",
+        "species": "species.json",
+        "item_ids": "item_ids.json",
+    }
+
+    def __init__(self, data_dir: str = DATA_DIR, bundle_path: Optional[str] = None, use_bundle: bool = True):
+        self.data_dir = data_dir
+        self.bundle_path = bundle_path or os.path.join(data_dir, BUNDLE_FILE)
+        self.use_bundle = use_bundle
+        self._tables: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._bundle_checked = False
+        self._indexes: Dict[str, NameIndex] = {}
+
+    def get(self, name: str) -> Dict:
+        table = self._tables.get(name)
+        if table is None:
+            with self._lock:
+                if self.use_bundle and not self._bundle_checked:
+                    self._bundle_checked = True
+                    self._load_or_build_bundle()
+                table = self._tables.get(name)
+                if table is None:
+                    table = self._tables[name] = self._load(self.FILES[name])
+        return table
+
+    def _load(self, filename: str) -> Dict:
+        path = os.path.join(self.data_dir, filename)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logging.warning(f"Failed to load {filename}: {e}")
+            return {}
+
+    @property
+    def pokedex(self) -> Dict:
+        return self.get("pokedex")
+
+    @property
+    def mechanics(self) -> Dict:
+        return self.get("mechanics")
+
+    @property
+    def moves(self) -> Dict:
+        return self.get("moves")
+
+    @property
+    def species(self) -> Dict:
+        return self.get("species")
+
+    @property
+    def item_ids(self) -> Dict:
+        return self.get("item_ids")
+
+    def index(self, category: str) -> NameIndex:
+        """
+        The NameIndex for 'moves', 'abilities', 'items' or 'species', built
+        once per process from the shared tables.
+        """
+        index = self._indexes.get(category)
+        if index is None:
+            if category == "species":
+                index = NameIndex(self.pokedex, self.species, species=True)
+            else:
+                ids = {"moves": self.moves, "items": self.item_ids}.get(category)
+                index = NameIndex(self.mechanics.get(category, {}), ids)
+            self._indexes[category] = index
+        return index
+
+    def loaded(self):
+        """Names of the tables parsed so far."""
+        return sorted(self._tables)
+
+    def clear(self):
+        """Forgets every table so the next access re-reads data/."""
+        with self._lock:
+            self._tables.clear()
+            self._indexes.clear()
+            self._bundle_checked = False
+
+    # --- Precompiled bundle ---
+
+    def _stamps(self) -> Dict[str, tuple]:
+        stamps = {}
+        for filename in self.FILES.values():
+            st = os.stat(os.path.join(self.data_dir, filename))
+            stamps[filename] = (st.st_size, st.st_mtime_ns)
+        return stamps
+
+    def source_hash(self) -> str:
+        """Content hash of every source file the bundle is built from."""
+        h = hashlib.blake2b(digest_size=16)
+        for filename in sorted(self.FILES.values()):
+            with open(os.path.join(self.data_dir, filename), "rb") as f:
+                h.update(filename.encode())
+                h.update(f.read())
+        return h.hexdigest()
+
+    def build_bundle(self) -> Dict:
+        """
+        Parses every source JSON and writes the bundle: a header
+        {version, hash, stamps} pickle followed by the tables pickle.
+        Returns the header. Raises OSError if a source is missing.
+        """
+        header = {"version": BUNDLE_VERSION, "hash": self.source_hash(), "stamps": self._stamps()}
+        tables = {}
+        for name, filename in self.FILES.items():
+            with open(os.path.join(self.data_dir, filename), "r", encoding="utf-8") as f:
+                tables[name] = json.load(f)
+        self._write_bundle(header, pickle.dumps(tables, protocol=pickle.HIGHEST_PROTOCOL))
+        self._tables.update(tables)
+        return header
+
+    def _write_bundle(self, header: Dict, body: bytes):
+        """Atomically replaces the bundle with header + pickled tables."""
+        tmp_path = f"{self.bundle_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.write(body)
+            os.replace(tmp_path, self.bundle_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def bundle_is_fresh(self) -> bool:
+        """Whether the bundle exists and matches the current sources."""
+        try:
+            return self._read_bundle(self._stamps()) is not None
+        except OSError:
+            return False
+
+    def _read_bundle(self, stamps: Dict[str, tuple]) -> Optional[Dict]:
+        """
+        The bundled tables, or None if the bundle is missing or stale.
+        A bundle whose sources were touched but not changed is re-stamped
+        so later loads skip hashing again.
+        """
+        try:
+            f = open(self.bundle_path, "rb")
+        except OSError:
+            return None
+        with f:
+            try:
+                header = pickle.load(f)
+                if header.get("version") != BUNDLE_VERSION:
+                    return None
+                # Unchanged size/mtime skips hashing; a touched but identical
+                # file still matches on content
+                touched = header.get("stamps") != stamps
+                if touched and header.get("hash") != self.source_hash():
+                    return None
+                body = f.read()
+                tables = pickle.loads(body)
+            except Exception as e:
+                logging.warning(f"Ignoring unreadable {self.bundle_path}: {e}")
+                return None
+        if touched:
+            header["stamps"] = stamps
+            try:
+                self._write_bundle(header, body)
+            except OSError as e:
+                logging.warning(f"Could not write {self.bundle_path}: {e}")
+        return tables
+
+    def _load_or_build_bundle(self):
+        try:
+            stamps = self._stamps()
+        except OSError:
+            # A source file is missing; the per-table JSON loads report it
+            return
+        tables = self._read_bundle(stamps)
+        if tables is not None:
+            self._tables.update(tables)
+            return
+        try:
+            self.build_bundle()
+        except OSError as e:
+            logging.warning(f"Could not write {self.bundle_path}: {e}")
+        except ValueError as e:
+            # A malformed source: no bundle; the per-table JSON loads serve
+            # every other table and report the broken one
+            logging.warning(f"Could not build {self.bundle_path}: {e}")
+
+
+GAME_DATA = GameData()
@@ -3,36 +3,55 @@ Local damage calculation module.
 Replaces external Node.js calculator with pure Python implementation.
 Implements Gen 3+ damage formula.
 """
+from pkh_app.type_chart import type_effectiveness
+
 
 def get_type_effectiveness(move_type, defender_types):
     """Calculate type effectiveness multiplier."""
-    TYPE_CHART = {
-        'Normal': {'Rock': 0.5, 'Ghost': 0, 'Steel': 0.5},
-        'Fire': {'Fire': 0.5, 'Water': 0.5, 'Grass': 2, 'Ice': 2, 'Bug': 2, 'Rock': 0.5, 'Dragon': 0.5, 'Steel': 2},
-        'Water': {'Fire': 2, 'Water': 0.5, 'Grass': 0.5, 'Ground': 2, 'Rock': 2, 'Dragon': 0.5},
-        'Electric': {'Water': 2, 'Electric': 0.5, 'Grass': 0.5, 'Ground': 0, 'Flying': 2, 'Dragon': 0.5},
-        'Grass': {'Fire': 0.5, 'Water': 2, 'Grass': 0.5, 'Poison': 0.5, 'Ground': 2, 'Flying': 0.5, 'Bug': 0.5, 'Rock': 2, 'Dragon': 0.5, 'Steel': 0.5},
-        'Ice': {'Fire': 0.5, 'Water': 0.5, 'Grass': 2, 'Ice': 0.5, 'Ground': 2, 'Flying': 2, 'Dragon': 2, 'Steel': 0.5},
-        'Fighting': {'Normal': 2, 'Ice': 2, 'Poison': 0.5, 'Flying': 0.5, 'Psychic': 0.5, 'Bug': 0.5, 'Rock': 2, 'Ghost': 0, 'Dark': 2, 'Steel': 2, 'Fairy': 0.5},
-        'Poison': {'Grass': 2, 'Poison': 0.5, 'Ground': 0.5, 'Rock': 0.5, 'Ghost': 0.5, 'Steel': 0, 'Fairy': 2},
-        'Ground': {'Fire': 2, 'Electric': 2, 'Grass': 0.5, 'Poison': 2, 'Flying': 0, 'Bug': 0.5, 'Rock': 2, 'Steel': 2},
-        'Flying': {'Electric': 0.5, 'Grass': 2, 'Fighting': 2, 'Bug': 2, 'Rock': 0.5, 'Steel': 0.5},
-        'Psychic': {'Fighting': 2, 'Poison': 2, 'Psychic': 0.5, 'Dark': 0, 'Steel': 0.5},
-        'Bug': {'Fire': 0.5, 'Grass': 2, 'Fighting': 0.5, 'Poison': 0.5, 'Flying': 0.5, 'Psychic': 2, 'Ghost': 0.5, 'Dark': 2, 'Steel': 0.5, 'Fairy': 0.5},
-        'Rock': {'Fire': 2, 'Ice': 2, 'Fighting': 0.5, 'Ground': 0.5, 'Flying': 2, 'Bug': 2, 'Steel': 0.5},
-        'Ghost': {'Normal': 0, 'Psychic': 2, 'Ghost': 2, 'Dark': 0.5},
-        'Dragon': {'Dragon': 2, 'Steel': 0.5, 'Fairy': 0},
-        'Dark': {'Fighting': 0.5, 'Psychic': 2, 'Ghost': 2, 'Dark': 0.5, 'Fairy': 0.5},
-        'Steel': {'Fire': 0.5, 'Water': 0.5, 'Electric': 0.5, 'Ice': 2, 'Rock': 2, 'Steel': 0.5, 'Fairy': 2},
-        'Fairy': {'Fire': 0.5, 'Fighting': 2, 'Poison': 0.5, 'Dragon': 2, 'Dark': 2, 'Steel': 0.5},
-    }
-    
-    effectiveness = 1.0
-    for def_type in defender_types:
-        if move_type in TYPE_CHART and def_type in TYPE_CHART[move_type]:
-            effectiveness *= TYPE_CHART[move_type][def_type]
-    
-    return effectiveness
+    return type_effectiveness(move_type, defender_types)
+
+
+ROLLS = tuple(range(85, 101))
+
+
+def get_weather_multiplier(weather, move_type, attacker, defender):
+    """Rain/Sun multiplier for move_type, or None when weather does not apply."""
+    if not weather:
+        return None
+    # Check suppression
+    for p in (attacker, defender):
+        if p.get('ability') in ('Cloud Nine', 'Air Lock'):
+            return None
+    if weather in ('Rain', 'Rain Dance'):
+        if move_type == 'Water': return 1.5
+        if move_type == 'Fire': return 0.5
+    elif weather in ('Sun', 'Sunny Day'):
+        if move_type == 'Fire': return 1.5
+        if move_type == 'Water': return 0.5
+    return None
+
+
+def damage_roll_kernel(base_calc, stab_mult, effectiveness, final_mod, weather_mult, min_one):
+    """
+    All 16 normal and crit rolls for one base damage.
+    Truncation order per roll: Random (85-100%) -> STAB -> Type Effectiveness
+    -> Other Modifiers -> Weather -> minimum 1; crits are 1.5x of the result.
+    `stab_mult`/`weather_mult` are None when they do not apply.
+    """
+    rolls = [(base_calc * roll) // 100 for roll in ROLLS]
+    if stab_mult is not None:
+        rolls = [int(r * stab_mult) for r in rolls]
+    rolls = [int(int(r * effectiveness) * final_mod) for r in rolls]
+    if weather_mult is not None:
+        rolls = [int(r * weather_mult) for r in rolls]
+    if min_one:
+        rolls = [r if r >= 1 else 1 for r in rolls]
+    # Crit Calculation (Simplified: 1.5x of final damage)
+    # TODO: Implement strict ignore-stat-changes logic for crits
+    crits = [int(r * 1.5) for r in rolls]
+    if effectiveness > 0:
+        crits = [c if c >= 1 else 1 for c in crits]
+    return rolls, crits
 
 
 def calculate_damage(attacker, defender, move_name, move_data, field=None, move_type_override=None, move_bp_override=None):
@@ -95,6 +114,9 @@ def calculate_damage(attacker, defender, move_name, move_data, field=None, move_
     field['context'] = context
         
     # Apply onBasePower modifiers (Technician, Strong Jaw, Expert Belt, etc.)
+    # Technician checks this turn's power; the shared record is never edited
+    if move_bp_override is not None and move_bp_override != move_data.get('basePower', 0):
+        move_data = dict(move_data, basePower=move_bp_override)
     bp_mod = Mechanics.get_modifier(attacker, 'onBasePower', move_data, field, target=defender)
     power = int(power * bp_mod)
     
@@ -137,54 +159,13 @@ def calculate_damage(attacker, defender, move_name, move_data, field=None, move_
     if bp_mod != 1.0 or final_mod != 1.0:
         print(f"[DEBUG_CALC] Item: {attacker.get('item')}, Move: {move_name}, BP_Mod: {bp_mod}, Dmg_Mod: {dmg_mod}, Src_Mod: {src_mod}, Final: {final_mod}")
 
-    # Generate 16 damage rolls
-    damage_rolls = []
-    crit_rolls = []
-    
-    for roll in range(85, 101):
-        # Step 1: Apply Random Factor FIRST
-        r_dmg = (base_calc * roll) // 100
-        
-        # Step 2: Apply STAB
-        if is_stab:
-            stab_mult = Mechanics.get_stab_multiplier(attacker, move_type)
-            r_dmg = int(r_dmg * stab_mult)
-            
-        # Step 3: Apply Type Effectiveness (Integer truncation)
-        r_dmg = int(r_dmg * effectiveness)
-        
-        # Step 4: Apply Other Modifiers (Life Orb, Expert Belt, etc.)
-        r_dmg = int(r_dmg * final_mod)
-        
-        # Step 5: Weather (Rain/Sun)
-        weather = field.get('weather')
-        if weather:
-             # Check suppression
-             weather_negated = False
-             # Look in field for active_mons or check participants
-             for p in [attacker, defender]:
-                  if p.get('ability') in ['Cloud Nine', 'Air Lock']:
-                       weather_negated = True
-             
-             if not weather_negated:
-                  if weather in ['Rain', 'Rain Dance']:
-                       if move_type == 'Water': r_dmg = int(r_dmg * 1.5)
-                       elif move_type == 'Fire': r_dmg = int(r_dmg * 0.5)
-                  elif weather in ['Sun', 'Sunny Day']:
-                       if move_type == 'Fire': r_dmg = int(r_dmg * 1.5)
-                       elif move_type == 'Water': r_dmg = int(r_dmg * 0.5)
-        
-        # Minimum 1 if not immune and not explicitly 0 damage
-        if effectiveness > 0 and r_dmg < 1 and final_mod > 0 and bp_mod > 0:
-            r_dmg = 1
-        
-        damage_rolls.append(r_dmg)
-        
-        # Crit Calculation (Simplified: 1.5x of final damage)
-        # TODO: Implement strict ignore-stat-changes logic for crits
-        c_dmg = int(r_dmg * 1.5)
-        if effectiveness > 0 and c_dmg < 1: c_dmg = 1
-        crit_rolls.append(c_dmg)
+    # Everything below is identical for all 16 rolls: resolve it once
+    stab_mult = Mechanics.get_stab_multiplier(attacker, move_type) if is_stab else None
+    weather_mult = get_weather_multiplier(field.get('weather'), move_type, attacker, defender)
+    min_one = effectiveness > 0 and final_mod > 0 and bp_mod > 0
+    damage_rolls, crit_rolls = damage_roll_kernel(
+        base_calc, stab_mult, effectiveness, final_mod, weather_mult, min_one
+    )
     
     # The user's snippet had a syntax error in the return statement and undefined 'final_damage'.
     is_crit = False
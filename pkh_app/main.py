@@ -1,6 +1,5 @@
 import time
 import os
-import json
 import sys
 
 # Ensure root is in path
@@ -8,30 +7,19 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if BASE_DIR not in sys.path:
     sys.path.append(BASE_DIR)
 
+from pkh_app.game_data import GAME_DATA
 from pkh_app.state_parser import parse_state
 from pkh_app.ai_logic import SwitchPredictor
 from pkh_app.ai_scorer import AIScorer
 from pkh_app.battle_engine import BattleState, BattleEngine
 from pkh_app.mechanics import Mechanics
+from pkh_app.simulation import SearchWorker
 
 STATE_FILE = os.path.join(BASE_DIR, "data", "battle_state.json")
 PRED_FILE = os.path.join(BASE_DIR, "data", "predictions.txt")
-MOVES_FILE = os.path.join(BASE_DIR, "data", "moves.json")
-SPECIES_FILE = os.path.join(BASE_DIR, "data", "species.json")
 
-def load_json(path):
-    try:
-        print(f"Loading {path}...")
-        with open(path, 'r') as f:
-            data = json.load(f)
-            print(f"Loaded {len(data)} entries from {path}")
-            return data
-    except Exception as e:
-        print(f"Error loading {path}: {e}")
-        return {}
-
-MOVE_NAMES = load_json(MOVES_FILE)
-SPECIES_NAMES = load_json(SPECIES_FILE)
+MOVE_NAMES = GAME_DATA.moves
+SPECIES_NAMES = GAME_DATA.species
 
 def get_move_name(move_id):
     key = str(move_id)
@@ -81,7 +69,16 @@ def patch_active_from_party(active, party):
             break
     return active
 
-def write_predictions(scored_moves, best_switch, player_active, ai_active, player_calcs, ai_calcs, field_conditions=None):
+def format_action(action):
+    if not action: return "None"
+    kind, _, ident = action.partition(": ")
+    if kind == "Move":
+        return f"Move: {get_move_name(ident)}"
+    if kind == "Switch":
+        return f"Switch: {get_species_name(ident)}"
+    return action
+
+def write_predictions(scored_moves, best_switch, player_active, ai_active, player_calcs, ai_calcs, field_conditions=None, search=None):
     lines = []
     
     # --- Battle Info ---
@@ -181,7 +178,6 @@ def write_predictions(scored_moves, best_switch, player_active, ai_active, playe
         move_probs = [0.0] * num_moves
         move_avg_scores = [0.0] * num_moves
         
-        move_probs = [0.0] * num_moves
         move_score_dists = [{} for _ in range(num_moves)]
         
         # 1. Analyze Scores & Calculate Selection Probability
@@ -189,27 +185,12 @@ def write_predictions(scored_moves, best_switch, player_active, ai_active, playe
             for v_idx in range(num_variants):
                 weight = weights[v_idx] * (1/16)
                 
-                # Get all scores for this world
-                scores_in_world = []
-                for m_idx in range(num_moves):
-                    s = matrix[r_idx * num_variants + v_idx][m_idx]
-                    scores_in_world.append(s)
-                    
-                    # Track score distribution
+                # Track score distribution
+                for m_idx, s in enumerate(matrix[r_idx * num_variants + v_idx]):
                     s_rnd = round(s, 1)
                     move_score_dists[m_idx][s_rnd] = move_score_dists[m_idx].get(s_rnd, 0.0) + weight
 
-                if not scores_in_world:
-                    continue
-
-                # Find max score (Winner)
-                max_s = max(scores_in_world)
-                
-                # Identify winners and distribute probability
-                winners = [i for i, s in enumerate(scores_in_world) if s == max_s]
-                prob_share = weight / len(winners)
-                for w_idx in winners:
-                    move_probs[w_idx] += prob_share
+        move_probs = AIScorer.win_probabilities(matrix, weights) or [0.0] * num_moves
 
         display_list = []
         for m_idx in range(num_moves):
@@ -275,6 +256,19 @@ def write_predictions(scored_moves, best_switch, player_active, ai_active, playe
          sid = best_switch.get('species_id', best_switch.get('speciesId'))
          lines.append(f"  LIKELY SWITCH: {get_species_name(sid)}")
 
+    # --- Background search (SearchWorker) ---
+    lines.append("\n[SEARCH]")
+    if search is None:
+        lines.append("  Searching...")
+    elif 'error' in search:
+        lines.append(f"  Search Error: {search['error']}")
+    else:
+        status = search.get('status', 'Searching')
+        lines.append(f"  Depth {search.get('final_depth', 0)} ({status}) -> {format_action(search.get('best_action'))}")
+        scores = sorted(search.get('scores', {}).items(), key=lambda x: x[1], reverse=True)
+        for act, score in scores[:5]:
+            lines.append(f"  {format_action(act):25}: {score:.1f}")
+
     # Note: Strategy Advisor hint
     lines.append("\n[TIP] Run 'python3 tools/run_sim.py' for deep turn simulation.")
 
@@ -294,6 +288,11 @@ def main():
     engine = BattleEngine(species_names=SPECIES_NAMES, move_names=MOVE_NAMES)  # Uses local damage calculator
     scorer = AIScorer(engine)  # Pass engine which has calc methods
     switch_predictor = SwitchPredictor()
+    # Deepens the search on the latest state between emulator updates; it
+    # gets its own engine and scorer since their caches are not thread-safe
+    search_engine = BattleEngine(species_names=SPECIES_NAMES, move_names=MOVE_NAMES)
+    search_worker = SearchWorker(search_engine, AIScorer(search_engine))
+    prediction_args = None
     
     while True:
         try:
@@ -359,14 +358,21 @@ def main():
                     
                     best_switch = None
                     if ai_active.get('current_hp', 0) <= 0:
-                         best_switch, _ = switch_predictor.predict_switch(a_party, player_active, engine)
+                         best_switch, _ = switch_predictor.predict_switch(a_party, player_active, engine, field_conditions)
                          
-                    write_predictions(scored_moves, best_switch, player_active, ai_active, player_calcs, ai_calcs, field_conditions)
+                    prediction_args = (scored_moves, best_switch, player_active, ai_active, player_calcs, ai_calcs, field_conditions)
+                    search_worker.submit(bs)
+                    write_predictions(*prediction_args)
+            
+            search = search_worker.latest()
+            if search is not None and prediction_args is not None:
+                write_predictions(*prediction_args, search=search)
                     
             time.sleep(0.2)
             
         except KeyboardInterrupt:
             print("Stopping...")
+            search_worker.close(timeout=1)
             break
         except Exception as e:
             import traceback
@@ -0,0 +1,162 @@
+import math
+import random
+from typing import Dict, List, Optional, Tuple
+
+from pkh_app.battle_engine import BattleState
+
+
+class MCTSNode:
+    __slots__ = ("state", "hash", "actions", "ai_probs", "terminal", "visits", "stats", "children")
+
+    def __init__(self, state: BattleState, actions: List[str], ai_probs: Dict[str, float], terminal):
+        self.state = state
+        self.hash = state.get_hash()
+        self.actions = actions
+        self.ai_probs = ai_probs
+        self.terminal = terminal
+        self.visits = 0
+        # player action -> [visits, value sum]
+        self.stats = {a: [0, 0.0] for a in actions}
+        # (player action, AI action) -> [child node, turn log, visits, value sum]
+        self.children: Dict[Tuple[str, str], list] = {}
+
+
+class MCTS:
+    """
+    Monte Carlo Tree Search over player actions for Simulation.
+
+    Player actions are chosen by UCT (values min-max normalised over the
+    tree, since evaluate_state is unbounded), the AI's reply is sampled
+    from AIScorer's action distribution, and new leaves are valued by a
+    short greedy rollout (Simulation.run_greedy_simulation, which plays
+    out with evaluate_state). Transitions go through Simulation._successor,
+    so chance_mode and the transposition table apply as in the
+    iterative-deepening search.
+    """
+
+    def __init__(self, sim, exploration: float = 1.4, rollout_depth: int = 2,
+                 max_depth: int = 20, seed: Optional[int] = None):
+        self.sim = sim
+        self.exploration = exploration
+        self.rollout_depth = rollout_depth
+        self.max_depth = max_depth
+        self.rng = random.Random(seed)
+        self.iterations = 0
+        self.nodes = 0
+        self.max_reached = 0
+        self._low = math.inf
+        self._high = -math.inf
+
+    def search(self, state: BattleState, iterations: int, progress=None, progress_every: int = 256) -> MCTSNode:
+        """
+        Runs up to `iterations` playouts from `state`. A playout adds at
+        most one node: none when it ends on a terminal node or at max_depth,
+        so `nodes` can fall short of the playout count.
+        Stops early when the Simulation's deadline passes or it is
+        cancelled, but not before every root action has been tried once.
+        progress, if given, is called with the root every progress_every
+        playouts.
+        """
+        root = self._node(state)
+        while self.iterations < iterations:
+            if self.iterations >= len(root.actions) and self.sim._should_stop():
+                break
+            self._playout(root)
+            self.iterations += 1
+            if progress is not None and self.iterations % progress_every == 0:
+                progress(root)
+        return root
+
+    def _node(self, state: BattleState) -> MCTSNode:
+        self.nodes += 1
+        terminal = self.sim.is_total_ko(state)
+        if terminal:
+            return MCTSNode(state, [], {}, terminal)
+        actions = self.sim.engine.get_valid_actions(state, 'player')
+        ai_probs = self.sim.get_ai_action_probs(state) or {"Move: Struggle": 1.0}
+        return MCTSNode(state, actions, ai_probs, terminal)
+
+    def _playout(self, root: MCTSNode):
+        node = root
+        trail = []
+        depth = 0
+        while True:
+            if node.terminal or not node.actions or depth >= self.max_depth:
+                value = self.sim.evaluate_state(node.state)
+                break
+            p_action = self._select(node)
+            ai_action = self._sample(node.ai_probs)
+            depth += 1
+            edge = node.children.get((p_action, ai_action))
+            if edge is None:
+                next_state, turn_log = self.sim._successor(node.hash, node.state, p_action, ai_action)
+                edge = node.children[(p_action, ai_action)] = [self._node(next_state), turn_log, 0, 0.0]
+                trail.append((node, p_action, edge))
+                value = self._rollout(edge[0])
+                break
+            trail.append((node, p_action, edge))
+            node = edge[0]
+
+        self.max_reached = max(self.max_reached, depth)
+        self._low = min(self._low, value)
+        self._high = max(self._high, value)
+        for node, p_action, edge in trail:
+            stat = node.stats[p_action]
+            stat[0] += 1
+            stat[1] += value
+            edge[2] += 1
+            edge[3] += value
+            node.visits += 1
+
+    def _select(self, node: MCTSNode) -> str:
+        for action in node.actions:
+            if node.stats[action][0] == 0:
+                return action
+        span = self._high - self._low
+        log_n = math.log(node.visits)
+        best, best_score = None, -math.inf
+        for action in node.actions:
+            visits, total = node.stats[action]
+            q = (total / visits - self._low) / span if span > 0 else 0.5
+            score = q + self.exploration * math.sqrt(log_n / visits)
+            if score > best_score:
+                best, best_score = action, score
+        return best
+
+    def _sample(self, probs: Dict[str, float]) -> str:
+        r = self.rng.random() * sum(probs.values())
+        for action, p in probs.items():
+            r -= p
+            if r <= 0:
+                return action
+        return action
+
+    def _rollout(self, node: MCTSNode) -> float:
+        if node.terminal or self.rollout_depth <= 0:
+            return self.sim.evaluate_state(node.state)
+        value, _, _ = self.sim.run_greedy_simulation(node.state, self.rollout_depth, [], set())
+        return value
+
+
+def root_summary(root: MCTSNode) -> Dict[str, Dict]:
+    """
+    Picklable per-action statistics of a searched root:
+    {player action: {'visits', 'value', 'branches': {AI action: branch}}}
+    where 'value' is a sum over visits and each branch holds the visits,
+    value sum and most-visited line ('path' turn logs, 'action_log' action
+    pairs) below that reply.
+    """
+    summary = {p_action: {'visits': visits, 'value': total, 'branches': {}}
+               for p_action, (visits, total) in root.stats.items()}
+    for (p_action, ai_action), (child, turn_log, visits, total) in root.children.items():
+        path, acts = [turn_log], [(p_action, ai_action)]
+        node = child
+        while node.children:
+            (p, a), edge = max(node.children.items(), key=lambda kv: kv[1][2])
+            path.append(edge[1])
+            acts.append((p, a))
+            node = edge[0]
+        summary[p_action]['branches'][ai_action] = {
+            'visits': visits, 'value': total, 'path': path, 'action_log': acts,
+        }
+    return summary
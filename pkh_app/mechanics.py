@@ -1,24 +1,346 @@
 
 import math
+import random
+import threading
+
+from pkh_app.game_data import GAME_DATA
+from pkh_app.type_chart import type_effectiveness
+
+# Hoisted lookups for get_effective_stat (called several times per simulated turn)
+ACC_EVA_STATS = frozenset(('acc', 'eva', 'accuracy', 'evasion'))
+MODIFY_STAT_KEYS = {'atk': 'onModifyAtk', 'def': 'onModifyDef', 'spa': 'onModifySpA', 'spd': 'onModifySpD', 'spe': 'onModifySpe'}
+CONDITIONAL_STAT_ABILITIES = frozenset(('Guts', 'Quick Feet', 'Marvel Scale', 'Flare Boost', 'Toxic Boost'))
+
+# --- Modifier conditions (Mechanics.test_modifier_condition / compile_modifiers) ---
+# Each check takes (mon, move_data, field, target) with move_data never None
+# and says whether the named ability/item/move modifier applies. Names not
+# listed here (after the Memory / Gem / Berry families) always apply.
+
+def _context(field):
+    return field.get('context', {}) if field else {}
+
+def _weather(field):
+    """Weather, unless negated by Cloud Nine / Air Lock."""
+    weather = field.get('weather') if field else None
+    if weather:
+        for p in field.get('active_mons', []):
+            if p.get('ability') in ['Cloud Nine', 'Air Lock']:
+                return None
+    return weather
+
+def _hp_ratio(mon):
+    return mon.get('current_hp', 1) / mon.get('max_hp', 1)
+
+def _move_flag(flag):
+    return lambda m, md, f, t: bool(md.get('flags', {}).get(flag))
+
+def _move_type(move_type):
+    return lambda m, md, f, t: md.get('type') == move_type
+
+def _pinch(move_type):
+    return lambda m, md, f, t: not (_hp_ratio(m) > 1/3 or md.get('type') != move_type)
+
+def _species_has(*names):
+    return lambda m, md, f, t: any(s in m.get('species', '') for s in names)
+
+NFE_SPECIES = frozenset(['Porygon2', 'Chansey', 'Doublade', 'Gligar', 'Scyther', 'Rhydon', 'Dusclops', 'Type: Null', 'Slowpoke', 'Onix', 'Magneton', 'Golbat', 'Piloswine', 'Misdreavus', 'Murkrow', 'Tangela', 'Roselia', 'Seadra', 'Electabuzz', 'Magmar', 'Togetic', 'Clefairy', 'Combusken', 'Marshtomp', 'Grovyle'])
+
+TYPE_RESIST_BERRIES = {
+    'Occa Berry': 'Fire', 'Passho Berry': 'Water', 'Wacan Berry': 'Electric',
+    'Rindo Berry': 'Grass', 'Yache Berry': 'Ice', 'Chople Berry': 'Fighting',
+    'Kebia Berry': 'Poison', 'Shuca Berry': 'Ground', 'Coba Berry': 'Flying',
+    'Payapa Berry': 'Psychic', 'Tanga Berry': 'Bug', 'Charti Berry': 'Rock',
+    'Kasib Berry': 'Ghost', 'Haban Berry': 'Dragon', 'Colbur Berry': 'Dark',
+    'Babiri Berry': 'Steel', 'Roseli Berry': 'Fairy', 'Chilan Berry': 'Normal'
+}
+
+def _resist_berry(berry_type):
+    def check(m, md, f, t):
+        if _context(f).get('effectiveness', 1) > 1 and md.get('type') == berry_type:
+            return True
+        # Chilan Berry (Normal) also works on neutral hits
+        return berry_type == 'Normal' and md.get('type') == 'Normal'
+    return check
+
+def _status_move_target(m, md, f, t, statuses):
+    return bool(t and t.get('status') and (statuses is None or t.get('status') in statuses))
+
+def _fusion(counterpart):
+    return lambda m, md, f, t: _context(f).get('last_move_used_this_turn') == counterpart
+
+MODIFIER_CONDITIONS = {
+    # Category / flags
+    'Ice Scales': lambda m, md, f, t: md.get('category', 'Physical') == 'Special',
+    'Strong Jaw': _move_flag('bite'),
+    'Iron Fist': _move_flag('punch'),
+    'Sharpness': _move_flag('slicing'),
+    'Mega Launcher': _move_flag('pulse'),
+    'Punk Rock': _move_flag('sound'),
+    'Reckless': lambda m, md, f, t: bool(md.get('flags', {}).get('recoil') or md.get('recoil')),
+    'Tough Claws': _move_flag('contact'),
+    'Technician': lambda m, md, f, t: not md.get('basePower', 0) > 60,
+    # Status
+    'Guts': lambda m, md, f, t: bool(m.get('status')),
+    'Marvel Scale': lambda m, md, f, t: bool(m.get('status')),
+    'Toxic Boost': lambda m, md, f, t: m.get('status') in ['psn', 'tox'],
+    'Flare Boost': lambda m, md, f, t: m.get('status') == 'brn',
+    'Facade': lambda m, md, f, t: bool(m.get('status')),
+    # Weather
+    'Sand Force': lambda m, md, f, t: _weather(f) in ['Sand', 'Sandstorm'] and md.get('type') in ['Rock', 'Ground', 'Steel'],
+    'Solar Power': lambda m, md, f, t: _weather(f) in ['Sun', 'Sunny Day'],
+    'Flower Gift': lambda m, md, f, t: _weather(f) in ['Sun', 'Sunny Day'],
+    # HP thresholds
+    'Defeatist': lambda m, md, f, t: not _hp_ratio(m) > 0.5,
+    'Overgrow': _pinch('Grass'),
+    'Blaze': _pinch('Fire'),
+    'Torrent': _pinch('Water'),
+    'Swarm': _pinch('Bug'),
+    # Type-based power
+    'Water Bubble': _move_type('Water'),
+    'Transistor': _move_type('Electric'),
+    "Dragon's Maw": _move_type('Dragon'),
+    'Steelworker': _move_type('Steel'),
+    'Steely Spirit': _move_type('Steel'),
+    "Dragon's Gale": _move_type('Dragon'),
+    'Sheer Force': lambda m, md, f, t: bool(md.get('secondary') or md.get('secondaries')),
+    # Items
+    'Expert Belt': lambda m, md, f, t: not _context(f).get('effectiveness', 1) <= 1,
+    'Tinted Lens': lambda m, md, f, t: not _context(f).get('effectiveness', 1) >= 1,
+    'Light Ball': _species_has('Pikachu'),
+    'Thick Club': _species_has('Cubone', 'Marowak'),
+    'Deep Sea Tooth': _species_has('Clamperl'),
+    'Deep Sea Scale': _species_has('Clamperl'),
+    'Soul Dew': _species_has('Latios', 'Latias'),
+    'Muscle Band': lambda m, md, f, t: md.get('category') == 'Physical',
+    'Wise Glasses': lambda m, md, f, t: md.get('category') == 'Special',
+    'Eviolite': lambda m, md, f, t: m.get('species', '') in NFE_SPECIES or 'Galarian' in m.get('species', ''),
+    # Moves (Expanding Force, Rising Voltage, etc)
+    'Expanding Force': lambda m, md, f, t: (f.get('terrain') if f else None) == 'Psychic Terrain',
+    'Rising Voltage': lambda m, md, f, t: (f.get('terrain') if f else None) == 'Electric Terrain' and _context(f).get('is_grounded_target', True),
+    'Misty Explosion': lambda m, md, f, t: (f.get('terrain') if f else None) == 'Misty Terrain',
+    'Collision Course': lambda m, md, f, t: _context(f).get('effectiveness', 1) > 1,
+    'Electro Drift': lambda m, md, f, t: _context(f).get('effectiveness', 1) > 1,
+    'Lash Out': lambda m, md, f, t: m.get('stats_lowered_this_turn', False),
+    'Assurance': lambda m, md, f, t: _context(f).get('target_damaged_this_turn', False),
+    'Venoshock': lambda m, md, f, t: _status_move_target(m, md, f, t, ['psn', 'tox']),
+    'Hex': lambda m, md, f, t: _status_move_target(m, md, f, t, None),
+    'Barb Barrage': lambda m, md, f, t: _status_move_target(m, md, f, t, ['psn', 'tox']),
+    'Brine': lambda m, md, f, t: bool(t and t.get('current_hp', 1) / t.get('max_hp', 1) <= 0.5),
+    # BP doubles if target moved first
+    'Payback': lambda m, md, f, t: _context(f).get('user_moved_last', False),
+    # Double power if user moves before target
+    'Bolt Beak': lambda m, md, f, t: not _context(f).get('user_moved_last', False),
+    'Fishious Rend': lambda m, md, f, t: not _context(f).get('user_moved_last', False),
+    'Revenge': lambda m, md, f, t: m.get('took_damage_this_turn', False),
+    'Avalanche': lambda m, md, f, t: m.get('took_damage_this_turn', False),
+    'Retaliate': lambda m, md, f, t: f.get('ally_fainted_last_turn', False),
+    # 30% chance for double power; only rolled while a turn is resolved,
+    # so damage estimates outside the engine stay stable
+    'Fickle Beam': lambda m, md, f, t: Mechanics.turn_rng() is not None and Mechanics.turn_rng().chance(0.3),
+    'Grav Apple': lambda m, md, f, t: f.get('gravity', 0) > 0,
+    'Psyblade': lambda m, md, f, t: f.get('terrain') == 'Psychic',
+    # Double if previous move was the counterpart
+    'Fusion Bolt': _fusion('Fusion Flare'),
+    'Fusion Flare': _fusion('Fusion Bolt'),
+}
+MODIFIER_CONDITIONS.update((berry, _resist_berry(t)) for berry, t in TYPE_RESIST_BERRIES.items())
+
+# Conditions reading the mon's own HP (part of the effective-stat cache key)
+HP_CONDITIONS = frozenset(('Defeatist', 'Overgrow', 'Blaze', 'Torrent', 'Swarm'))
+
+_NAME_CONDITIONS = {}
+
+def _name_condition(name):
+    """MODIFIER_CONDITIONS entry for `name`, incl. the Memory / Gem families (None: always applies)."""
+    try:
+        return _NAME_CONDITIONS[name]
+    except KeyError:
+        pass
+    check = MODIFIER_CONDITIONS.get(name)
+    if check is None and isinstance(name, str):
+        if 'Memory' in name:
+            # Silvally Memories (e.g., 'Fire Memory' -> 'Fire')
+            check = _move_type(name.replace(' Memory', ''))
+        elif 'Gem' in name:
+            # Type Gems (e.g., 'Fire Gem' -> 1.3x or 1.5x damage for Fire moves)
+            check = _move_type(name.replace(' Gem', ''))
+    _NAME_CONDITIONS[name] = check
+    return check
+
+def _trigger_matches(trigger_type, name, move_data):
+    if not trigger_type or move_data.get('type') == trigger_type:
+        return True
+    # Thick Fat handles both Fire and Ice; Sand Force has triggerType='Rock'
+    # but works for Ground/Steel too
+    if name == 'Thick Fat':
+        return move_data.get('type') in ('Fire', 'Ice')
+    return name == 'Sand Force'
+
+def _compile_condition(rich_data):
+    """test_modifier_condition bound to one record (None: always applies)."""
+    name = rich_data.get('name')
+    trigger_type = rich_data.get('triggerType')
+    check = _name_condition(name)
+    if not trigger_type:
+        if check is None:
+            return None
+        def cond(m, md, f, t):
+            return check(m, md if md is not None else {}, f, t)
+        return cond
+    def cond(m, md, f, t):
+        if md is None: md = {}
+        if not _trigger_matches(trigger_type, name, md):
+            return False
+        return True if check is None else check(m, md, f, t)
+    return cond
+
+def _always(m, md, f, t):
+    return True
+
+def _user_moved_last(m, md, f, t):
+    return _context(f).get('user_moved_last', False)
+
+def _raw_move_flag(flag):
+    # No None guard: matches the get_modifier fallbacks it replaces
+    return lambda m, md, f, t: md.get('flags', {}).get(flag)
+
+def _effective(m, md, f, t):
+    return _context(f).get('effectiveness', 1) > 1
+
+def _full_hp(m, md, f, t):
+    return m.get('current_hp') == m.get('max_hp') and m.get('max_hp', 0) > 0
+
+# onSourceModifyDamage steps keyed by the mon's 'ability' string ...
+DEFENSIVE_ABILITY_STEPS = {
+    # 0.5x if contact, 2.0x if Fire-type move
+    'Fluffy': ((lambda m, md, f, t: bool(md) and md.get('flags', {}).get('contact'), 0.5),
+               (lambda m, md, f, t: bool(md) and md.get('type') == 'Fire', 2.0)),
+    'Heatproof': ((lambda m, md, f, t: md.get('type') == 'Fire', 0.5),),
+    'Punk Rock': ((lambda m, md, f, t: md.get('flags', {}).get('sound'), 0.5),),
+    'Water Bubble': ((lambda m, md, f, t: md.get('type') == 'Fire', 0.5),),
+    'Dry Skin': ((lambda m, md, f, t: md.get('type') == 'Fire', 1.25),),
+    'Ice Face': ((lambda m, md, f, t: m.get('species') == 'Eiscue' and md.get('category') == 'Physical', 0),),
+}
+
+# ... and by the rich ability record's name (applied after the above)
+DEFENSIVE_RICH_STEPS = {
+    # Filter / Solid Rock (SE only)
+    'Filter': ((_effective, 0.75),),
+    'Solid Rock': ((_effective, 0.75),),
+    'Prism Armor': ((_effective, 0.75),),
+    # Multiscale / Shadow Shield (Full HP)
+    'Multiscale': ((_full_hp, 0.5),),
+    'Shadow Shield': ((_full_hp, 0.5),),
+    # Fluffy (Contact -> 0.5x, Fire -> 2.0x)
+    'Fluffy': ((lambda m, md, f, t: (md.get('flags', {}) if md else {}).get('contact'), 0.5),
+               (lambda m, md, f, t: md.get('type') == 'Fire', 2.0)),
+    # Thick Fat (Fire/Ice -> 0.5x)
+    'Thick Fat': ((lambda m, md, f, t: md.get('type') in ['Fire', 'Ice'], 0.5),),
+    # Dry Skin (Fire -> 1.25x)
+    'Dry Skin': ((lambda m, md, f, t: md.get('type') == 'Fire', 1.25),),
+}
+
+# id(rich record) -> (record, compiled pipeline); see Mechanics.compile_modifiers
+_COMPILED_MODIFIERS = {}
+
+# Chance stream of the turn being resolved on this thread (installed by
+# BattleEngine.apply_turn); SearchWorker threads resolve turns concurrently
+_TURN = threading.local()
 
 class Mechanics:
+    @staticmethod
+    def turn_rng():
+        """This thread's turn stream, or None (sample with the random module)."""
+        return getattr(_TURN, 'rng', None)
+
+    @staticmethod
+    def set_turn_rng(stream):
+        """Installs this thread's turn stream; returns the previous one."""
+        previous = getattr(_TURN, 'rng', None)
+        _TURN.rng = stream
+        return previous
+
+    @staticmethod
+    def _chance(p):
+        rng = Mechanics.turn_rng()
+        if rng is not None:
+            return rng.chance(p)
+        return random.random() < p
+
+    @staticmethod
+    def _choice(seq):
+        rng = Mechanics.turn_rng()
+        if rng is not None:
+            return rng.choice(seq)
+        return random.choice(seq)
+
     @staticmethod
     def get_effective_stat(mon, stat_name, field=None):
         """
         Calculates effective stat including stages, rich data modifiers, and field effects.
+
+        Compact Mons cache the result (Mon.cached_stat) under a key of the
+        field entries the calculation reads; see stat_cache_stats.
         """
+        if mon.__class__ is dict or not hasattr(mon, 'cached_stat'):
+            return Mechanics._compute_effective_stat(mon, stat_name, field)
+        if field:
+            if field.get('allies'):
+                # The ally's own state is not tracked
+                return Mechanics._compute_effective_stat(mon, stat_name, field)
+            weather = field.get('weather')
+            tailwind = field.get('tailwind')
+            side = mon.get('side')
+            field_key = (
+                field.get('wonder_room', 0) > 0, field.get('magic_room', 0) > 0,
+                weather, _weather(field) if weather else None, field.get('terrain'),
+                bool(tailwind and side and tailwind.get(side, 0) > 0),
+            )
+        else:
+            field_key = None
+        if (mon.get('_rich_ability') or {}).get('name') in HP_CONDITIONS:
+            field_key = (field_key, mon.get('current_hp'), mon.get('max_hp'))
+        return mon.cached_stat(stat_name, field_key, lambda: Mechanics._compute_effective_stat(mon, stat_name, field))
+
+    @staticmethod
+    def stat_cache_stats():
+        """Hit/miss/invalidation counters of the compact-Mon effective-stat cache."""
+        from pkh_app.battle_engine.mon import STAT_CACHE_COUNTERS
+        stats = dict(STAT_CACHE_COUNTERS)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    @staticmethod
+    def reset_stat_cache_stats():
+        from pkh_app.battle_engine.mon import STAT_CACHE_COUNTERS
+        for key in STAT_CACHE_COUNTERS:
+            STAT_CACHE_COUNTERS[key] = 0
+
+    @staticmethod
+    def _compute_effective_stat(mon, stat_name, field=None):
         # 0. Wonder Room Swap
         if field and field.get('wonder_room', 0) > 0:
              if stat_name == 'def': stat_name = 'spd'
              elif stat_name == 'spd': stat_name = 'def'
 
-        base = mon.get('stats', {}).get(stat_name, 1)
-        
-        # 1. Stat Stages
-        stages = mon.get('stat_stages', {})
-        stage = stages.get(stat_name, 0)
+        if mon.__class__ is not dict and hasattr(mon, 'stat_inputs'):
+            # Compact Mon: one read of the value array instead of a .get per field
+            base, stage, rich_ab, ability, item, rich_item, status = mon.stat_inputs(stat_name)
+        else:
+            base = mon.get('stats', {}).get(stat_name, 1)
+            # 1. Stat Stages
+            stage = mon.get('stat_stages', {}).get(stat_name, 0)
+            rich_ab = mon.get('_rich_ability', {})
+            ability = mon.get('ability')
+            item = mon.get('item', '')
+            rich_item = mon.get('_rich_item', {})
+            status = mon.get('status')
+        # Consumed/unknown entries are stored as None
+        rich_ab = rich_ab or {}
+        rich_item = rich_item or {}
         
-        if stat_name in ['acc', 'eva', 'accuracy', 'evasion']:
+        if stat_name in ACC_EVA_STATS:
              acc_mult = [3, 4, 5, 6, 7, 8, 9]
              if stage >= 0: multiplier = acc_mult[min(6, stage)] / 3.0
              else: multiplier = 3.0 / acc_mult[min(6, abs(stage))]
@@ -30,17 +352,14 @@ class Mechanics:
         
         # 2. Rich Data Modifiers
         # Abilities
-        rich_ab = mon.get('_rich_ability', {})
         ab_name = rich_ab.get('name')
         
         # Generic onModifyStat logic (Casing matches rich_data: Atk, Def, SpA, SpD, Spe)
-        stat_keys = {'atk': 'Atk', 'def': 'Def', 'spa': 'SpA', 'spd': 'SpD', 'spe': 'Spe'}
-        key = f"onModify{stat_keys.get(stat_name, stat_name.capitalize())}"
+        key = MODIFY_STAT_KEYS.get(stat_name) or f"onModify{stat_name.capitalize()}"
         ab_mod = rich_ab.get(key)
         if isinstance(ab_mod, (int, float)):
             # Guts, Quick Feet, Marvel Scale, Flare/Toxic Boost are handled conditionally below
-            conditional_ab = ['Guts', 'Quick Feet', 'Marvel Scale', 'Flare Boost', 'Toxic Boost']
-            if ab_name not in conditional_ab:
+            if ab_name not in CONDITIONAL_STAT_ABILITIES:
                 if Mechanics.test_modifier_condition(rich_ab, mon, None, field):
                     val *= ab_mod
         
@@ -64,12 +383,11 @@ class Mechanics:
             terrain = field.get('terrain') if field else None
             if terrain == 'Electric' and ab_name == 'Surge Surfer': val *= 2
             if ab_name == 'Unburden' and mon.get('unburden_active'): val *= 2
-            if ab_name == 'Quick Feet' and mon.get('status'): val *= 1.5
+            if ab_name == 'Quick Feet' and status: val *= 1.5
 
         # Items
-        if (not field or field.get('magic_room', 0) <= 0) and mon.get('ability') != 'Klutz':
-             item_name = str(mon.get('item', '')).strip()
-             rich_item = mon.get('_rich_item', {})
+        if (not field or field.get('magic_room', 0) <= 0) and ability != 'Klutz':
+             item_name = str(item).strip()
              
              # Case-insensitive check for Iron Ball / Macho Brace
              is_iron_ball = item_name.lower() == 'iron ball'
@@ -103,7 +421,6 @@ class Mechanics:
 
         
         # 3. Conditional Rich Modifiers (Ailment-based)
-        status = mon.get('status')
         if status:
              # Abilities that trigger on ANY status
              if ab_name == 'Guts' and stat_name == 'atk': val *= 1.5
@@ -114,7 +431,6 @@ class Mechanics:
              if ab_name == 'Toxic Boost' and stat_name == 'atk' and status in ['psn', 'tox']: val *= 1.5
         
         # 4. Status Effects (Side Effects)
-        status = mon.get('status')
         if status == 'brn' and stat_name == 'atk' and ab_name != 'Guts':
              val *= 0.5
         # if status == 'par' and stat_name == 'spe' and ab_name != 'Quick Feet':
@@ -145,7 +461,7 @@ class Mechanics:
         # 3. Special Post-Modifiers (Tailwind, Paralysis)
         if stat_name == 'spe':
             # Paralysis (Run & Bun)
-            if mon.get('status') == 'par' and (not rich_ab or rich_ab.get('name') != 'Quick Feet'):
+            if status == 'par' and (not rich_ab or rich_ab.get('name') != 'Quick Feet'):
                  val *= 0.25
             # Tailwind
             if field and field.get('tailwind'):
@@ -162,7 +478,7 @@ class Mechanics:
         # 0. Always Active (unless suppressed, but that's handled in get_modifier)
         
     @staticmethod
-    def check_accuracy(attacker, defender, move_data, field, log=None):
+    def check_accuracy(attacker, defender, move_data, field, log=None, rng=None):
         """
         Determines if a move hits using Gen 8 mechanics.
         Returns True (Hit) or False (Miss).
@@ -248,8 +564,11 @@ class Mechanics:
              
         # Roll
         # Standard: r = random(0..99). If r < final_acc, Hit.
-        import random
-        hit = random.random() * 100 < final_acc
+        rng = rng or Mechanics.turn_rng()
+        if rng is not None:
+            hit = rng.chance(final_acc / 100)
+        else:
+            hit = random.random() * 100 < final_acc
         
         if not hit and log is not None:
              log.append(f"  {attacker.get('species')} used {move_data.get('name')} but missed!")
@@ -300,24 +619,8 @@ class Mechanics:
         """
         Retrieves base stats (and type) for a species from pokedex_rich.json
         """
-        # We need to cache this or load it efficiently. For now, load on demand (slow but works).
-        # Better: BattleEngine should pass this context. 
-        # But this method is static.
-        # Let's assume the caller handles caching or we do a simple file read.
-        import json
-        import os
-        try:
-             # Locate pokedex_rich.json relative to this file
-             path = os.path.join(os.path.dirname(__file__), '../data/pokedex_rich.json')
-             with open(path, 'r') as f:
-                  dex = json.load(f)
-             
-             # Normalize key
-             key = species_name.lower().replace(" ", "").replace("-", "").replace(".", "").replace("'", "")
-             # Handle forms crudely if needed, but standard normalization handles most
-             return dex.get(key, {})
-        except Exception:
-             return {}
+        key = species_name.lower().replace(" ", "").replace("-", "").replace(".", "").replace("'", "")
+        return GAME_DATA.pokedex.get(key, {})
 
 
     @staticmethod
@@ -661,7 +964,7 @@ class Mechanics:
                     stages['spe'] = current_spe + 1
                     log.append(f"  {mon.get('species')} Speed Boost!")
             elif ability == 'Shed Skin':
-                if mon.get('status') and hash(str(state.get_hash())) % 100 < 30:
+                if mon.get('status') and Mechanics._chance(0.3):
                     mon['status'] = None
                     log.append(f"  {mon.get('species')} Shed Skin!")
             elif ability == 'Hydration' and weather in ['Rain', 'Rain Dance']:
@@ -691,9 +994,8 @@ class Mechanics:
                       log.append("  Morpeko satisfied its hunger!")
             elif ability == 'Moody':
                  stats = ['atk', 'def', 'spa', 'spd', 'spe', 'acc', 'eva']
-                 idx = hash(str(state.get_hash()) + 'moody' + str(mon.get('species'))) 
-                 up = stats[idx % len(stats)]
-                 down = stats[(idx + 1) % len(stats)] # Simple deterministic different choice
+                 up = Mechanics._choice(stats)
+                 down = Mechanics._choice([s for s in stats if s != up])
                  
                  stages = mon.setdefault('stat_stages', {})
                  curr_up = stages.get(up, 0)
@@ -708,7 +1010,7 @@ class Mechanics:
                  last_item = mon.get('_last_consumed_item')
                  if not mon.get('item') and last_item:
                       chance = 100 if weather in ['Sun', 'Sunny Day'] else 50
-                      if hash(str(state.get_hash()) + 'harvest' + mon.get('species')) % 100 < chance:
+                      if Mechanics._chance(chance / 100):
                            mon['item'] = last_item
                            mon['_last_consumed_item'] = None
                            log.append(f"  {mon.get('species')} harvested one {last_item}!")
@@ -757,7 +1059,7 @@ class Mechanics:
 
         # 1. Quick Claw
         if item == 'Quick Claw':
-            if hash(str(state.get_hash()) + 'qc' + mon.get('species', '')) % 100 < 20:
+            if Mechanics._chance(0.2):
                 mon['turn_priority_mod'] = 1
                 log.append(f"  Quick Claw let {mon.get('species')} move first!")
 
@@ -771,7 +1073,7 @@ class Mechanics:
         # If Quick Draw activates, we are +1.
         # We check both to allow probability stacking (approx 44% total chance).
         if ability == 'Quick Draw':
-            if hash(str(state.get_hash()) + 'qd' + mon.get('species', '')) % 100 < 30:
+            if Mechanics._chance(0.3):
                 mon['turn_priority_mod'] = 1
                 log.append(f"  Quick Draw let {mon.get('species')} move first!")
 
@@ -864,73 +1166,34 @@ class Mechanics:
     def get_modifier(mon, key, move_data=None, field=None, target=None):
         """
         Generic modifier retriever for onBasePower, onModifyDamage, etc.
+
+        The ability and item parts are precompiled per rich record (see
+        compile_modifiers), so this only walks a few short step lists.
         """
         mod = 1.0
         if not mon: return mod
-        rich_ab = mon.get('_rich_ability', {})
-        
-        # if key == "onBasePower":
-        #    print(f"DEBUG MODIFIER: Key={key}, Ability={rich_ab.get('name')}, Move={move_data.get('name')}, Flags={move_data.get('flags')}")
 
-        if key == 'onBasePower':
-            pass # Placeholder for the print statement, if uncommented.
-        # print("DEBUG: get_modifier called for loop", getattr(source, "name", "Unknown"), getattr(target, "name", "Unknown"), move_name, loop_name)
-
-        
         # 1. Move itself (Phase 3 Convergence)
         if move_data:
              move_val = move_data.get(key)
              if isinstance(move_val, (int, float)):
                   if Mechanics.test_modifier_condition(move_data, mon, move_data, field, target):
                        mod *= move_val
-        
-        # Context extraction
-        context = field.get('context', {}) if field else {}
-        user_moved_last = context.get('user_moved_last', False)
-        
-        # 2. Ability
-        rich_ab = mon.get('_rich_ability', {})
-        val = rich_ab.get(key)
-        
-        # Special Case: Technician (check 'onBasePower' logic internally or here)
-        # However, mechanics.json defines 'Technician' with a static float.
-        # We rely on test_modifier_condition to gate it.
-        
-        if val is not None and isinstance(val, (int, float)):
-             if Mechanics.test_modifier_condition(rich_ab, mon, move_data, field, target):
-                  mod *= val
-                  
-        # Special Case: Analytic (needs context)
-        if rich_ab.get('name') == 'Analytic' and user_moved_last and key == 'onBasePower':
-             # Analytic isn't always fully defined in rich data with a conditional
-             # So we hardcode the 1.3x check if data is missing or generic
-             if not val: mod *= 1.3
-
-        # Sand Force Fallback (Data often missing explicit modifier)
-        if key == 'onBasePower' and rich_ab.get('name') == 'Sand Force':
-             # Note: test_modifier_condition handles Weather/Type checks
-             cond = Mechanics.test_modifier_condition(rich_ab, mon, move_data, field, target)
-             if cond:
-                  mod *= 1.3
-
-        # Special Case: Punk Rock (Sound moves 1.3x)
-        if key == 'onBasePower' and rich_ab.get('name') == 'Punk Rock':
-             if move_data.get('flags', {}).get('sound'):
-                  mod *= 1.3
-
-        # Special Case: Sheer Force (needs context for secondary check)
-        # Usually handled via test_modifier_condition if properly defined, 
-        # but let's ensure it checks the move's secondary property.
-        
+
+        # 2. Ability (incl. Analytic / Sand Force / Punk Rock fallbacks)
+        rich_ab = mon.get('_rich_ability') or {}
+        ab_steps, ab_post = Mechanics.compile_modifiers(rich_ab)
+        for cond, mult in ab_steps.get(key, ()):
+             if cond is None or cond(mon, move_data, field, target):
+                  mod *= mult
+
         # Item
         it = mon.get('_rich_item')
         if it and mon.get('ability') != 'Klutz':
-             val = it.get(key)
-             if val is not None and isinstance(val, (int, float)):
-                  if Mechanics.test_modifier_condition(it, mon, move_data, field, target):
-                       mod *= val
+             for cond, mult in Mechanics.compile_modifiers(it)[0].get(key, ()):
+                  if cond is None or cond(mon, move_data, field, target):
+                       mod *= mult
 
-        
         # 3. Ally Modifiers (Phase 2 Awareness)
         if field and field.get('allies'):
              side = mon.get('side')
@@ -978,292 +1241,67 @@ class Mechanics:
                                  mod *= 1.33
                             break
 
-        # 5. Defensive Abilities (Source Modifiers)
-        if key == 'onSourceModifyDamage':
-             ab = mon.get('ability')
-             if ab == 'Fluffy':
-                  # 0.5x if contact, 2.0x if Fire-type move
-                  if move_data:
-                       from pkh_app.battle_engine import BattleEngine
-                       # We need a reference to the engine instance? No, we use static method
-                       # But BattleEngine is not static. We can use a simplified contact check.
-                       if move_data.get('flags', {}).get('contact'):
-                            mod *= 0.5
-                       if move_data.get('type') == 'Fire':
-                            mod *= 2.0
-             elif ab == 'Heatproof' and move_data.get('type') == 'Fire':
-                  mod *= 0.5
-             elif ab == 'Punk Rock' and move_data.get('flags', {}).get('sound'):
-                  mod *= 0.5
-             elif ab == 'Water Bubble' and move_data.get('type') == 'Fire':
-                  mod *= 0.5
-             elif ab == 'Dry Skin' and move_data.get('type') == 'Fire':
-                  mod *= 1.25
-             elif ab == 'Ice Face' and mon.get('species') == 'Eiscue' and move_data.get('category') == 'Physical':
-                  mod = 0
-                            
-        # 5. Fixed Defensive Modifiers (Filter / Solid Rock / Multiscale)
+        # 5. Defensive Abilities (Source Modifiers), by ability name and
+        # then by rich record (Filter / Solid Rock / Multiscale, ...)
         if key == 'onSourceModifyDamage':
-             # Filter / Solid Rock (SE only)
-             if context.get('effectiveness', 1) > 1:
-                  if rich_ab.get('name') in ['Filter', 'Solid Rock', 'Prism Armor']:
-                       mod *= 0.75
-             
-             # Multiscale / Shadow Shield (Full HP)
-             if mon.get('current_hp') == mon.get('max_hp') and mon.get('max_hp', 0) > 0:
-                  if rich_ab.get('name') in ['Multiscale', 'Shadow Shield']:
-                       mod *= 0.5
-              
-              # Fluffy (Contact -> 0.5x, Fire -> 2.0x)
-             if rich_ab.get('name') == 'Fluffy':
-                  flags = move_data.get('flags', {}) if move_data else {}
-                  if flags.get('contact'):
-                       mod *= 0.5
-                  if move_data.get('type') == 'Fire':
-                       mod *= 2.0
-             
-             # Thick Fat (Fire/Ice -> 0.5x)
-             if rich_ab.get('name') == 'Thick Fat':
-                  if move_data.get('type') in ['Fire', 'Ice']:
-                       mod *= 0.5
-                       
-             # Dry Skin (Fire -> 1.25x)
-             if rich_ab.get('name') == 'Dry Skin':
-                  if move_data.get('type') == 'Fire':
-                       mod *= 1.25
+             for cond, mult in DEFENSIVE_ABILITY_STEPS.get(mon.get('ability'), ()):
+                  if cond(mon, move_data, field, target):
+                       mod *= mult
+             for cond, mult in ab_post:
+                  if cond(mon, move_data, field, target):
+                       mod *= mult
                   
         return mod
 
+    @staticmethod
+    def compile_modifiers(rich_data):
+        """
+        Precompiled modifier pipeline of one ability/item record:
+        ({key: ((condition, multiplier), ...)}, post_steps), where a None
+        condition always applies and post_steps are the onSourceModifyDamage
+        steps get_modifier runs after ally/aura modifiers. Rich records are
+        shared and read-only (RichRegistry), so the result is cached per
+        record; StateEnricher compiles each mon's records when enriching.
+        """
+        entry = _COMPILED_MODIFIERS.get(id(rich_data))
+        if entry is not None and entry[0] is rich_data:
+            return entry[1]
+
+        name = rich_data.get('name')
+        cond = _compile_condition(rich_data)
+        steps = {}
+        for key, val in rich_data.items():
+            if isinstance(val, (int, float)):
+                steps[key] = [(cond, val)]
+
+        # Fallbacks for abilities whose rich data lacks the modifier
+        bp_extra = []
+        if name == 'Analytic' and not rich_data.get('onBasePower'):
+            bp_extra.append((_user_moved_last, 1.3))
+        if name == 'Sand Force':
+            bp_extra.append((cond or _always, 1.3))
+        if name == 'Punk Rock':
+            bp_extra.append((_raw_move_flag('sound'), 1.3))
+        if bp_extra:
+            steps['onBasePower'] = steps.get('onBasePower', []) + bp_extra
+
+        compiled = ({key: tuple(s) for key, s in steps.items()}, DEFENSIVE_RICH_STEPS.get(name, ()))
+        if len(_COMPILED_MODIFIERS) >= 4096:
+            _COMPILED_MODIFIERS.clear()
+        _COMPILED_MODIFIERS[id(rich_data)] = (rich_data, compiled)
+        return compiled
+
     @staticmethod
     def test_modifier_condition(rich_data, mon, move_data, field, target=None):
         if move_data is None: move_data = {}
         # if not move_data: return True # Don't shortcut: Conditions like HP don't need move
         name = rich_data.get('name')
         # 1. triggerType matching (Fighting, Dark, etc for Plates/Incenses)
-        trigger_type = rich_data.get('triggerType')
-        if trigger_type and move_data.get('type') != trigger_type:
-            # Special case for Thick Fat (usually handles both Fire and Ice)
-            if name == 'Thick Fat' and move_data.get('type') == 'Fire':
-                pass # Allow Fire
-            elif name == 'Thick Fat' and move_data.get('type') == 'Ice':
-                pass # Allow Ice
-            # Special Case: Sand Force (Has triggerType='Rock' but works for Ground/Steel too)
-            elif name == 'Sand Force':
-                 pass
-            else:
-                return False
-            
-        # Category Checks for specific abilities
-        move_category = move_data.get('category', 'Physical')
-        if name == 'Ice Scales' and move_category != 'Special': return False
-        
-        # 2. Flag-based matching
-        flags = move_data.get('flags', {})
-        name = rich_data.get('name')
-        
-        if name == 'Strong Jaw' and not flags.get('bite'): return False
-        if name == 'Iron Fist' and not flags.get('punch'): return False
-        if name == 'Sharpness' and not flags.get('slicing'): return False
-        if name == 'Mega Launcher' and not flags.get('pulse'): return False
-        if name == 'Punk Rock' and not flags.get('sound'): return False
-        if name == 'Reckless' and not (flags.get('recoil') or move_data.get('recoil')): return False
-        if name == 'Tough Claws' and not flags.get('contact'): return False
-        
-        # 3. Technician logic
-        if name == 'Technician' and move_data.get('basePower', 0) > 60:
+        if not _trigger_matches(rich_data.get('triggerType'), name, move_data):
             return False
-            
-        # 4. Status Checks
-        if name == 'Guts' and not mon.get('status'): return False
-        if name == 'Marvel Scale' and not mon.get('status'): return False
-        if name == 'Toxic Boost' and not (mon.get('status') in ['psn', 'tox']): return False
-        if name == 'Flare Boost' and not (mon.get('status') == 'brn'): return False
-        
-        # Facade check
-        if name == 'Facade':
-             if not mon.get('status'): return False
-        
-        # 5. Weather Checks
-        weather = field.get('weather') if field else None
-        
-        # Cloud Nine / Air Lock Negation
-        if weather:
-             weather_negated = False
-             for p in field.get('active_mons', []):
-                  if p.get('ability') in ['Cloud Nine', 'Air Lock']:
-                       weather_negated = True
-                       break
-             if weather_negated: weather = None
-
-        if name == 'Sand Force':
-             if weather not in ['Sand', 'Sandstorm']: return False
-             if move_data.get('type') not in ['Rock', 'Ground', 'Steel']: return False
-        if name == 'Solar Power' and weather not in ['Sun', 'Sunny Day']: return False
-        if name == 'Flower Gift':
-             if weather not in ['Sun', 'Sunny Day']: return False
-             # Only Atk/SpD usually, but we check if the key matches.
-        
-        # 6. HP Thresholds
-        curr_hp = mon.get('current_hp', 1)
-        max_hp = mon.get('max_hp', 1)
-        hp_ratio = curr_hp / max_hp
-        
-        if name == 'Defeatist' and hp_ratio > 0.5: return False
-        if name == 'Overgrow' and (hp_ratio > 1/3 or move_data.get('type') != 'Grass'): return False
-        if name == 'Blaze' and (hp_ratio > 1/3 or move_data.get('type') != 'Fire'): return False
-        if name == 'Torrent' and (hp_ratio > 1/3 or move_data.get('type') != 'Water'): return False
-        if name == 'Swarm' and (hp_ratio > 1/3 or move_data.get('type') != 'Bug'): return False
-        
-        # 7. Type-based Power
-        if name == 'Water Bubble' and move_data.get('type') != 'Water': return False
-        if name == 'Transistor' and move_data.get('type') != 'Electric': return False
-        if name == "Dragon's Maw" and move_data.get('type') != 'Dragon': return False
-        if name in ['Steelworker', 'Steely Spirit'] and move_data.get('type') != 'Steel': return False
-        if name == "Dragon's Gale" and move_data.get('type') != 'Dragon': return False
-        
-        # 8. Sheer Force logic
-        if name == 'Sheer Force':
-             # Active if move has secondary effects
-             has_secondary = bool(move_data.get('secondary') or move_data.get('secondaries'))
-             if not has_secondary: return False
-             
-        # 9. Item specific conditional logic
-        context = field.get('context', {}) if field else {}
-        species = mon.get('species', '')
-        
-        if name == 'Expert Belt':
-             if context.get('effectiveness', 1) <= 1: return False
-             
-        if name == 'Tinted Lens':
-             if context.get('effectiveness', 1) >= 1: return False
-             
-        if name == 'Light Ball':
-             if 'Pikachu' not in species: return False
-        
-        if name == 'Thick Club':
-             if not any(s in species for s in ['Cubone', 'Marowak']): return False
-             
-        if name in ['Deep Sea Tooth', 'Deep Sea Scale']:
-             if 'Clamperl' not in species: return False
-             
-        if name == 'Soul Dew':
-             if not any(s in species for s in ['Latios', 'Latias']): return False
-             
-        if name == 'Muscle Band':
-             if move_data.get('category') != 'Physical': return False
-        
-        if name == 'Wise Glasses':
-             if move_data.get('category') != 'Special': return False
-             
-        if 'Memory' in name:
-             # Silvally Memories (e.g., 'Fire Memory' -> 'Fire')
-             mem_type = name.replace(' Memory', '')
-             if move_data.get('type') != mem_type: return False
-             
-        if 'Gem' in name:
-             # Type Gems (e.g., 'Fire Gem' -> 1.3x or 1.5x damage for Fire moves)
-             # NOTE: In R&B they are often 1.3x. Rich data should have the value.
-             gem_type = name.replace(' Gem', '')
-             if move_data.get('type') != gem_type: return False
-
-        if name == 'Eviolite':
-             nfes = ['Porygon2', 'Chansey', 'Doublade', 'Gligar', 'Scyther', 'Rhydon', 'Dusclops', 'Type: Null', 'Slowpoke', 'Onix', 'Magneton', 'Golbat', 'Piloswine', 'Misdreavus', 'Murkrow', 'Tangela', 'Roselia', 'Seadra', 'Electabuzz', 'Magmar', 'Togetic', 'Clefairy', 'Combusken', 'Marshtomp', 'Grovyle']
-             if species not in nfes and 'Galarian' not in species: return False
-
-        # 10. Move-specific Conditions (Expanding Force, Rising Voltage, etc)
-        terrain = field.get('terrain') if field else None
-        context = field.get('context', {}) if field else {}
-        
-        if name == 'Expanding Force':
-             return terrain == 'Psychic Terrain'
-        if name == 'Rising Voltage':
-             # If target is grounded in Electric Terrain, BP doubles.
-             # Note: Rising Voltage BP double is handled in its onBasePower if we set it.
-             # If BP is already doubled in data, we just return Terrain check.
-             return terrain == 'Electric Terrain' and context.get('is_grounded_target', True)
-        if name == 'Misty Explosion':
-             return terrain == 'Misty Terrain'
-        if name in ['Collision Course', 'Electro Drift']:
-             return context.get('effectiveness', 1) > 1
-        
-        if name == 'Lash Out':
-             return mon.get('stats_lowered_this_turn', False)
-        
-        if name == 'Assurance':
-             return context.get('target_damaged_this_turn', False)
-        
-        if name in ['Venoshock', 'Hex', 'Barb Barrage']:
-             if target and target.get('status'):
-                  if name == 'Venoshock' and target.get('status') in ['psn', 'tox']: return True
-                  if name == 'Hex': return True # Any status
-                  if name == 'Barb Barrage' and target.get('status') in ['psn', 'tox']: return True
-             return False
-
-        if name == 'Brine':
-             if target and target.get('current_hp', 1) / target.get('max_hp', 1) <= 0.5:
-                  return True
-             return False
-        
-        if name == 'Payback':
-             # BP doubles if target moved first
-             return context.get('user_moved_last', False)
-
-        if name in ['Bolt Beak', 'Fishious Rend']:
-             # Double power if user moves before target
-             moved_last = context.get('user_moved_last', False)
-             return not moved_last
-             
-        if name in ['Revenge', 'Avalanche']:
-             return mon.get('took_damage_this_turn', False)
-             
-        if name == 'Retaliate':
-             return field.get('ally_fainted_last_turn', False)
-
-        # New Move Conditions
-        if name == 'Fickle Beam':
-             # 30% chance for double power (Deterministic hash for consistency)
-             return (hash(str(mon.get('current_hp')) + context.get('move_name', '')) % 100) < 30
-             
-        if name == 'Grav Apple':
-             return field.get('gravity', 0) > 0
-             
-        if name == 'Psyblade':
-             return field.get('terrain') == 'Psychic'
-
-        if name in ['Fusion Bolt', 'Fusion Flare']:
-             # Double if previous move was the counterpart
-             last_move = context.get('last_move_used_this_turn')
-             counterpart = 'Fusion Flare' if name == 'Fusion Bolt' else 'Fusion Bolt'
-             return last_move == counterpart
-
-        if name == 'Barb Barrage':
-             return defender.get('status') is not None
-             
-        if name == 'Knock Off':
-             if target and target.get('item'):
-                  # Basic check. Assume removable if present for now (simplification)
-                  return True
-        
-        if 'Berry' in name and name != 'Custap Berry':
-             # Type-Resist Berries
-             TYPE_RESIST_BERRIES = {
-                  'Occa Berry': 'Fire', 'Passho Berry': 'Water', 'Wacan Berry': 'Electric',
-                  'Rindo Berry': 'Grass', 'Yache Berry': 'Ice', 'Chople Berry': 'Fighting',
-                  'Kebia Berry': 'Poison', 'Shuca Berry': 'Ground', 'Coba Berry': 'Flying',
-                  'Payapa Berry': 'Psychic', 'Tanga Berry': 'Bug', 'Charti Berry': 'Rock',
-                  'Kasib Berry': 'Ghost', 'Haban Berry': 'Dragon', 'Colbur Berry': 'Dark',
-                  'Babiri Berry': 'Steel', 'Roseli Berry': 'Fairy', 'Chilan Berry': 'Normal'
-             }
-             if name in TYPE_RESIST_BERRIES:
-                  if context.get('effectiveness', 1) > 1 and move_data.get('type') == TYPE_RESIST_BERRIES[name]:
-                       return True
-                  if name == 'Chilan Berry' and move_data.get('type') == 'Normal':
-                       return True # Chilan Berry (Normal) works on neutral hit? Usually checks type match.
-                  return False
-        
-        if name == 'Silk Scarf':
-             print("DEBUG: Silk Scarf Reached End. Returning True.")
-        return True
+        # 2. Per-name conditions (see MODIFIER_CONDITIONS)
+        check = _name_condition(name)
+        return True if check is None else check(mon, move_data, field, target)
 
     @staticmethod
     def get_stab_multiplier(attacker, move_type):
@@ -1274,9 +1312,8 @@ class Mechanics:
 
     @staticmethod
     def get_type_effectiveness_with_abilities(move_type, defender, attacker=None):
-         from pkh_app.local_damage_calc import get_type_effectiveness
          def_types = defender.get('types', ['Normal'])
-         effectiveness = get_type_effectiveness(move_type, def_types)
+         effectiveness = type_effectiveness(move_type, def_types)
 
          if attacker:
               ab_name = attacker.get('ability') or attacker.get('_rich_ability', {}).get('name')
@@ -1284,7 +1321,7 @@ class Mechanics:
               if effectiveness == 0 and move_type in ['Normal', 'Fighting']:
                    if ab_name in ['Scrappy', "Mind's Eye"]:
                         # Calculate effectiveness treating Ghost as neutral (1.0)
-                        effectiveness = get_type_effectiveness(move_type, [t for t in def_types if t != 'Ghost'])
+                        effectiveness = type_effectiveness(move_type, [t for t in def_types if t != 'Ghost'])
          
          return effectiveness
 
@@ -1420,9 +1457,8 @@ class Mechanics:
 
     @staticmethod
     def get_type_effectiveness_with_abilities(move_type, defender, attacker=None):
-         from pkh_app.local_damage_calc import get_type_effectiveness
          def_types = defender.get('types', ['Normal'])
-         effectiveness = get_type_effectiveness(move_type, def_types)
+         effectiveness = type_effectiveness(move_type, def_types)
 
          if attacker:
               ab_name = attacker.get('ability') or attacker.get('_rich_ability', {}).get('name')
@@ -1430,6 +1466,6 @@ class Mechanics:
               if effectiveness == 0 and move_type in ['Normal', 'Fighting']:
                    if ab_name in ['Scrappy', "Mind's Eye"]:
                         # Calculate effectiveness treating Ghost as neutral (1.0)
-                        effectiveness = get_type_effectiveness(move_type, [t for t in def_types if t != 'Ghost'])
+                        effectiveness = type_effectiveness(move_type, [t for t in def_types if t != 'Ghost'])
          
          return effectiveness
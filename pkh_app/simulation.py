@@ -1,10 +1,22 @@
 
 from typing import List, Dict, Tuple
+from concurrent.futures import ProcessPoolExecutor, wait
+import itertools
+import multiprocessing
+import time
 import threading
 import queue
 import statistics
 from pkh_app.battle_engine import BattleEngine, BattleState
+from pkh_app.battle_engine.chance import EnumeratingStream, derive_seed
 from pkh_app.ai_scorer import AIScorer
+from pkh_app.transposition import TranspositionTable, TTEntry
+from pkh_app.mcts import MCTS, root_summary
+
+
+class _SearchStopped(Exception):
+    """Raised inside the search when Simulation.run's time budget runs out or it is cancelled."""
+
 
 class Simulation:
     def __init__(self, battle_engine: BattleEngine, ai_scorer: AIScorer):
@@ -12,54 +24,129 @@ class Simulation:
         self.ai = ai_scorer
         self.beam_width = 3
         self.max_depth = 20 # Increased for convergence search
+        self.compact_mons = True # Search on slot-backed Mon records (see BattleState.compact)
+        self.tt_size = 20000 # Transposition table entries (0 disables)
+        self.tt = None
+        # 'expectimax': root turns are expanded into weighted chance outcomes
+        # (apply_turn_distribution) and deeper turns follow the most likely
+        # outcome; 'sample': every turn is one random apply_turn
+        self.chance_mode = 'expectimax'
+        self.max_outcomes = 4 # Chance outcomes kept per root transition
+        self.roll_buckets = 3 # Damage-roll groups per chance node
+        # 'sample' mode: with a seed every transition is resolved with a seed
+        # derived from (seed, state, actions), so runs are reproducible and
+        # independent workers can be given different seeds
+        self.seed = None
+        # Root (player action, AI action) branches are searched in this many
+        # worker processes (0 or 1: in this process); see _search_roots
+        self.workers = 0
+        # multiprocessing start method for the workers (None: platform
+        # default); nothing in a task depends on the parent's memory, so
+        # spawn/forkserver give the same results as fork
+        self.worker_start_method = None
+        # 'deepening': iterative deepening over greedy lines (beam/greedy);
+        # 'mcts': UCT tree search (see pkh_app.mcts), bounded by
+        # mcts_iterations and the time budget; with workers it runs one
+        # independent tree per worker and sums the root statistics
+        self.search_mode = 'deepening'
+        self.mcts_iterations = 2000 # Playouts per search; each adds at most one tree node
+        self.mcts_exploration = 1.4
+        self.mcts_rollout_depth = 2 # Greedy plies played out from each new leaf
+        self._pools = []
+        self._run_ids = itertools.count()
+        self._deadline = None # time.monotonic() value; checked by the search while set
+        self._cancel = None # threading.Event-like; set to abandon the running search
+
+    def close(self):
+        """Shuts down the worker processes, if any were started."""
+        for pool in self._pools:
+            pool.shutdown()
+        self._pools = []
         
-    def run(self, initial_state: BattleState) -> Dict:
+    def run(self, initial_state: BattleState, time_budget: float = None, cancel=None, progress=None) -> Dict:
         """
         Runs the simulation using Iterative Deepening.
+
+        With a time_budget (seconds) the search is anytime: once the budget
+        is spent the depth in progress is abandoned and the result of the
+        last completed depth is returned with status "Deadline". Depth 1
+        always completes, so there is always a recommendation.
+
+        cancel is an Event-like object; once it is set the search stops as
+        soon as possible (depth 1 included) with status "Cancelled". Worker
+        processes only see it between depths. progress, if given, is called
+        with {'best_action', 'scores', 'final_depth'} after every completed
+        depth.
         """
+        started = time.monotonic()
+        deadline = started + time_budget if time_budget is not None else None
+        self._deadline = None
+        self._cancel = cancel
+        if self.compact_mons:
+            # Every node below copies from this root; compact records halve copy cost/memory
+            initial_state = initial_state.deep_copy().compact()
+
+        # One table for the whole iterative-deepening loop: depth d reuses the
+        # best actions (and exact-depth values) found at depth d-1
+        self.tt = TranspositionTable(self.tt_size) if self.tt_size > 0 else None
+        self._root_cache = {}
+
+        if self.search_mode == 'mcts':
+            return self._run_mcts(initial_state, started, deadline, progress)
+
         valid_actions = self.engine.get_valid_actions(initial_state, 'player')
         results = {}
         paths = {}
         
         # Track best action history for convergence
         best_action_history = []
-        final_depth = 1
+        final_depth = 0
         status = "Max Depth"
         
+        # The AI's reply distribution at the root does not depend on the player action
+        ai_probs = self.get_ai_action_probs(initial_state)
+        root_hash = initial_state.get_hash()
+        run_id = (id(self), next(self._run_ids))
+
         for depth in range(1, self.max_depth + 1):
-            iteration_scores = {}
-            iteration_paths = {}
+            if cancel is not None and cancel.is_set():
+                status = "Cancelled"
+                break
+            if depth > 1 and deadline is not None:
+                if time.monotonic() >= deadline:
+                    status = "Deadline"
+                    break
+                self._deadline = deadline
+            iteration_scores = {p_action: 0 for p_action in valid_actions}
+            iteration_paths = {p_action: [] for p_action in valid_actions}
             
+            # (player action, AI action, reply probability, outcome weight, chance outcome, turn log)
+            roots = []
             for p_action in valid_actions:
-                ai_probs = self.get_ai_action_probs(initial_state)
-                total_score = 0
-                branch_results = []
-                
                 for ai_action, prob in ai_probs.items():
-                    next_state, turn_log = self.engine.apply_turn(initial_state.deep_copy(), p_action, ai_action)
-                    
-                    # recursive search
-                    # Start action log with the current turn
-                    value, full_path, acts = self.simulate_branch(
-                        next_state, 
-                        depth=depth-1, 
-                        path_log=[turn_log],
-                        action_log=[(p_action, ai_action)],
-                        visited={initial_state.get_hash()}
-                    )
-                    
-                    total_score += value * prob
-                    branch_results.append({
-                        'ai_action': ai_action,
-                        'prob': prob,
-                        'value': value,
-                        'path': full_path,
-                        'action_log': acts
-                    })
-                
-                iteration_scores[p_action] = total_score
+                    for weight, next_state, turn_log in self._root_outcomes(root_hash, initial_state, p_action, ai_action):
+                        roots.append((p_action, ai_action, prob, weight, next_state, turn_log))
+            
+            try:
+                searched = self._search_roots(roots, depth, root_hash, run_id)
+            except _SearchStopped:
+                # Keep the previous depth's results; completed subtrees are already in the table
+                status = "Cancelled" if cancel is not None and cancel.is_set() else "Deadline"
+                break
+            
+            # Merged in root order, so the result does not depend on scheduling
+            for (p_action, ai_action, prob, weight, next_state, _), (value, full_path, acts) in zip(roots, searched):
+                iteration_scores[p_action] += value * prob * weight
+                iteration_paths[p_action].append({
+                    'ai_action': ai_action,
+                    'prob': prob * weight,
+                    'value': value,
+                    'path': full_path,
+                    'action_log': acts,
+                    'start_state': next_state
+                })
+            for branch_results in iteration_paths.values():
                 branch_results.sort(key=lambda x: x['prob'], reverse=True)
-                iteration_paths[p_action] = branch_results
             
             current_best = max(iteration_scores, key=iteration_scores.get, default=None)
             best_action_history.append(current_best)
@@ -68,6 +155,8 @@ class Simulation:
             results = iteration_scores
             paths = iteration_paths
             final_depth = depth
+            if progress is not None:
+                progress({'best_action': current_best, 'scores': dict(iteration_scores), 'final_depth': depth})
             
             # 1. Total KO Check (Check if top path of best action ends in total KO)
             if current_best and iteration_paths[current_best]:
@@ -83,34 +172,195 @@ class Simulation:
                     status = "Converged"
                     break
         
+        self._deadline = deadline
         # 3. Post-Process: Greedy Finalize the top paths
         # This extends the visual forecast until Match End (KO) or turn limit
         for p_action in paths:
             for branch in paths[p_action]:
+                start_state = branch.pop('start_state')
                 # Only finalize top-probability branches to save time/noise
                 if branch['prob'] >= 0.1: 
                     # Replay actions to reconstruct terminal state of the search
-                    state = initial_state.deep_copy()
-                    replay_visited = set()
+                    # (apply_turn copies its input, so the root is never mutated;
+                    # the transposition table hands back the same sampled turns).
+                    # The first turn is the branch's own chance outcome.
+                    state = start_state
+                    replay_visited = {initial_state.get_hash()}
                     
-                    for p_act, a_act in branch['action_log']:
+                    for p_act, a_act in branch['action_log'][1:]:
                         h = state.get_hash()
                         hp = state.ai_active.get('current_hp')
                         # print(f"DEBUG: Replay Hash={h} HP={hp}")
                         replay_visited.add(h)
-                        state, _ = self.engine.apply_turn(state, p_act, a_act)
+                        state, _ = self._successor(h, state, p_act, a_act)
                         
                     # Now extend from this state
                     final_value, extended_path, final_state = self.run_greedy_simulation(state, depth=50, path_log=branch['path'], visited=replay_visited)
                     branch['path'] = extended_path
                     branch['value'] = final_value
 
+        self._deadline = None
+        self._cancel = None
         return {
             'best_action': best_action_history[-1] if best_action_history else None,
             'scores': results,
             'paths': paths,
             'final_depth': final_depth,
-            'status': status
+            'status': status,
+            'converged': status in ("Converged", "Total KO"),
+            'timed_out': status == "Deadline",
+            'elapsed': time.monotonic() - started,
+            'tt': self.tt.stats() if self.tt is not None else None
+        }
+
+    def _search_roots(self, roots, depth: int, root_hash: int, run_id) -> List[Tuple]:
+        """
+        simulate_branch results, in order, for every root branch at this
+        iterative-deepening depth.
+
+        With `workers` > 1 root branch i always goes to worker i % workers.
+        Each worker is a single-process pool that keeps its own engine,
+        scorer and transposition table for the whole run, so deeper
+        iterations reuse its earlier work and a given worker count always
+        produces the same result.
+        """
+        if self.workers <= 1 or len(roots) <= 1:
+            # Start action log with the current turn
+            return [
+                self.simulate_branch(next_state, depth=depth - 1, path_log=[turn_log],
+                                     action_log=[(p_action, ai_action)], visited={root_hash})
+                for p_action, ai_action, _, _, next_state, turn_log in roots
+            ]
+
+        pools = self._worker_pools()
+        settings = self._worker_settings()
+        shares = [[] for _ in self._pools]
+        # root_hash is BattleState.get_hash, which is process-stable, so the
+        # worker's cycle check matches it under any start method
+        for i, (p_action, ai_action, _, _, next_state, turn_log) in enumerate(roots):
+            shares[i % len(shares)].append((next_state, depth - 1, turn_log, p_action, ai_action, root_hash))
+        futures = [
+            pool.submit(_search_branches, run_id, settings, share)
+            for pool, share in zip(pools, shares)
+        ]
+        # Let every worker stop (a deadline aborts them all) before raising
+        wait(futures)
+        done = [future.result() for future in futures]
+        return [done[i % len(shares)][i // len(shares)] for i in range(len(roots))]
+
+    def _worker_pools(self) -> List[ProcessPoolExecutor]:
+        if len(self._pools) != self.workers:
+            self.close()
+            # Engine, rich data and scorer are shipped once per worker
+            context = multiprocessing.get_context(self.worker_start_method)
+            self._pools = [
+                ProcessPoolExecutor(max_workers=1, mp_context=context,
+                                    initializer=_init_worker, initargs=(self.engine, self.ai))
+                for _ in range(self.workers)
+            ]
+        return self._pools
+
+    def _worker_settings(self) -> Dict:
+        return {
+            'chance_mode': self.chance_mode, 'max_outcomes': self.max_outcomes,
+            'roll_buckets': self.roll_buckets, 'seed': self.seed, 'tt_size': self.tt_size,
+            'max_depth': self.max_depth, 'mcts_exploration': self.mcts_exploration,
+            'mcts_rollout_depth': self.mcts_rollout_depth,
+            # CLOCK_MONOTONIC is system-wide, so workers can compare against it directly
+            '_deadline': self._deadline,
+        }
+
+    def _mcts(self, seed) -> MCTS:
+        return MCTS(self, exploration=self.mcts_exploration, rollout_depth=self.mcts_rollout_depth,
+                    max_depth=self.max_depth, seed=seed)
+
+    def _run_mcts(self, initial_state: BattleState, started: float, deadline, progress) -> Dict:
+        """
+        MCTS counterpart of the iterative-deepening loop in run. The most
+        visited root action is recommended; 'scores' are mean values and
+        each action's 'paths' are its sampled AI replies, weighted by
+        visits, with the most-visited line below each.
+        """
+        self._deadline = deadline
+        if self.workers > 1:
+            # Root parallelism: independent trees, statistics summed at the root
+            pools = self._worker_pools()
+            settings = self._worker_settings()
+            share, extra = divmod(self.mcts_iterations, len(pools))
+            futures = [
+                pool.submit(_search_mcts, settings, initial_state, share + (i < extra),
+                            derive_seed(self.seed, 'mcts', i) if self.seed is not None else None)
+                for i, pool in enumerate(pools)
+            ]
+            wait(futures)
+            searched = [future.result() for future in futures]
+        else:
+            mcts = self._mcts(self.seed)
+            report = None
+            if progress is not None:
+                report = lambda root: progress(self._mcts_result([(root_summary(root), mcts.iterations, mcts.nodes, mcts.max_reached)]))
+            root = mcts.search(initial_state, self.mcts_iterations, report)
+            searched = [(root_summary(root), mcts.iterations, mcts.nodes, mcts.max_reached)]
+
+        result = self._mcts_result(searched)
+        if self._cancel is not None and self._cancel.is_set():
+            status = "Cancelled"
+        elif result['iterations'] < self.mcts_iterations:
+            status = "Deadline"
+        else:
+            status = "Playout Budget"
+        self._deadline = None
+        self._cancel = None
+        result.update({
+            'status': status,
+            'converged': False,
+            'timed_out': status == "Deadline",
+            'elapsed': time.monotonic() - started,
+            'tt': self.tt.stats() if self.tt is not None and self.workers <= 1 else None,
+        })
+        return result
+
+    def _mcts_result(self, searched) -> Dict:
+        """Merges (root_summary, iterations, nodes, max depth) tuples into a run() result."""
+        merged = {}
+        for summary, _, _, _ in searched:
+            for p_action, stat in summary.items():
+                into = merged.setdefault(p_action, {'visits': 0, 'value': 0.0, 'branches': {}})
+                into['visits'] += stat['visits']
+                into['value'] += stat['value']
+                for ai_action, branch in stat['branches'].items():
+                    have = into['branches'].get(ai_action)
+                    if have is None:
+                        into['branches'][ai_action] = dict(branch)
+                        continue
+                    if branch['visits'] > have['visits']:
+                        have['path'], have['action_log'] = branch['path'], branch['action_log']
+                    have['visits'] += branch['visits']
+                    have['value'] += branch['value']
+
+        visits = {p: stat['visits'] for p, stat in merged.items()}
+        scores = {p: stat['value'] / stat['visits'] for p, stat in merged.items() if stat['visits']}
+        paths = {}
+        for p_action, stat in merged.items():
+            paths[p_action] = sorted((
+                {
+                    'ai_action': ai_action,
+                    'prob': branch['visits'] / stat['visits'],
+                    'value': branch['value'] / branch['visits'],
+                    'path': branch['path'],
+                    'action_log': branch['action_log'],
+                }
+                for ai_action, branch in stat['branches'].items() if branch['visits']
+            ), key=lambda x: x['prob'], reverse=True)
+        best = max(scores, key=lambda p: (visits[p], scores[p]), default=None)
+        return {
+            'best_action': best,
+            'scores': scores,
+            'visits': visits,
+            'paths': paths,
+            'final_depth': max((depth for _, _, _, depth in searched), default=0),
+            'iterations': sum(n for _, n, _, _ in searched),
+            'nodes': sum(n for _, _, n, _ in searched),
         }
 
     def run_greedy_simulation(self, state: BattleState, depth: int, path_log: List[List[str]], visited: set) -> Tuple[float, List[List[str]], BattleState]:
@@ -125,7 +375,7 @@ class Simulation:
         
         terminal = self.is_total_ko(state)
         # print(f"DEBUG: Greedy Depth={depth} Terminal={terminal}")
-        if depth <= 0 or terminal:
+        if depth <= 0 or terminal or self._should_stop():
             # print("DEBUG: Greedy Terminal reached")
             return self.evaluate_state(state), path_log, state
             
@@ -134,39 +384,28 @@ class Simulation:
              print("DEBUG: No valid actions")
              return self.evaluate_state(state), path_log, state
 
-        # Player picks best action based on immediate evaluation (greedy)
-        # Note: In a forced switch scenario, valid_actions only contains switches.
-        best_p_act = max(valid_actions, key=lambda a: self.evaluate_state(self.engine.apply_turn(state.deep_copy(), a, "Move: Struggle")[0]))
-        
-        ai_probs = self.get_ai_action_probs(state)
-        best_a_act = max(ai_probs, key=ai_probs.get) if ai_probs else "Move: Struggle"
+        entry = self.tt.get(state_hash) if self.tt is not None else None
+        cached = self._cached_best_action(entry, state, valid_actions)
+        if cached:
+            best_p_act, best_a_act = cached
+        else:
+            # Player picks best action based on immediate evaluation (greedy)
+            # Note: In a forced switch scenario, valid_actions only contains switches.
+            best_p_act = max(valid_actions, key=lambda a: self.evaluate_state(self._successor(state_hash, state, a, "Move: Struggle")[0]))
+            
+            ai_probs = self.get_ai_action_probs(state)
+            best_a_act = max(ai_probs, key=ai_probs.get) if ai_probs else "Move: Struggle"
         
-        next_state, turn_log = self.engine.apply_turn(state.deep_copy(), best_p_act, best_a_act)
+        next_state, turn_log = self._successor(state_hash, state, best_p_act, best_a_act)
         return self.run_greedy_simulation(next_state, depth - 1, path_log + [turn_log], visited)
 
+    def _should_stop(self) -> bool:
+        if self._cancel is not None and self._cancel.is_set():
+            return True
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
     def get_ai_action_probs(self, state: BattleState) -> Dict[str, float]:
-        scored = self.ai.score_moves(state, 'ai')
-        matrix = scored.get('matrix', [])
-        move_names = scored.get('moves', [])
-        weights = scored.get('variant_weights', [1.0])
-        if not matrix: return {"Move: Struggle": 1.0}
-        action_probs = {}
-        num_variants = len(weights)
-        for row_idx, scores in enumerate(matrix):
-            v_idx = row_idx % num_variants
-            state_prob = (1.0 / 16.0) * weights[v_idx]
-            if not scores:
-                return {"Move: Struggle": 1.0}
-            max_s = max(scores)
-            winners = [move_names[i] for i, s in enumerate(scores) if s == max_s]
-            prob_per_winner = state_prob / len(winners)
-            for w in winners:
-                if w.startswith("Switch:"):
-                     act = w
-                else:
-                     act = f"Move: {w}"
-                action_probs[act] = action_probs.get(act, 0) + prob_per_winner
-        return {k: v for k, v in action_probs.items() if v > 0.001}
+        return self.ai.action_distribution(state)
 
     def is_total_ko(self, state: BattleState):
         """Checks if an entire party is KO'ed."""
@@ -189,21 +428,92 @@ class Simulation:
         terminal = self.is_total_ko(state)
         if depth <= 0 or terminal:
             return self.evaluate_state(state, depth), path_log, action_log
+        if self._should_stop():
+            raise _SearchStopped()
+
+        entry = self.tt.get(state_hash) if self.tt is not None else None
+        if entry is not None and entry.depth == depth:
+            # Same position, same remaining depth: reuse the whole continuation
+            return entry.value, path_log + entry.path, action_log + entry.actions
             
         valid_actions = self.engine.get_valid_actions(state, 'player')
         if not valid_actions:
              return self.evaluate_state(state, depth), path_log, action_log
 
-        # Greedy selection for the forecast line (player maximizes value)
-        # We need to handle forced switches (valid_actions will only contain switches)
-        best_p_act = max(valid_actions, key=lambda a: self.evaluate_state(self.engine.apply_turn(state.deep_copy(), a, "Move: Struggle")[0], depth))
-        
-        ai_probs = self.get_ai_action_probs(state)
-        # AI maximizes its own score (heuristic)
-        best_a_act = max(ai_probs, key=ai_probs.get) if ai_probs else "Move: Struggle"
+        cached = self._cached_best_action(entry, state, valid_actions)
+        if cached:
+            best_p_act, best_a_act = cached
+        else:
+            # Greedy selection for the forecast line (player maximizes value)
+            # We need to handle forced switches (valid_actions will only contain switches)
+            best_p_act = max(valid_actions, key=lambda a: self.evaluate_state(self._successor(state_hash, state, a, "Move: Struggle")[0], depth))
+            
+            ai_probs = self.get_ai_action_probs(state)
+            # AI maximizes its own score (heuristic)
+            best_a_act = max(ai_probs, key=ai_probs.get) if ai_probs else "Move: Struggle"
         
-        next_state, turn_log = self.engine.apply_turn(state.deep_copy(), best_p_act, best_a_act)
-        return self.simulate_branch(next_state, depth - 1, path_log + [turn_log], action_log + [(best_p_act, best_a_act)], visited)
+        next_state, turn_log = self._successor(state_hash, state, best_p_act, best_a_act)
+        value, full_path, acts = self.simulate_branch(next_state, depth - 1, path_log + [turn_log], action_log + [(best_p_act, best_a_act)], visited)
+
+        if self.tt is not None:
+            self.tt.store(state_hash, TTEntry(
+                depth, value, (best_p_act, best_a_act),
+                full_path[len(path_log):], acts[len(action_log):]
+            ))
+        return value, full_path, acts
+
+    def _successor(self, state_hash, state: BattleState, p_action: str, ai_action: str):
+        """apply_turn, reusing the outcome sampled for this transition earlier in the run."""
+        if self.tt is None:
+            return self._apply(state_hash, state, p_action, ai_action)
+        child = self.tt.get_child(state_hash, p_action, ai_action)
+        if child is None:
+            child = self._apply(state_hash, state, p_action, ai_action)
+            self.tt.store_child(state_hash, p_action, ai_action, child)
+        return child
+
+    def _apply(self, state_hash, state: BattleState, p_action: str, ai_action: str):
+        if self.chance_mode == 'expectimax':
+            # Most likely outcome: deterministic, so transpositions are exact
+            rng = EnumeratingStream(roll_buckets=self.roll_buckets)
+            return self.engine.apply_turn(state, p_action, ai_action, rng=rng)
+        if self.seed is not None:
+            seed = derive_seed(self.seed, state_hash, p_action, ai_action)
+            return self.engine.apply_turn(state, p_action, ai_action, seed=seed)
+        return self.engine.apply_turn(state, p_action, ai_action)
+
+    def _root_outcomes(self, state_hash, state: BattleState, p_action: str, ai_action: str):
+        """
+        [(weight, next_state, turn_log)] for a root transition. The expansion
+        is cached on the instance per root, so deeper iterations reuse it.
+        """
+        if self.chance_mode != 'expectimax':
+            next_state, turn_log = self._successor(state_hash, state, p_action, ai_action)
+            return [(1.0, next_state, turn_log)]
+        key = (state_hash, p_action, ai_action)
+        outcomes = self._root_cache.get(key)
+        if outcomes is None:
+            outcomes = self.engine.apply_turn_distribution(
+                state, p_action, ai_action,
+                max_outcomes=self.max_outcomes, roll_buckets=self.roll_buckets
+            )
+            self._root_cache[key] = outcomes
+        return outcomes
+
+    def _cached_best_action(self, entry: TTEntry, state: BattleState, valid_actions: List[str]):
+        """
+        Best (player, ai) actions stored for this position by any earlier
+        search, if both are still legal. The greedy picks do not depend on
+        the remaining depth, so a shallower result is reusable as is.
+        """
+        if entry is None:
+            return None
+        p_act, a_act = entry.best_action
+        if p_act not in valid_actions:
+            return None
+        if a_act != "Move: Struggle" and a_act not in self.engine.get_valid_actions(state, 'ai'):
+            return None
+        return p_act, a_act
 
     def evaluate_state(self, state: BattleState, depth: int = 0) -> float:
         # Score = (PlayerHP% - AIHP%) + Bonuses
@@ -244,3 +554,110 @@ class Simulation:
         score += (p_party_hp - a_party_hp) * 50
             
         return score
+
+
+class SearchWorker:
+    """
+    Background thread that keeps a Simulation running on the newest state.
+
+    submit() hands over a state and cancels the search in progress; the
+    thread then searches the new state and puts (generation, result)
+    pairs on `results` after every completed depth (partial results have
+    no 'status') and when the search ends. latest() returns the newest
+    result for the current generation, dropping stale ones.
+    """
+
+    def __init__(self, battle_engine: BattleEngine, ai_scorer: AIScorer, time_budget: float = None):
+        # The thread owns this Simulation (and its engine/scorer caches);
+        # don't share the engine or scorer with the submitting thread
+        self.sim = Simulation(battle_engine, ai_scorer)
+        self.time_budget = time_budget
+        self.results = queue.Queue()
+        self.generation = 0
+        self._pending = None
+        self._cancel = threading.Event()
+        self._wake = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._loop, name='search-worker', daemon=True)
+        self._thread.start()
+
+    def submit(self, state: BattleState) -> int:
+        """Searches `state` next, cancelling the current search. Returns its generation."""
+        state = state.deep_copy()
+        with self._wake:
+            self.generation += 1
+            self._pending = (self.generation, state)
+            self._cancel.set()
+            self._wake.notify()
+            return self.generation
+
+    def latest(self):
+        """The newest queued result for the current generation, or None."""
+        found = None
+        while True:
+            try:
+                generation, result = self.results.get_nowait()
+            except queue.Empty:
+                return found
+            if generation == self.generation:
+                found = result
+
+    def close(self, timeout: float = None):
+        with self._wake:
+            self._stopped = True
+            self._cancel.set()
+            self._wake.notify()
+        self._thread.join(timeout)
+        self.sim.close()
+
+    def _loop(self):
+        while True:
+            with self._wake:
+                while self._pending is None and not self._stopped:
+                    self._wake.wait()
+                if self._stopped:
+                    return
+                generation, state = self._pending
+                self._pending = None
+                cancel = self._cancel = threading.Event()
+            publish = lambda result: self.results.put((generation, result))
+            try:
+                result = self.sim.run(state, time_budget=self.time_budget, cancel=cancel, progress=publish)
+            except Exception as e:
+                result = {'error': str(e)}
+            if not cancel.is_set():
+                publish(result)
+
+
+# Worker-process side of Simulation._search_roots
+_worker_sim = None
+
+
+def _init_worker(engine: BattleEngine, ai_scorer: AIScorer):
+    global _worker_sim
+    _worker_sim = Simulation(engine, ai_scorer)
+    _worker_sim._run_id = None
+
+
+def _search_branches(run_id, settings: Dict, tasks: List[Tuple]) -> List[Tuple]:
+    sim = _worker_sim
+    sim.__dict__.update(settings)
+    if sim._run_id != run_id:
+        # New run: fresh table
+        sim.tt = TranspositionTable(sim.tt_size) if sim.tt_size > 0 else None
+        sim._run_id = run_id
+    return [
+        sim.simulate_branch(state, depth=depth, path_log=[turn_log],
+                            action_log=[(p_action, ai_action)], visited={root_hash})
+        for state, depth, turn_log, p_action, ai_action, root_hash in tasks
+    ]
+
+
+def _search_mcts(settings: Dict, state: BattleState, iterations: int, seed) -> Tuple:
+    sim = _worker_sim
+    sim.__dict__.update(settings)
+    sim.tt = TranspositionTable(sim.tt_size) if sim.tt_size > 0 else None
+    sim._run_id = None
+    mcts = sim._mcts(seed)
+    root = mcts.search(state, iterations)
+    return root_summary(root), mcts.iterations, mcts.nodes, mcts.max_reached
@@ -19,20 +19,7 @@ def normalize_keys(obj):
         return obj
 
 
-import os
-
-# Load Maps
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
-def load_json_map(path):
-    p = os.path.join(BASE_DIR, path)
-    if os.path.exists(p):
-        with open(p, 'r') as f:
-            return json.load(f)
-    return {}
-
-ITEMS_MAP = load_json_map("data/item_ids.json")
-SPECIES_MAP = load_json_map("data/species.json")
+from pkh_app.game_data import GAME_DATA
 
 def resolve_ids(obj):
     if isinstance(obj, dict):
@@ -41,8 +28,9 @@ def resolve_ids(obj):
             ival = obj.get('item', obj.get('item_id', obj.get('itemId')))
             if ival is not None:
                 item_val = str(ival)
-                if item_val in ITEMS_MAP:
-                    obj['item'] = ITEMS_MAP[item_val]
+                items_map = GAME_DATA.item_ids
+                if item_val in items_map:
+                    obj['item'] = items_map[item_val]
                 else:
                     obj['item'] = item_val
                 # Harmonize key
@@ -54,10 +42,11 @@ def resolve_ids(obj):
             if sid_val is not None:
                 sid = str(sid_val)
                 obj['species_id'] = sid # Harmonize to string species_id
-                if sid in SPECIES_MAP:
-                    obj['species'] = SPECIES_MAP[sid]
+                species_map = GAME_DATA.species
+                if sid in species_map:
+                    obj['species'] = species_map[sid]
                     if 'name' not in obj or not obj['name']:
-                        obj['name'] = SPECIES_MAP[sid]
+                        obj['name'] = species_map[sid]
         
         # Normalize Stats and Stages
         if 'stats' in obj:
@@ -28,9 +28,10 @@ class StrategyAdvisor:
             new_mon['species'] = name 
         return new_mon
 
-    def run_simulation(self, battle_state_dict):
+    def run_simulation(self, battle_state_dict, time_budget=None):
         """
         Processes a raw battle state dictionary and returns simulation results.
+        time_budget (seconds) bounds the search; see Simulation.run.
         """
         player_active = self.normalize_mon(battle_state_dict.get('player_side', {}).get('active', {}))
         ai_active = self.normalize_mon(battle_state_dict.get('opponent_side', {}).get('active', {}))
@@ -53,4 +54,4 @@ class StrategyAdvisor:
             fields=fields
         )
         
-        return self.sim.run(bs)
+        return self.sim.run(bs, time_budget=time_budget)
@@ -0,0 +1,101 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+class TTEntry:
+    __slots__ = ("depth", "value", "best_action", "path", "actions")
+
+    def __init__(self, depth: int, value: float, best_action: Tuple[str, str],
+                 path: List[List[str]], actions: List[Tuple[str, str]]):
+        self.depth = depth
+        self.value = value
+        self.best_action = best_action
+        # Forecast continuation from this state (turn logs / action pairs)
+        self.path = path
+        self.actions = actions
+
+
+class TranspositionTable:
+    """
+    Bounded state-hash -> TTEntry map for Simulation.
+
+    Replacement is depth-preferred (an entry is only overwritten by a search
+    at least as deep) with LRU eviction once `max_entries` is reached.
+
+    The table also remembers the sampled outcome of each (state, player
+    action, AI action) transition. apply_turn rolls damage/accuracy at
+    random, so without this every iteration of iterative deepening would
+    see different successor states and nothing would transpose.
+    """
+
+    def __init__(self, max_entries: int = 20000):
+        self.max_entries = max_entries
+        self._table: "OrderedDict[int, TTEntry]" = OrderedDict()
+        self._children: "OrderedDict[Tuple[int, str, str], Tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.child_hits = 0
+        self.child_misses = 0
+        self.child_evictions = 0
+
+    def get(self, key: int) -> Optional[TTEntry]:
+        entry = self._table.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._table.move_to_end(key)
+        return entry
+
+    def store(self, key: int, entry: TTEntry):
+        old = self._table.get(key)
+        if old is not None:
+            if entry.depth < old.depth:
+                # Keep the deeper result
+                return
+            self._table[key] = entry
+            self._table.move_to_end(key)
+            return
+        self._table[key] = entry
+        if len(self._table) > self.max_entries:
+            self._table.popitem(last=False)
+            self.evictions += 1
+
+    def get_child(self, key: int, p_action: str, ai_action: str) -> Optional[Tuple]:
+        """(next_state, turn_log) stored for this transition, if any."""
+        child = self._children.get((key, p_action, ai_action))
+        if child is None:
+            self.child_misses += 1
+            return None
+        self.child_hits += 1
+        self._children.move_to_end((key, p_action, ai_action))
+        return child
+
+    def store_child(self, key: int, p_action: str, ai_action: str, child: Tuple):
+        self._children[(key, p_action, ai_action)] = child
+        if len(self._children) > self.max_entries:
+            self._children.popitem(last=False)
+            self.child_evictions += 1
+
+    def clear(self):
+        self._table.clear()
+        self._children.clear()
+        self.hits = self.misses = self.evictions = 0
+        self.child_hits = self.child_misses = self.child_evictions = 0
+
+    def __len__(self):
+        return len(self._table)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._table),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'child_hits': self.child_hits,
+            'child_misses': self.child_misses,
+            'child_evictions': self.child_evictions,
+        }
@@ -0,0 +1,216 @@
+"""
+Type effectiveness shared by the engine, the local damage calc and Mechanics.
+
+TYPE_CHART is the source table. It is compiled at import into integer type
+IDs and a flat attack x defend1 x defend2 table, so a lookup for a
+(mono- or dual-typed) defender is a single index.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Standard Gen 8 Type Chart
+TYPE_CHART = {
+    "Normal": {"Rock": 0.5, "Ghost": 0.0, "Steel": 0.5},
+    "Fire": {
+        "Fire": 0.5,
+        "Water": 0.5,
+        "Grass": 2.0,
+        "Ice": 2.0,
+        "Bug": 2.0,
+        "Rock": 0.5,
+        "Dragon": 0.5,
+        "Steel": 2.0,
+    },
+    "Water": {
+        "Fire": 2.0,
+        "Water": 0.5,
+        "Grass": 0.5,
+        "Ground": 2.0,
+        "Rock": 2.0,
+        "Dragon": 0.5,
+    },
+    "Electric": {
+        "Water": 2.0,
+        "Electric": 0.5,
+        "Grass": 0.5,
+        "Ground": 0.0,
+        "Flying": 2.0,
+        "Dragon": 0.5,
+    },
+    "Grass": {
+        "Fire": 0.5,
+        "Water": 2.0,
+        "Grass": 0.5,
+        "Poison": 0.5,
+        "Ground": 2.0,
+        "Flying": 0.5,
+        "Bug": 0.5,
+        "Rock": 2.0,
+        "Dragon": 0.5,
+        "Steel": 0.5,
+    },
+    "Ice": {
+        "Fire": 0.5,
+        "Water": 0.5,
+        "Grass": 2.0,
+        "Ice": 0.5,
+        "Ground": 2.0,
+        "Flying": 2.0,
+        "Dragon": 2.0,
+        "Steel": 0.5,
+    },
+    "Fighting": {
+        "Normal": 2.0,
+        "Ice": 2.0,
+        "Poison": 0.5,
+        "Flying": 0.5,
+        "Psychic": 0.5,
+        "Bug": 0.5,
+        "Rock": 2.0,
+        "Ghost": 0.0,
+        "Dark": 2.0,
+        "Steel": 2.0,
+        "Fairy": 0.5,
+    },
+    "Poison": {
+        "Grass": 2.0,
+        "Poison": 0.5,
+        "Ground": 0.5,
+        "Rock": 0.5,
+        "Ghost": 0.5,
+        "Steel": 0.0,
+        "Fairy": 2.0,
+    },
+    "Ground": {
+        "Fire": 2.0,
+        "Electric": 2.0,
+        "Grass": 0.5,
+        "Poison": 2.0,
+        "Flying": 0.0,
+        "Bug": 0.5,
+        "Rock": 2.0,
+        "Steel": 2.0,
+    },
+    "Flying": {
+        "Electric": 0.5,
+        "Grass": 2.0,
+        "Fighting": 2.0,
+        "Bug": 2.0,
+        "Rock": 0.5,
+        "Steel": 0.5,
+    },
+    "Psychic": {
+        "Fighting": 2.0,
+        "Poison": 2.0,
+        "Psychic": 0.5,
+        "Dark": 0.0,
+        "Steel": 0.5,
+    },
+    "Bug": {
+        "Fire": 0.5,
+        "Grass": 2.0,
+        "Fighting": 0.5,
+        "Poison": 0.5,
+        "Flying": 0.5,
+        "Psychic": 2.0,
+        "Ghost": 0.5,
+        "Dark": 2.0,
+        "Steel": 0.5,
+        "Fairy": 0.5,
+    },
+    "Rock": {
+        "Fire": 2.0,
+        "Ice": 2.0,
+        "Fighting": 0.5,
+        "Ground": 0.5,
+        "Flying": 2.0,
+        "Bug": 2.0,
+        "Steel": 0.5,
+    },
+    "Ghost": {"Normal": 0.0, "Psychic": 2.0, "Ghost": 2.0, "Dark": 0.5},
+    "Dragon": {"Dragon": 2.0, "Steel": 0.5, "Fairy": 0.0},
+    "Dark": {"Fighting": 0.5, "Psychic": 2.0, "Ghost": 2.0, "Dark": 0.5, "Fairy": 0.5},
+    "Steel": {
+        "Fire": 0.5,
+        "Water": 0.5,
+        "Electric": 0.5,
+        "Ice": 2.0,
+        "Rock": 2.0,
+        "Steel": 0.5,
+        "Fairy": 2.0,
+    },
+    "Fairy": {
+        "Fire": 0.5,
+        "Fighting": 2.0,
+        "Poison": 0.5,
+        "Dragon": 2.0,
+        "Dark": 2.0,
+        "Steel": 0.5,
+    },
+}
+
+TYPES: Tuple[str, ...] = tuple(TYPE_CHART)
+TYPE_ID: Dict[str, int] = {name: i for i, name in enumerate(TYPES)}
+N_TYPES = len(TYPES)
+# Defender slot for "no (second) type" and for types outside the chart
+NO_TYPE = N_TYPES
+_SLOTS = N_TYPES + 1
+
+# Single-type rows, NO_TYPE column included: _SINGLE[atk * _SLOTS + def]
+_SINGLE: List[float] = [
+    TYPE_CHART[a].get(d, 1.0) if d is not None else 1.0
+    for a in TYPES for d in TYPES + (None,)
+]
+# Dual-type products: _DUAL[(atk * _SLOTS + def1) * _SLOTS + def2]
+_DUAL: List[float] = [
+    1.0 * _SINGLE[a * _SLOTS + d1] * _SINGLE[a * _SLOTS + d2]
+    for a in range(N_TYPES) for d1 in range(_SLOTS) for d2 in range(_SLOTS)
+]
+
+
+def type_id(name) -> Optional[int]:
+    """Integer ID of a type, or None if it is not in the chart."""
+    return TYPE_ID.get(name)
+
+
+def defender_ids(defender_types: Sequence[str]) -> Tuple[int, ...]:
+    """Defender types as IDs; unknown types map to NO_TYPE (neutral)."""
+    return tuple(TYPE_ID.get(t, NO_TYPE) for t in defender_types)
+
+
+def effectiveness_ids(atk: int, def_ids: Sequence[int]) -> float:
+    n = len(def_ids)
+    if n == 2:
+        return _DUAL[(atk * _SLOTS + def_ids[0]) * _SLOTS + def_ids[1]]
+    if n == 1:
+        return _DUAL[(atk * _SLOTS + def_ids[0]) * _SLOTS + NO_TYPE]
+    if n == 0:
+        return 1.0
+    # Third type (Forest's Curse / Trick-or-Treat)
+    eff = _DUAL[(atk * _SLOTS + def_ids[0]) * _SLOTS + def_ids[1]]
+    for d in def_ids[2:]:
+        eff *= _SINGLE[atk * _SLOTS + d]
+    return eff
+
+
+def type_effectiveness(move_type, defender_types: Sequence[str]) -> float:
+    """Multiplier of move_type against defender_types (1.0 for unknown move types)."""
+    atk = TYPE_ID.get(move_type)
+    if atk is None:
+        return 1.0
+    return effectiveness_ids(atk, defender_ids(defender_types))
+
+
+def effectiveness_table(move_types: Sequence[str], defenders: Sequence[Sequence[str]]) -> List[List[float]]:
+    """
+    Batched lookup: table[i][j] is move_types[i] against defenders[j].
+    Defender types are resolved to IDs once for the whole batch.
+    """
+    def_ids = [defender_ids(types) for types in defenders]
+    table = []
+    for move_type in move_types:
+        atk = TYPE_ID.get(move_type)
+        if atk is None:
+            table.append([1.0] * len(def_ids))
+        else:
+            table.append([effectiveness_ids(atk, ids) for ids in def_ids])
+    return table
@@ -22,9 +22,15 @@ def debug_calculate_damage(attacker, defender, move_name, move_data, field=None)
     print(f"  STAB: {result['is_stab']}")
     return result
 
-local_damage_calc.calculate_damage = debug_calculate_damage
-
 def test_detailed():
+    # Patched for this test only; other tests call the real calc
+    local_damage_calc.calculate_damage = debug_calculate_damage
+    try:
+        _run_detailed()
+    finally:
+        local_damage_calc.calculate_damage = original_calculate_damage
+
+def _run_detailed():
     state = type('State', (), {'fields': {}, 'player_party': [], 'ai_party': [], 'get_hash': lambda: 0})()
     engine = BattleEngine(state)
     
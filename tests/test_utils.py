@@ -1,12 +1,14 @@
 
 import sys
 import os
+import json
+import subprocess
 from unittest.mock import MagicMock
 
 # Ensure we can import from root
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
 
-from pkh_app.battle_engine import BattleEngine
+from pkh_app.battle_engine import BattleEngine, BattleState
 
 def create_mocked_engine():
     """
@@ -98,3 +100,52 @@ def create_mocked_engine():
         engine.rich_data['items'][id] = {'name': i}
         
     return engine
+
+
+def create_search_mon(name, moves, spe, hp=150):
+    """Plain level-50 Normal-type mon with flat 100 stats (search tests)."""
+    return {'species': name, 'level': 50, 'current_hp': hp, 'max_hp': 150,
+            'stats': {'atk': 100, 'def': 100, 'spa': 100, 'spd': 100, 'spe': spe},
+            'types': ['Normal'], 'ability': 'Pressure', 'item': None,
+            'moves': list(moves), 'status': None, 'volatiles': [], 'stat_stages': {}}
+
+
+def create_search_state(engine, villain_hp=150):
+    """
+    Hero (+ Sidekick in the back) against a lone Villain, enriched with
+    `engine`: the small position the search tests run on.
+    """
+    p = create_search_mon('Hero', ['Tackle', 'Quick Attack'], 100)
+    a = create_search_mon('Villain', ['Tackle', 'Growl'], 90, hp=villain_hp)
+    state = BattleState(p, a, [p, create_search_mon('Sidekick', ['Tackle'], 80)], [a])
+    engine.enrich_state(state)
+    return state
+
+
+_SEARCH_SCRIPT = """
+import json, sys
+from pkh_app.battle_engine import BattleEngine
+from pkh_app.ai_scorer import AIScorer
+from pkh_app.simulation import Simulation
+from tests.test_utils import create_search_state
+engine = BattleEngine()
+sim = Simulation(engine, AIScorer(engine))
+for name, value in json.loads(sys.argv[1]).items():
+    setattr(sim, name, value)
+result = sim.run(create_search_state(engine))
+sim.close()
+print(json.dumps({'best_action': result['best_action'], 'scores': result['scores']}))
+"""
+
+
+def run_search_subprocess(hashseed, **settings):
+    """
+    Runs the create_search_state search in a fresh interpreter with the
+    given PYTHONHASHSEED and Simulation attributes; returns
+    {'best_action', 'scores'}.
+    """
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    env = dict(os.environ, PYTHONHASHSEED=str(hashseed), PYTHONPATH=root)
+    out = subprocess.run([sys.executable, '-c', _SEARCH_SCRIPT, json.dumps(settings)],
+                         cwd=root, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
@@ -0,0 +1,63 @@
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from pkh_app.battle_engine import BattleState
+from pkh_app.ai_scorer import AIScorer
+
+
+class MatchupCalc:
+    """Player hits each defender for a fixed amount; the AI's moves are walled."""
+
+    def __init__(self, damage_to):
+        self.damage_to = damage_to
+        self.batches = 0
+
+    def get_damage_rolls(self, attacker, defender, moves, field):
+        dmg = self.damage_to.get(defender['species'], 0)
+        return [{'moveName': m, 'category': 'Physical', 'damage_rolls': [dmg] * 16} for m in moves]
+
+    def calc_matchups(self, attacker, defenders, moves, field):
+        self.batches += 1
+        return [self.get_damage_rolls(attacker, d, moves, field) for d in defenders]
+
+
+def create_mon(name, spe, hp=100, moves=('Tackle',)):
+    return {'species': name, 'current_hp': hp, 'max_hp': 100, 'moves': list(moves),
+            'stats': {'spe': spe}, 'ability': 'Pressure', 'item': None, 'status': None,
+            'volatiles': [], 'stat_stages': {}}
+
+
+class TestActiveSwitch(unittest.TestCase):
+    def build(self, party, damage_to):
+        ai = create_mon('Villain', 100, moves=('Dream Eater',)) # -20 against an awake target
+        state = BattleState(create_mon('Hero', 100), ai, [create_mon('Hero', 100)], [ai] + party)
+        return state, AIScorer(MatchupCalc(damage_to))
+
+    def switches(self, state, scorer):
+        return [m for m in scorer.action_distribution(state) if m.startswith('Switch:')]
+
+    def test_faster_candidate_must_survive_one_hit(self):
+        state, scorer = self.build([create_mon('Quick', 150)], {'Quick': 100})
+        self.assertEqual(self.switches(state, scorer), [])
+        state, scorer = self.build([create_mon('Quick', 150)], {'Quick': 60})
+        self.assertEqual(self.switches(state, scorer), ['Switch: Quick'])
+        self.assertEqual(scorer.calc_client.batches, 1)
+
+    def test_slower_candidate_must_survive_two_hits(self):
+        state, scorer = self.build([create_mon('Slow', 50)], {'Slow': 60})
+        self.assertEqual(self.switches(state, scorer), [])
+        state, scorer = self.build([create_mon('Slow', 50)], {'Slow': 40})
+        self.assertEqual(self.switches(state, scorer), ['Switch: Slow'])
+
+    def test_seen_faster_bug(self):
+        # After one faster mon every later mon is treated as faster (OHKO check only)
+        party = [create_mon('Quick', 150), create_mon('Slow', 50)]
+        state, scorer = self.build(party, {'Quick': 100, 'Slow': 60})
+        self.assertEqual(len(self.switches(state, scorer)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from pkh_app.battle_engine import BattleEngine
+from pkh_app.ai_scorer import AIScorer
+from pkh_app.simulation import Simulation
+from tests.test_utils import create_search_state
+
+
+class TestAnytimeSearch(unittest.TestCase):
+    def setUp(self):
+        self.engine = BattleEngine()
+        self.state = create_search_state(self.engine)
+
+    def search(self, time_budget=None):
+        sim = Simulation(self.engine, AIScorer(self.engine))
+        sim.max_depth = 6
+        return sim.run(self.state, time_budget=time_budget)
+
+    def test_expired_budget_returns_depth_one(self):
+        result = self.search(time_budget=0)
+        self.assertEqual(result['status'], 'Deadline')
+        self.assertEqual(result['final_depth'], 1)
+        self.assertTrue(result['timed_out'])
+        self.assertFalse(result['converged'])
+        self.assertIn(result['best_action'], result['scores'])
+
+    def test_generous_budget_matches_unbounded(self):
+        unbounded = self.search()
+        bounded = self.search(time_budget=60)
+        self.assertFalse(bounded['timed_out'])
+        self.assertEqual(bounded['converged'], unbounded['status'] in ('Converged', 'Total KO'))
+        for key in ('best_action', 'scores', 'paths', 'final_depth', 'status'):
+            self.assertEqual(bounded[key], unbounded[key])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import sys
+import os
+import threading
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from pkh_app.battle_engine import BattleEngine, BattleState
+from pkh_app.mechanics import Mechanics
+from tests.test_utils import run_search_subprocess
+from pkh_app.battle_engine.chance import (
+    ChanceStream, EnumeratingStream, RandomStream, bucket_rolls, derive_seed, enumerate_outcomes,
+)
+
+
+def create_mon(name, moves=('Tackle',)):
+    return {'species': name, 'level': 50, 'current_hp': 300, 'max_hp': 300,
+            'stats': {'atk': 100, 'def': 100, 'spa': 100, 'spd': 100, 'spe': 100},
+            'types': ['Normal'], 'ability': 'Pressure', 'item': None,
+            'moves': list(moves), 'status': None, 'volatiles': [], 'stat_stages': {}}
+
+
+class TestChanceStream(unittest.TestCase):
+    def test_bucket_rolls(self):
+        self.assertEqual(bucket_rolls([5, 5, 7, 7], 3), [(5, 0.5), (7, 0.5)])
+        buckets = bucket_rolls(list(range(85, 101)), 3)
+        self.assertEqual(len(buckets), 3)
+        self.assertAlmostEqual(sum(w for _, w in buckets), 1.0)
+        self.assertEqual([v for v, _ in buckets], sorted(v for v, _ in buckets))
+
+    def test_incomplete_stream_fails_on_construction(self):
+        class CoinOnly(ChanceStream):
+            def chance(self, p):
+                return True
+        with self.assertRaises(TypeError):
+            CoinOnly()
+
+    def test_enumerating_stream_takes_most_likely_branch(self):
+        stream = EnumeratingStream()
+        self.assertFalse(stream.chance(0.1))
+        self.assertEqual(stream.weighted([('a', 0.2), ('b', 0.8)]), 'b')
+        self.assertEqual(len(stream.trace), 2)
+        # Certain events are not chance nodes
+        self.assertTrue(stream.chance(1.0))
+        self.assertEqual(len(stream.trace), 2)
+
+    def test_enumerate_outcomes(self):
+        def run(stream):
+            return (stream.chance(0.25), stream.choice(['x', 'y']))
+
+        outcomes, explored = enumerate_outcomes(run, max_outcomes=10)
+        self.assertEqual(len(outcomes), 4)
+        self.assertAlmostEqual(explored, 1.0)
+        probs = dict((o, p) for p, o in outcomes)
+        self.assertAlmostEqual(probs[(True, 'x')], 0.125)
+        self.assertAlmostEqual(probs[(False, 'y')], 0.375)
+        # Most likely first, capped
+        capped, mass = enumerate_outcomes(run, max_outcomes=2)
+        self.assertEqual([o for _, o in capped], [(False, 'x'), (False, 'y')])
+        self.assertAlmostEqual(mass, 0.75)
+
+
+class TestSeededStream(unittest.TestCase):
+    def test_seed_is_reproducible(self):
+        a, b = RandomStream(7), RandomStream(7)
+        self.assertEqual([a.randint(0, 1000) for _ in range(5)], [b.randint(0, 1000) for _ in range(5)])
+
+    def test_spawned_streams_are_independent(self):
+        root = RandomStream(7)
+        w0, w1 = root.spawn(0), root.spawn(1)
+        self.assertEqual(w0.seed, derive_seed(7, 0))
+        self.assertNotEqual(w0.seed, w1.seed)
+        self.assertNotEqual([w0.randint(0, 10 ** 6) for _ in range(3)],
+                            [w1.randint(0, 10 ** 6) for _ in range(3)])
+        self.assertIsNone(RandomStream().spawn(0).seed)
+
+
+class TestApplyTurnDistribution(unittest.TestCase):
+    def setUp(self):
+        self.engine = BattleEngine()
+        p = create_mon('Attacker')
+        a = create_mon('Defender')
+        self.state = BattleState(p, a, [p], [a])
+
+    def test_probabilities_sum_to_one(self):
+        outcomes = self.engine.apply_turn_distribution(
+            self.state, 'Move: Tackle', 'Move: Tackle', max_outcomes=6)
+        self.assertGreaterEqual(len(outcomes), 1)
+        self.assertLessEqual(len(outcomes), 6)
+        self.assertAlmostEqual(sum(p for p, _, _ in outcomes), 1.0)
+        probs = [p for p, _, _ in outcomes]
+        self.assertEqual(probs, sorted(probs, reverse=True))
+        # Outcomes are distinct states
+        self.assertEqual(len({s.get_hash() for _, s, _ in outcomes}), len(outcomes))
+        # Input is never mutated
+        self.assertEqual(self.state.ai_active['current_hp'], 300)
+
+    def test_seeded_turn_is_reproducible(self):
+        self.state.player_active['status'] = 'par'
+        self.state.player_active['volatiles'].append('confusion')
+        runs = [self.engine.apply_turn(self.state, 'Move: Tackle', 'Move: Tackle', seed=42)
+                for _ in range(3)]
+        for new_state, log in runs[1:]:
+            self.assertEqual(log, runs[0][1])
+            self.assertEqual(new_state.get_hash(), runs[0][0].get_hash())
+
+    def test_seeded_search_is_process_stable(self):
+        # State keys (and the seeds derived from them) must not depend on
+        # the per-process string hash salt
+        settings = {'chance_mode': 'sample', 'seed': 42, 'max_depth': 4}
+        self.assertEqual(run_search_subprocess(1, **settings), run_search_subprocess(2, **settings))
+
+    def test_engine_rng_is_restored(self):
+        rng = self.engine.rng
+        stream = EnumeratingStream()
+        self.engine.apply_turn(self.state, 'Move: Tackle', 'Move: Tackle', rng=stream)
+        self.assertIs(self.engine.rng, rng)
+        self.assertIs(self.engine.triggers.rng, rng)
+        self.assertTrue(stream.trace)
+
+    def test_turn_stream_is_thread_local(self):
+        engine, seen = self.engine, []
+
+        class Probe(EnumeratingStream):
+            def chance(self, p):
+                # Another thread looks at the engine mid-turn
+                if not seen:
+                    t = threading.Thread(target=lambda: seen.append(
+                        (Mechanics.turn_rng(), engine.rng, engine.triggers.rng)))
+                    t.start()
+                    t.join()
+                return super().chance(p)
+
+        stream = Probe()
+        self.engine.apply_turn(self.state, 'Move: Tackle', 'Move: Tackle', rng=stream)
+        self.assertEqual(seen, [(None, engine.rng, engine.rng)])
+        self.assertIsNot(engine.rng, stream)
+
+
+if __name__ == '__main__':
+    unittest.main()
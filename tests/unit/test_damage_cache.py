@@ -0,0 +1,88 @@
+import sys
+import os
+import importlib
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from pkh_app.battle_engine import BattleEngine, BattleState
+from pkh_app import local_damage_calc
+
+
+def create_mon(name, ability='Pressure', types=('Normal',)):
+    return {'species': name, 'level': 50, 'current_hp': 200, 'max_hp': 200,
+            'stats': {'atk': 120, 'def': 100, 'spa': 100, 'spd': 100, 'spe': 100},
+            'types': list(types), 'ability': ability, 'item': None,
+            'moves': ['Tackle', 'Dragon Claw'], 'status': None, 'volatiles': [], 'stat_stages': {}}
+
+
+class TestDamageCache(unittest.TestCase):
+    def setUp(self):
+        # Other test modules replace calculate_damage at import time; use the real one
+        self.addCleanup(setattr, local_damage_calc, 'calculate_damage', local_damage_calc.calculate_damage)
+        importlib.reload(local_damage_calc)
+        self.engine = BattleEngine()
+        self.calc = self.engine.damage_calculator
+        self.calc.clear_cache()
+        state = BattleState(create_mon('Attacker'), create_mon('Defender', ability='Multiscale', types=('Dragon',)), [], [])
+        self.engine.enrich_state(state)
+        self.attacker, self.defender = state.player_active, state.ai_active
+
+    def rolls(self, move='Dragon Claw'):
+        return self.calc.calc_damage_for_moves(self.attacker, self.defender, [move], {})[0]['damage_rolls']
+
+    def test_hits_match_fresh_calc(self):
+        first = self.rolls()
+        second = self.rolls()
+        self.assertEqual(first, second)
+        stats = self.calc.cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+        self.calc.cache_size = 0
+        self.assertEqual(self.rolls(), first)
+
+    def test_results_are_isolated(self):
+        self.rolls().append(-1)
+        self.assertNotIn(-1, self.rolls())
+
+    def test_stat_and_hp_threshold_changes_invalidate(self):
+        base = self.rolls()
+        self.attacker['stat_stages']['atk'] = 2
+        boosted = self.rolls()
+        self.assertGreater(max(boosted), max(base))
+        self.attacker['stat_stages']['atk'] = 0
+
+        # Multiscale only halves damage at full HP
+        self.defender['current_hp'] = 150
+        hurt = self.rolls()
+        self.assertGreater(max(hurt), max(base))
+        self.assertEqual(self.calc.cache_stats()['hits'], 0)
+        self.calc.cache_size = 0
+        self.assertEqual(hurt, self.rolls())
+
+        # Another HP inside the same threshold band reuses the entry
+        self.calc.cache_size = 4096
+        self.defender['current_hp'] = 120
+        self.assertEqual(self.rolls(), hurt)
+        self.assertEqual(self.calc.cache_stats()['hits'], 1)
+
+    def test_matchups_match_single_calcs(self):
+        other = create_mon('Other', types=('Steel',))
+        defenders = [self.defender, other]
+        batch = self.calc.calc_matchups(self.attacker, defenders, ['Tackle', 'Dragon Claw'], {})
+        self.calc.cache_size = 0
+        for defender, results in zip(defenders, batch):
+            single = self.calc.calc_damage_for_moves(self.attacker, defender, ['Tackle', 'Dragon Claw'], {})
+            self.assertEqual([r['damage_rolls'] for r in results], [r['damage_rolls'] for r in single])
+
+    def test_lru_eviction(self):
+        self.calc.cache_size = 1
+        self.rolls('Tackle')
+        self.rolls('Dragon Claw')
+        self.assertEqual(self.calc.cache_stats()['evictions'], 1)
+        self.rolls('Tackle')
+        self.assertEqual(self.calc.cache_stats()['hits'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
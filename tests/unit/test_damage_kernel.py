@@ -0,0 +1,54 @@
+import sys
+import os
+import itertools
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from pkh_app.local_damage_calc import damage_roll_kernel, get_weather_multiplier
+
+
+def reference_rolls(base_calc, stab_mult, effectiveness, final_mod, weather_mult, min_one):
+    # Per-roll loop the kernel replaces
+    rolls, crits = [], []
+    for roll in range(85, 101):
+        r = (base_calc * roll) // 100
+        if stab_mult is not None:
+            r = int(r * stab_mult)
+        r = int(r * effectiveness)
+        r = int(r * final_mod)
+        if weather_mult is not None:
+            r = int(r * weather_mult)
+        if min_one and r < 1:
+            r = 1
+        rolls.append(r)
+        c = int(r * 1.5)
+        if effectiveness > 0 and c < 1:
+            c = 1
+        crits.append(c)
+    return rolls, crits
+
+
+class TestDamageRollKernel(unittest.TestCase):
+    def test_matches_per_roll_loop(self):
+        grid = itertools.product(
+            (1, 2, 37, 151, 999),
+            (None, 1.5, 2.0),
+            (0, 0.25, 0.5, 1.0, 2.0, 4.0),
+            (0.5, 0.75, 1.0, 1.3, 1.5),
+            (None, 0.5, 1.5),
+        )
+        for base, stab, eff, mod, weather in grid:
+            args = (base, stab, eff, mod, weather, eff > 0 and mod > 0)
+            self.assertEqual(damage_roll_kernel(*args), reference_rolls(*args), args)
+
+    def test_weather_multiplier(self):
+        plain = {'ability': 'Pressure'}
+        self.assertEqual(get_weather_multiplier('Rain', 'Water', plain, plain), 1.5)
+        self.assertEqual(get_weather_multiplier('Sunny Day', 'Water', plain, plain), 0.5)
+        self.assertIsNone(get_weather_multiplier('Sand', 'Water', plain, plain))
+        self.assertIsNone(get_weather_multiplier('Rain', 'Water', plain, {'ability': 'Air Lock'}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from pkh_app.game_data import GAME_DATA, GameData, slugify, species_slugify
+from pkh_app.battle_engine import BattleEngine, BattleState
+from pkh_app.mechanics import Mechanics
+from tests.test_utils import create_search_mon
+
+
+class TestGameData(unittest.TestCase):
+    def test_tables_load_once(self):
+        data = GameData(use_bundle=False)
+        self.assertEqual(data.loaded(), [])
+        dex = data.pokedex
+        self.assertIs(data.pokedex, dex)
+        self.assertEqual(data.loaded(), ['pokedex'])
+        self.assertIn('garchomp', dex)
+
+    def test_missing_file_is_empty(self):
+        data = GameData(data_dir=os.path.dirname(__file__))
+        with self.assertLogs(level='WARNING'):
+            self.assertEqual(data.moves, {})
+
+    def test_bundle_invalidated_by_content(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        for filename in GameData.FILES.values():
+            shutil.copy(os.path.join(GAME_DATA.data_dir, filename), tmp)
+        GameData(tmp).get('moves')
+        self.assertTrue(GameData(tmp).bundle_is_fresh())
+
+        # A fresh bundle serves every table without parsing JSON
+        data = GameData(tmp)
+        with mock.patch('pkh_app.game_data.json.load', side_effect=AssertionError):
+            self.assertEqual(data.species, GAME_DATA.species)
+        self.assertEqual(data.loaded(), sorted(GameData.FILES))
+
+        # Touching a file keeps it valid; editing one rebuilds the bundle
+        moves_path = os.path.join(tmp, 'moves.json')
+        os.utime(moves_path, ns=(0, 0))
+        self.assertTrue(GameData(tmp).bundle_is_fresh())
+        # ...and re-stamps it, so the next load does not hash the sources
+        with mock.patch.object(GameData, 'source_hash', side_effect=AssertionError):
+            self.assertEqual(GameData(tmp).moves, GAME_DATA.moves)
+        with open(moves_path, 'w') as f:
+            f.write('{"1": "Pound"}')
+        self.assertFalse(GameData(tmp).bundle_is_fresh())
+        self.assertEqual(GameData(tmp).moves, {'1': 'Pound'})
+        self.assertTrue(GameData(tmp).bundle_is_fresh())
+
+    def test_corrupt_source_skips_bundle(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        for filename in GameData.FILES.values():
+            shutil.copy(os.path.join(GAME_DATA.data_dir, filename), tmp)
+        with open(os.path.join(tmp, 'item_ids.json'), 'w') as f:
+            f.write('{"1": ')
+        data = GameData(tmp)
+        with self.assertLogs(level='WARNING'):
+            self.assertEqual(data.species, GAME_DATA.species)
+            self.assertEqual(data.item_ids, {})
+        self.assertFalse(os.path.exists(data.bundle_path))
+
+    def test_engines_share_records(self):
+        e1, e2 = BattleEngine(), BattleEngine()
+        self.assertIs(e1.rich_data['moves']['tackle'], GAME_DATA.mechanics['moves']['tackle'])
+        self.assertIs(e1.pokedex['garchomp'], e2.pokedex['garchomp'])
+        # Table edits stay local to the engine
+        e1.rich_data['moves']['tackle'] = {'name': 'Tackle', 'basePower': 999}
+        self.assertIsNot(e2.rich_data['moves']['tackle'], e1.rich_data['moves']['tackle'])
+        self.assertNotEqual(GAME_DATA.mechanics['moves']['tackle'].get('basePower'), 999)
+
+    def test_turns_leave_shared_records_alone(self):
+        e1, e2 = BattleEngine(), BattleEngine()
+        record = GAME_DATA.mechanics['moves']['lowkick']
+        base_power = record.get('basePower')
+        p = create_search_mon('Hitmonlee', ['Low Kick'], 100)
+        a = create_search_mon('Snorlax', ['Tackle'], 30)
+        state = BattleState(p, a, [p], [a])
+        e1.enrich_state(state)
+        _, log = e1.apply_turn(state, 'Move: Low Kick', 'Move: Tackle', seed=1)
+        self.assertTrue(any('Low Kick' in line for line in log))
+        # Weight-based power stays local to the turn
+        self.assertEqual(record.get('basePower'), base_power)
+        self.assertIs(e2._get_mechanic('Low Kick', 'moves'), record)
+
+    def test_slugs_are_interned(self):
+        self.assertEqual(slugify("King's Rock"), 'kingsrock')
+        self.assertIs(slugify('Will-O-Wisp'), slugify('Will-O-Wisp'))
+        self.assertEqual(species_slugify("Farfetch'd"), "farfetch'd")
+        self.assertEqual(slugify(['Tackle']), '[tackle]')  # unhashable: not memoized
+
+    def test_name_index(self):
+        moves = GAME_DATA.index('moves')
+        self.assertEqual(moves.id('Tackle'), 33)
+        self.assertEqual((moves.slug(33), moves.name(33)), ('tackle', 'Tackle'))
+        self.assertIs(moves.record('Tackle'), GAME_DATA.mechanics['moves']['tackle'])
+        self.assertIs(GAME_DATA.index('moves'), moves)
+
+        species = GAME_DATA.index('species')
+        self.assertEqual(species.name(445), 'Garchomp')
+        self.assertIs(species.record('Garchomp'), GAME_DATA.pokedex['garchomp'])
+
+        # No ROM ID table: abilities are numbered in record order
+        abilities = GAME_DATA.index('abilities')
+        self.assertEqual(abilities.name(abilities.id('Intimidate')), 'Intimidate')
+        self.assertIsNone(abilities.id('Not An Ability'))
+
+    def test_engine_lookups_use_index(self):
+        e1, e2 = BattleEngine(), BattleEngine()
+        tackle = GAME_DATA.index('moves').record('Tackle')
+        self.assertIs(e1._get_mechanic('Tackle', 'moves'), tackle)
+        self.assertIs(e1.registry.get('moves', 33), tackle)  # ROM move ID
+
+        # The engine's own table layers over the shared records
+        override = {'name': 'Tackle', 'basePower': 999}
+        e1.rich_data['moves']['tackle'] = override
+        self.assertIs(e1._get_mechanic(33, 'moves'), override)
+        self.assertIs(e1.triggers._get_mechanic('Tackle', 'moves'), override)
+        self.assertIs(e2.triggers._get_mechanic('Tackle', 'moves'), tackle)
+        self.assertEqual(e1.triggers._check_mechanic('Tackle', 'moves', 'basePower'), 999)
+
+    def test_get_mon_data(self):
+        self.assertIs(Mechanics.get_mon_data('Mr. Mime'), GAME_DATA.pokedex['mrmime'])
+        self.assertEqual(Mechanics.get_mon_data('Missingno'), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
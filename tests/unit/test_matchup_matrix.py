@@ -0,0 +1,93 @@
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from pkh_app.ai_logic import MatchupMatrix, SwitchPredictor
+
+
+class FieldAwareCalc:
+    """Damage doubles in rain; records which fields it was called with."""
+
+    def __init__(self):
+        self.fields = []
+        self.batches = 0
+
+    def get_damage_rolls(self, attacker, defender, moves, field):
+        self.fields.append(field)
+        base = attacker['stats']['atk'] * (2 if field.get('weather') == 'Rain' else 1)
+        base += 10 * (attacker.get('stat_stages') or {}).get('atk', 0)
+        return [{'moveName': m, 'damage_rolls': [base - 5, base]} for m in moves]
+
+    def calc_matchups(self, attacker, defenders, moves, field):
+        self.batches += 1
+        return [self.get_damage_rolls(attacker, d, moves, field) for d in defenders]
+
+    def calc_attackers(self, attackers, defender, field):
+        self.batches += 1
+        return [self.get_damage_rolls(a, defender, a['moves'], field) for a in attackers]
+
+
+def create_mon(name, atk, spe, hp=100):
+    return {'species': name, 'current_hp': hp, 'max_hp': 100, 'moves': ['Tackle'],
+            'stats': {'atk': atk, 'spe': spe}, 'stat_stages': {}, 'volatiles': []}
+
+
+class TestMatchupMatrix(unittest.TestCase):
+    def setUp(self):
+        self.calc = FieldAwareCalc()
+        self.player = create_mon('Hero', 50, 100)
+        self.team = [create_mon('Slow', 40, 50), create_mon('Quick', 30, 150), create_mon('Down', 10, 10, hp=0)]
+
+    def test_rows_and_incremental_updates(self):
+        m = MatchupMatrix(self.calc).update(self.team, self.player, {})
+        self.assertEqual((m.dealt(0), m.taken(0)), (40, 50))
+        self.assertEqual(m.rows_computed, 2)
+        self.assertEqual(self.calc.batches, 2)
+
+        m.update(self.team, self.player, {})
+        self.assertEqual(m.rows_computed, 2)
+
+        # Only the boosted member is recomputed
+        self.team[1]['stat_stages']['atk'] = 1
+        m.update(self.team, self.player, {})
+        self.assertEqual(m.rows_computed, 3)
+        self.assertEqual(m.dealt(1), 40)
+
+        # Field or player changes invalidate every row
+        m.update(self.team, self.player, {'weather': 'Rain'})
+        self.assertEqual(m.rows_computed, 5)
+        self.assertEqual(m.taken(0), 100)
+
+    def test_player_hp_only_matters_to_hp_moves(self):
+        self.player['current_hp'] = 90
+        m = MatchupMatrix(self.calc).update(self.team, self.player, {})
+        # Chip damage that crosses no HP threshold keeps every row
+        self.player['current_hp'] = 80
+        m.update(self.team, self.player, {})
+        self.assertEqual(m.rows_computed, 2)
+        # Once a candidate knows Super Fang, exact player HP is part of the key
+        self.team[0]['moves'] = ['Tackle', 'Super Fang']
+        m.update(self.team, self.player, {})
+        self.assertEqual(m.rows_computed, 4)
+        self.player['current_hp'] = 70
+        m.update(self.team, self.player, {})
+        self.assertEqual(m.rows_computed, 6)
+
+    def test_rows_keyed_by_slot(self):
+        team = [create_mon('Twin', 40, 50), create_mon('Twin', 20, 50)]
+        m = MatchupMatrix(self.calc).update(team, self.player, {})
+        self.assertEqual((m.dealt(0), m.dealt(1)), (40, 20))
+
+    def test_predict_switch_uses_field(self):
+        predictor = SwitchPredictor()
+        best, _ = predictor.predict_switch(self.team, self.player, self.calc)
+        self.assertEqual(best['species'], 'Quick')
+        field = {'weather': 'Rain'}
+        predictor.predict_switch(self.team, self.player, self.calc, field)
+        self.assertIs(self.calc.fields[-1], field)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from pkh_app.battle_engine import BattleEngine
+from pkh_app.ai_scorer import AIScorer
+from pkh_app.simulation import Simulation
+from tests.test_utils import create_search_state
+
+
+class TestMCTS(unittest.TestCase):
+    def setUp(self):
+        self.engine = BattleEngine()
+        self.state = create_search_state(self.engine, villain_hp=30)
+
+    def search(self, iterations=60, time_budget=None, workers=0):
+        sim = Simulation(self.engine, AIScorer(self.engine))
+        sim.search_mode = 'mcts'
+        sim.mcts_iterations = iterations
+        sim.seed = 7
+        sim.workers = workers
+        self.addCleanup(sim.close)
+        return sim.run(self.state, time_budget=time_budget)
+
+    def test_playout_budget_and_visits(self):
+        result = self.search()
+        self.assertEqual(result['status'], 'Playout Budget')
+        self.assertEqual(result['iterations'], 60)
+        # The root plus at most one node per playout
+        self.assertLessEqual(result['nodes'], 61)
+        self.assertEqual(sum(result['visits'].values()), 60)
+        self.assertEqual(set(result['visits']), set(result['scores']))
+        self.assertEqual(result['best_action'], max(result['visits'], key=result['visits'].get))
+        # Villain is at 30 HP: attacking beats switching out
+        self.assertTrue(result['best_action'].startswith('Move:'))
+        for branches in result['paths'].values():
+            self.assertAlmostEqual(sum(b['prob'] for b in branches), 1.0)
+
+    def test_seeded_runs_repeat(self):
+        first = self.search()
+        second = self.search()
+        self.assertEqual(first['visits'], second['visits'])
+        self.assertEqual(first['scores'], second['scores'])
+
+    def test_time_budget_tries_every_root_action(self):
+        result = self.search(iterations=10000, time_budget=0)
+        self.assertEqual(result['status'], 'Deadline')
+        self.assertTrue(result['timed_out'])
+        self.assertEqual(result['iterations'], len(result['visits']))
+        self.assertTrue(all(v == 1 for v in result['visits'].values()))
+
+    def test_root_parallel_sums_visits(self):
+        result = self.search(iterations=41, workers=2)
+        self.assertEqual(result['iterations'], 41)
+        self.assertEqual(sum(result['visits'].values()), 41)
+        self.assertEqual(self.search(iterations=41, workers=2)['visits'], result['visits'])
+
+
+if __name__ == '__main__':
+    unittest.main()
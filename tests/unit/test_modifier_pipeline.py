@@ -0,0 +1,65 @@
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from pkh_app.mechanics import Mechanics
+from pkh_app.local_damage_calc import calculate_damage
+
+
+TECHNICIAN = {'name': 'Technician', 'onBasePower': 1.5}
+MULTISCALE = {'name': 'Multiscale'}
+CHARCOAL = {'name': 'Charcoal', 'onBasePower': 1.2, 'triggerType': 'Fire'}
+
+
+def create_mon(ability, rich_ab, rich_item=None, hp=100):
+    return {'species': 'Hero', 'ability': ability, '_rich_ability': rich_ab,
+            'item': rich_item and rich_item['name'], '_rich_item': rich_item,
+            'current_hp': hp, 'max_hp': 100}
+
+
+class TestModifierPipeline(unittest.TestCase):
+    def test_compiled_once_per_record(self):
+        steps, post = Mechanics.compile_modifiers(TECHNICIAN)
+        self.assertIs(Mechanics.compile_modifiers(TECHNICIAN)[0], steps)
+        self.assertEqual([mult for _, mult in steps['onBasePower']], [1.5])
+        self.assertEqual(post, ())
+        self.assertEqual(len(Mechanics.compile_modifiers(MULTISCALE)[1]), 1)
+
+    def test_conditions_gate_steps(self):
+        mon = create_mon('Technician', TECHNICIAN, CHARCOAL)
+        ember = {'name': 'Ember', 'type': 'Fire', 'basePower': 40}
+        flamethrower = {'name': 'Flamethrower', 'type': 'Fire', 'basePower': 90}
+        tackle = {'name': 'Tackle', 'type': 'Normal', 'basePower': 40}
+        self.assertAlmostEqual(Mechanics.get_modifier(mon, 'onBasePower', ember), 1.5 * 1.2)
+        self.assertAlmostEqual(Mechanics.get_modifier(mon, 'onBasePower', flamethrower), 1.2)
+        self.assertAlmostEqual(Mechanics.get_modifier(mon, 'onBasePower', tackle), 1.5)
+        mon['ability'] = 'Klutz'
+        self.assertAlmostEqual(Mechanics.get_modifier(mon, 'onBasePower', ember), 1.5)
+
+    def test_defensive_steps(self):
+        tackle = {'name': 'Tackle', 'type': 'Normal', 'basePower': 40}
+        full = create_mon('Multiscale', MULTISCALE)
+        self.assertEqual(Mechanics.get_modifier(full, 'onSourceModifyDamage', tackle), 0.5)
+        hurt = create_mon('Multiscale', MULTISCALE, hp=60)
+        self.assertEqual(Mechanics.get_modifier(hurt, 'onSourceModifyDamage', tackle), 1.0)
+
+    def test_technician_sees_turn_power(self):
+        low_kick = {'name': 'Low Kick', 'type': 'Fighting', 'category': 'Physical', 'basePower': 0}
+        defender = {'species': 'Snorlax', 'types': ['Normal'], 'current_hp': 100, 'max_hp': 100,
+                    'stats': {'def': 100}, 'stat_stages': {}}
+
+        def damage(ability, power):
+            attacker = dict(create_mon(ability, TECHNICIAN if ability == 'Technician' else None),
+                            level=50, types=['Fighting'], stats={'atk': 100}, stat_stages={})
+            return calculate_damage(attacker, defender, 'Low Kick', low_kick, {},
+                                    move_bp_override=power)['damage_rolls']
+
+        self.assertEqual(damage('Technician', 120), damage('Pressure', 120))
+        self.assertGreater(max(damage('Technician', 40)), max(damage('Pressure', 40)))
+        self.assertEqual(low_kick['basePower'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
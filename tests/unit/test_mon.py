@@ -0,0 +1,165 @@
+import sys
+import os
+import pickle
+import threading
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from pkh_app.battle_engine import BattleState, Mon, StatBlock, VolatileSet
+from pkh_app.battle_engine.mon import volatile_bit
+from pkh_app.mechanics import Mechanics
+
+
+class TestMon(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            'species': 'Garchomp', 'current_hp': 150, 'max_hp': 183,
+            'stats': {'atk': 150, 'spe': 122}, 'stat_stages': {'atk': 2},
+            'volatiles': ['confusion'], 'types': ['Dragon', 'Ground'],
+            'moves': ['Earthquake'], 'protect_counter': 1,
+            '_rich_ability': {'name': 'Rough Skin'},
+        }
+        self.mon = Mon(self.data)
+
+    def test_dict_api(self):
+        mon = self.mon
+        self.assertEqual(mon, self.data)
+        self.assertEqual(mon['current_hp'], 150)
+        self.assertIsNone(mon.get('status'))
+        self.assertEqual(mon.get('item', 'none'), 'none')
+        self.assertNotIn('item', mon)
+        self.assertIn('protect_counter', mon)
+        with self.assertRaises(KeyError):
+            mon['item']
+        mon['item'] = 'Life Orb'
+        self.assertEqual(mon.pop('item'), 'Life Orb')
+        self.assertEqual(mon.setdefault('flinch', False), False)
+        self.assertEqual(mon.to_dict()['stats'], {'atk': 150, 'spe': 122})
+
+    def test_compact_containers(self):
+        mon = self.mon
+        self.assertIsInstance(mon['stat_stages'], StatBlock)
+        self.assertIsInstance(mon['volatiles'], VolatileSet)
+        mon['stat_stages']['spe'] = -1
+        self.assertEqual(mon['stat_stages'].get('spe', 0), -1)
+        self.assertEqual(mon['stat_stages'].get('def', 0), 0)
+        mon['volatiles'].append('taunt')
+        mon['volatiles'].remove('confusion')
+        self.assertEqual(list(mon['volatiles']), ['taunt'])
+        with self.assertRaises(ValueError):
+            mon['volatiles'].remove('confusion')
+        # Replacing with plain containers keeps the compact layout
+        mon['stat_stages'] = {}
+        mon['volatiles'] = []
+        self.assertIsInstance(mon['stat_stages'], StatBlock)
+        self.assertFalse(mon['volatiles'])
+
+    def test_effective_stat_matches_dict(self):
+        field = {'weather': None}
+        for stat in ('atk', 'spe', 'def'):
+            self.assertEqual(
+                Mechanics.get_effective_stat(self.mon, stat, field),
+                Mechanics.get_effective_stat(self.data, stat, field),
+            )
+
+    def test_effective_stat_cache_invalidation(self):
+        mon = self.mon
+        Mechanics.reset_stat_cache_stats()
+        self.assertEqual(Mechanics.get_effective_stat(mon, 'atk'), 300)
+        self.assertEqual(Mechanics.get_effective_stat(mon, 'atk'), 300)
+        self.assertEqual(Mechanics.stat_cache_stats()['hits'], 1)
+        # In-place stage edits change the key; status/ability writes drop the cache
+        mon['stat_stages']['atk'] = 0
+        self.assertEqual(Mechanics.get_effective_stat(mon, 'atk'), 150)
+        mon['status'] = 'brn'
+        self.assertEqual(Mechanics.get_effective_stat(mon, 'atk'), 75)
+        mon['_rich_ability'] = {'name': 'Defeatist', 'onModifyAtk': 0.5}
+        self.assertEqual(Mechanics.get_effective_stat(mon, 'atk'), 75)
+        mon['current_hp'] = 50
+        self.assertEqual(Mechanics.get_effective_stat(mon, 'atk'), 37)
+        stats = Mechanics.stat_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['invalidations']), (1, 5, 2))
+        # Field keys the stat depends on are part of the key
+        mon['_rich_ability'] = {'name': 'Swift Swim', 'onModifySpe': 2}
+        self.assertEqual(Mechanics.get_effective_stat(mon, 'spe', {'weather': 'Rain'}), 488)
+        self.assertEqual(Mechanics.get_effective_stat(mon, 'spe', {'weather': None}), 244)
+
+    def test_volatile_bits_are_unique_across_threads(self):
+        names = [f'test_volatile_{i}' for i in range(50)]
+        results = []
+        start = threading.Barrier(4)
+
+        def register():
+            start.wait()
+            results.append([volatile_bit(n) for n in names])
+
+        threads = [threading.Thread(target=register) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertTrue(all(r == results[0] for r in results))
+        self.assertEqual(len(set(results[0])), len(names))
+
+    def test_pickle_roundtrip(self):
+        clone = pickle.loads(pickle.dumps(self.mon))
+        self.assertIsInstance(clone, Mon)
+        self.assertEqual(clone, self.mon)
+
+
+class TestCompactState(unittest.TestCase):
+    def setUp(self):
+        self.p_active = {'species': 'Hero', 'current_hp': 100, 'max_hp': 100,
+                         'stat_stages': {'atk': 1}, 'volatiles': [], '_rich_moves': {}}
+        self.a_active = {'species': 'Villain', 'current_hp': 80, 'max_hp': 100, 'volatiles': []}
+        self.state = BattleState(
+            player_active=self.p_active,
+            ai_active=self.a_active,
+            player_party=[self.p_active],
+            ai_party=[self.a_active],
+        )
+
+    def test_compact_preserves_aliasing_and_hash(self):
+        legacy_hash = self.state.get_hash()
+        self.state.compact()
+        self.assertIsInstance(self.state.player_active, Mon)
+        self.assertIs(self.state.player_active, self.state.player_party[0])
+        self.assertEqual(self.state.get_hash(), legacy_hash)
+
+    def test_incremental_hash_tracks_writes(self):
+        dict_state = self.state.deep_copy()
+        self.state.compact()
+        for st in (self.state, dict_state):
+            mon = st.player_active
+            mon['current_hp'] = 42
+            mon['status'] = 'brn'
+            mon['stat_stages']['spe'] = 1
+            mon['volatiles'].append('taunt')
+            mon['volatiles'].append('confusion')
+            mon['volatiles'].remove('confusion')
+        self.assertEqual(self.state.get_hash(), dict_state.get_hash())
+
+        stages = self.state.player_active['stat_stages']
+        stages['spe'] = 0
+        neutral = self.state.get_hash()
+        # A neutral stage hashes like a missing one
+        stages.pop('spe')
+        self.assertEqual(self.state.get_hash(), neutral)
+        self.state.player_active['volatiles'].remove('taunt')
+        self.assertNotEqual(self.state.get_hash(), neutral)
+
+    def test_deep_copy_of_compact_state(self):
+        self.state.compact()
+        clone = self.state.deep_copy()
+        self.assertIs(clone.player_active, clone.player_party[0])
+        self.assertIs(clone.player_active['_rich_moves'], self.state.player_active['_rich_moves'])
+        clone.player_active['stat_stages']['atk'] = 6
+        clone.player_active['volatiles'].append('taunt')
+        self.assertEqual(self.state.player_active['stat_stages']['atk'], 1)
+        self.assertNotIn('taunt', self.state.player_active['volatiles'])
+        self.assertEqual(self.state.to_dict()['player_active']['stat_stages'], {'atk': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
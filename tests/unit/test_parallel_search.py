@@ -0,0 +1,43 @@
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from pkh_app.battle_engine import BattleEngine
+from pkh_app.ai_scorer import AIScorer
+from pkh_app.simulation import Simulation
+from tests.test_utils import create_search_state, run_search_subprocess
+
+
+class TestParallelSearch(unittest.TestCase):
+    def setUp(self):
+        self.engine = BattleEngine()
+        self.state = create_search_state(self.engine)
+
+    def search(self, workers):
+        sim = Simulation(self.engine, AIScorer(self.engine))
+        sim.max_depth = 3
+        sim.workers = workers
+        self.addCleanup(sim.close)
+        result = sim.run(self.state)
+        return result['best_action'], result['scores'], result['paths']
+
+    def test_workers_are_deterministic(self):
+        serial = self.search(0)
+        parallel = self.search(2)
+        self.assertEqual(self.search(2), parallel)
+        self.assertEqual(parallel[0], serial[0])
+        self.assertEqual(set(parallel[1]), set(serial[1]))
+
+    def test_workers_match_across_processes(self):
+        # Seeded sampling derives every seed from state keys, so this only
+        # agrees if the keys (root included) are the same in every process.
+        # Both runs use fresh interpreters: the suite patches the local calc
+        # in-process (tests/features/test_weather_debug.py)
+        settings = {'chance_mode': 'sample', 'seed': 42, 'max_depth': 3, 'workers': 2}
+        spawned = run_search_subprocess(1, worker_start_method='spawn', **settings)
+        self.assertEqual(run_search_subprocess(2, **settings), spawned)
+
+if __name__ == '__main__':
+    unittest.main()
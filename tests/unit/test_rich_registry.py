@@ -0,0 +1,57 @@
+import sys
+import os
+import json
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from pkh_app.battle_engine import BattleEngine, BattleState, RichRegistry
+
+
+class TestRichRegistry(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = BattleEngine()
+
+    def make_state(self):
+        p = {'species': 'Garchomp', 'current_hp': 100, 'max_hp': 100, 'ability': 'Rough Skin',
+             'item': 'Life Orb', 'moves': ['Earthquake', 'Dragon Claw']}
+        a = {'species': 'Tyranitar', 'current_hp': 100, 'max_hp': 100, 'ability': 'Sand Stream',
+             'item': 'Leftovers', 'moves': ['Crunch', 'Stone Edge']}
+        return BattleState(player_active=p, ai_active=a, player_party=[p], ai_party=[a])
+
+    def test_lookups_by_name(self):
+        reg = RichRegistry(self.engine.rich_data, self.engine.pokedex)
+        self.assertEqual(reg.get('items', 'Life Orb')['name'], 'Life Orb')
+        self.assertIs(reg.get('moves', 'U-turn'), self.engine.rich_data['moves']['uturn'])
+        self.assertIsNone(reg.get('abilities', 'Not An Ability'))
+        self.assertIn('Dragon', reg.species('Garchomp')['types'])
+
+    def test_enriched_records_are_shared(self):
+        s1, s2 = self.make_state(), self.make_state()
+        self.engine.enrich_state(s1)
+        self.engine.enrich_state(s2)
+        self.assertIs(s1.player_active['_rich_item'], s2.player_active['_rich_item'])
+        self.assertIs(s1.player_active['_rich_moves'], s2.player_active['_rich_moves'])
+        self.assertIs(s1.player_active['_rich_item'], self.engine.rich_data['items']['lifeorb'])
+
+    def test_moveset_key_modes(self):
+        reg = RichRegistry(self.engine.rich_data, self.engine.pokedex)
+        by_slug = reg.moveset(['Dragon Claw', 'Fake Move'])
+        by_name = reg.moveset(['Dragon Claw', 'Fake Move'], by_slug=False)
+        self.assertEqual(set(by_slug), {'dragonclaw', 'fakemove'})
+        self.assertEqual(by_slug['fakemove'], {})
+        self.assertEqual(set(by_name), {'Dragon Claw'})
+
+    def test_to_dict_skips_rich_data(self):
+        state = self.make_state()
+        self.engine.enrich_state(state)
+        exported = state.to_dict()
+        self.assertNotIn('_rich_item', exported['player_active'])
+        self.assertNotIn('_rich_moves', exported['ai_party'][0])
+        self.assertEqual(exported['player_active']['item'], 'Life Orb')
+        json.dumps(exported)
+
+
+if __name__ == '__main__':
+    unittest.main()
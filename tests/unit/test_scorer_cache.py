@@ -0,0 +1,78 @@
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from pkh_app.battle_engine import BattleState
+from pkh_app.ai_scorer import AIScorer
+
+
+class CountingCalc:
+    """Fixed damage per move; counts get_damage_rolls calls."""
+
+    def __init__(self):
+        self.calls = 0
+        self.damage = {'Tackle': 40, 'Slam': 70}
+
+    def get_damage_rolls(self, attacker, defender, moves, field):
+        self.calls += 1
+        return [{'moveName': m, 'category': 'Physical', 'damage_rolls': [self.damage[m]] * 16} for m in moves]
+
+
+def create_mon(name, hp=200):
+    return {'species': name, 'current_hp': hp, 'max_hp': 200, 'moves': ['Tackle', 'Slam'],
+            'stats': {'spe': 100}, 'ability': 'Pressure', 'item': None, 'status': None,
+            'volatiles': [], 'stat_stages': {}}
+
+
+class TestScorerCache(unittest.TestCase):
+    def setUp(self):
+        self.calc = CountingCalc()
+        self.scorer = AIScorer(self.calc)
+        ai = create_mon('Villain')
+        self.state = BattleState(create_mon('Hero'), ai, [create_mon('Hero')], [ai, create_mon('Backup')])
+
+    def test_hit_skips_calcs(self):
+        first = self.scorer.score_moves(self.state, 'ai')
+        calls = self.calc.calls
+        self.assertEqual(self.scorer.score_moves(self.state, 'ai'), first)
+        self.assertEqual(self.calc.calls, calls)
+        probs = self.scorer.action_distribution(self.state)
+        self.assertEqual(list(probs), ['Move: Slam'])
+        self.assertAlmostEqual(probs['Move: Slam'], 1.0)
+        stats = self.scorer.cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (2, 1))
+
+    def test_results_are_isolated(self):
+        self.scorer.score_moves(self.state, 'ai')['matrix'][0].append(99)
+        self.scorer.action_distribution(self.state)['Move: Tackle'] = 1.0
+        self.assertNotIn(99, self.scorer.score_moves(self.state, 'ai')['matrix'][0])
+        self.assertNotIn('Move: Tackle', self.scorer.action_distribution(self.state))
+
+    def test_scored_state_changes_invalidate(self):
+        self.scorer.score_moves(self.state, 'ai')
+        # Slam now kills
+        self.state.player_active['current_hp'] = 60
+        scored = self.scorer.score_moves(self.state, 'ai')
+        self.assertEqual(self.scorer.cache_stats()['hits'], 0)
+        self.assertEqual(scored, AIScorer(self.calc, cache_size=0).score_moves(self.state, 'ai'))
+        self.state.last_moves['ai'] = 'Slam'
+        self.state.ai_party[1]['current_hp'] = 0
+        self.state.fields['weather'] = 'Rain'
+        self.scorer.score_moves(self.state, 'ai')
+        self.assertEqual(self.scorer.cache_stats()['misses'], 3)
+
+    def test_lru_eviction_and_disable(self):
+        self.scorer.cache_size = 1
+        self.scorer.score_moves(self.state, 'ai')
+        self.scorer.score_moves(self.state, 'player')
+        self.assertEqual(self.scorer.cache_stats()['evictions'], 1)
+        self.scorer.cache_size = 0
+        self.scorer.clear_cache()
+        self.scorer.score_moves(self.state, 'ai')
+        self.assertEqual(self.scorer.cache_stats()['entries'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
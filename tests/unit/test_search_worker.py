@@ -0,0 +1,52 @@
+import sys
+import os
+import time
+import threading
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from pkh_app.battle_engine import BattleEngine
+from pkh_app.ai_scorer import AIScorer
+from pkh_app.simulation import Simulation, SearchWorker
+from tests.test_utils import create_search_state
+
+
+class TestSearchWorker(unittest.TestCase):
+    def setUp(self):
+        self.engine = BattleEngine()
+
+    def build(self, hp):
+        return create_search_state(self.engine, villain_hp=hp)
+
+    def final_result(self, worker, timeout=30):
+        end = time.monotonic() + timeout
+        while time.monotonic() < end:
+            result = worker.latest()
+            if result is not None and 'status' in result:
+                return result
+            time.sleep(0.01)
+        self.fail("search did not finish")
+
+    def test_cancelled_before_start(self):
+        cancel = threading.Event()
+        cancel.set()
+        result = Simulation(self.engine, AIScorer(self.engine)).run(self.build(150), cancel=cancel)
+        self.assertEqual((result['status'], result['final_depth'], result['best_action']), ('Cancelled', 0, None))
+
+    def test_publishes_latest_state_only(self):
+        worker = SearchWorker(self.engine, AIScorer(self.engine))
+        self.addCleanup(worker.close)
+        worker.submit(self.build(150))
+        state = self.build(20)
+        generation = worker.submit(state)
+        self.assertEqual(generation, 2)
+        result = self.final_result(worker)
+        expected = Simulation(BattleEngine(), AIScorer(self.engine)).run(state)
+        for key in ('best_action', 'scores', 'final_depth', 'status'):
+            self.assertEqual(result[key], expected[key])
+        self.assertIsNone(worker.latest())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+import os
+import copy
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from pkh_app.battle_engine import BattleState
+
+
+class TestStateCopy(unittest.TestCase):
+    def setUp(self):
+        self.rich_move = {'name': 'Tackle', 'basePower': 40}
+        self.rich_ability = {'name': 'Intimidate', 'boosts': {'atk': -1}}
+        self.p_active = {
+            'species': 'Hero', 'current_hp': 100, 'max_hp': 100,
+            'moves': ['Tackle'], 'stat_stages': {'atk': 1}, 'volatiles': ['confusion'],
+            '_rich_moves': {'tackle': self.rich_move}, '_rich_ability': self.rich_ability,
+        }
+        self.a_active = {'species': 'Villain', 'current_hp': 80, 'max_hp': 100, 'volatiles': []}
+        self.state = BattleState(
+            player_active=self.p_active,
+            ai_active=self.a_active,
+            player_party=[self.p_active],
+            ai_party=[self.a_active],
+        )
+
+    def test_copy_is_independent(self):
+        clone = self.state.deep_copy()
+        clone.player_active['current_hp'] = 1
+        clone.player_active['stat_stages']['atk'] = 6
+        clone.player_active['volatiles'].append('taunt')
+        clone.fields['screens']['ai']['reflect'] = 5
+        clone.fields['hazards']['player'].append('Spikes')
+        clone.last_moves['ai'] = 'Move: Tackle'
+
+        self.assertEqual(self.p_active['current_hp'], 100)
+        self.assertEqual(self.p_active['stat_stages'], {'atk': 1})
+        self.assertEqual(self.p_active['volatiles'], ['confusion'])
+        self.assertEqual(self.state.fields['screens']['ai']['reflect'], 0)
+        self.assertEqual(self.state.fields['hazards']['player'], [])
+        self.assertIsNone(self.state.last_moves['ai'])
+
+    def test_rich_data_is_shared(self):
+        clone = self.state.deep_copy()
+        self.assertIs(clone.player_active['_rich_moves'], self.p_active['_rich_moves'])
+        self.assertIs(clone.player_active['_rich_ability'], self.rich_ability)
+
+    def test_aliasing_preserved(self):
+        # Active mon that is also the party entry stays a single object
+        clone = self.state.deep_copy()
+        self.assertIs(clone.player_active, clone.player_party[0])
+        self.assertIs(clone.ai_active, clone.ai_party[0])
+
+    def test_matches_deepcopy(self):
+        clone = self.state.deep_copy()
+        legacy = copy.deepcopy(self.state)
+        self.assertEqual(clone.player_active, legacy.player_active)
+        self.assertEqual(clone.ai_party, legacy.ai_party)
+        self.assertEqual(clone.fields, legacy.fields)
+        self.assertEqual(clone.get_hash(), legacy.get_hash())
+
+
+if __name__ == '__main__':
+    unittest.main()
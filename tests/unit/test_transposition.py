@@ -0,0 +1,55 @@
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from pkh_app.transposition import TranspositionTable, TTEntry
+
+
+def entry(depth, value=0.0):
+    return TTEntry(depth, value, ('Move: Tackle', 'Move: Growl'), [], [])
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_depth_preferred_replacement(self):
+        tt = TranspositionTable(10)
+        tt.store(1, entry(3, 30.0))
+        tt.store(1, entry(2, 20.0))
+        self.assertEqual(tt.get(1).value, 30.0)
+        tt.store(1, entry(4, 40.0))
+        self.assertEqual(tt.get(1).depth, 4)
+
+    def test_lru_eviction(self):
+        tt = TranspositionTable(2)
+        tt.store(1, entry(1))
+        tt.store(2, entry(1))
+        tt.get(1)  # 2 is now least recently used
+        tt.store(3, entry(1))
+        self.assertIsNotNone(tt.get(1))
+        self.assertIsNone(tt.get(2))
+        self.assertEqual(tt.stats()['evictions'], 1)
+
+    def test_children_and_stats(self):
+        tt = TranspositionTable(10)
+        self.assertIsNone(tt.get_child(1, 'Move: Tackle', 'Move: Growl'))
+        tt.store_child(1, 'Move: Tackle', 'Move: Growl', ('state', ['log']))
+        self.assertEqual(tt.get_child(1, 'Move: Tackle', 'Move: Growl'), ('state', ['log']))
+        stats = tt.stats()
+        self.assertEqual((stats['child_hits'], stats['child_misses']), (1, 1))
+        tt.clear()
+        self.assertEqual(len(tt), 0)
+        self.assertEqual(tt.stats()['child_hits'], 0)
+
+    def test_child_evictions_counted_separately(self):
+        tt = TranspositionTable(1)
+        tt.store_child(1, 'Move: Tackle', 'Move: Growl', ('a', []))
+        tt.store_child(2, 'Move: Tackle', 'Move: Growl', ('b', []))
+        stats = tt.stats()
+        self.assertEqual((stats['evictions'], stats['child_evictions']), (0, 1))
+        tt.clear()
+        self.assertEqual(tt.stats()['child_evictions'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import sys
+import os
+import itertools
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from pkh_app.type_chart import TYPE_CHART, TYPES, effectiveness_table, type_effectiveness
+
+
+def reference(move_type, defender_types):
+    eff = 1.0
+    for t in defender_types:
+        eff *= TYPE_CHART.get(move_type, {}).get(t, 1.0)
+    return eff
+
+
+class TestTypeChart(unittest.TestCase):
+    def test_matches_chart_for_all_combinations(self):
+        defenders = [[t] for t in TYPES] + [list(p) for p in itertools.product(TYPES, repeat=2)]
+        for move_type in TYPES:
+            for types in defenders:
+                self.assertEqual(type_effectiveness(move_type, types), reference(move_type, types))
+
+    def test_unknown_and_extra_types(self):
+        self.assertEqual(type_effectiveness('Stellar', ['Water']), 1.0)
+        self.assertEqual(type_effectiveness('Fire', []), 1.0)
+        self.assertEqual(type_effectiveness('Fire', ['Grass', '???']), 2.0)
+        # Forest's Curse adds a third type
+        self.assertEqual(type_effectiveness('Fire', ['Bug', 'Steel', 'Grass']), 8.0)
+
+    def test_batched_lookup(self):
+        moves = ['Ground', 'Electric', 'Nope']
+        defenders = [['Flying'], ['Water', 'Ground'], ['Fire', 'Steel']]
+        table = effectiveness_table(moves, defenders)
+        self.assertEqual(table, [[type_effectiveness(m, d) for d in defenders] for m in moves])
+        self.assertEqual(table[0], [0.0, 1.0, 4.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
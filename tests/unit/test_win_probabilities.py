@@ -0,0 +1,60 @@
+import sys
+import os
+import random
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from pkh_app.ai_scorer import AIScorer
+
+WEIGHTS = [0.25, 0.25, 0.25, 0.05, 0.20]
+
+
+def reference(matrix, weights):
+    # Row-by-row scan the pooled version replaces
+    probs = [0.0] * len(matrix[0])
+    for row_idx, scores in enumerate(matrix):
+        weight = (1.0 / 16.0) * weights[row_idx % len(weights)]
+        max_s = max(scores)
+        winners = [i for i, s in enumerate(scores) if s == max_s]
+        for w in winners:
+            probs[w] += weight / len(winners)
+    return probs
+
+
+class TestWinProbabilities(unittest.TestCase):
+    def test_ties_split_evenly(self):
+        matrix = [[6, 6, 0]] * 80
+        self.assertEqual(AIScorer.win_probabilities(matrix, WEIGHTS), [0.5, 0.5, 0.0])
+
+    def test_matches_row_scan(self):
+        matrix = []
+        for r in range(16):
+            for v in range(5):
+                kills = r >= 10
+                matrix.append([8 if v == 4 else 6, 9 if kills else 5, -20 if v >= 2 else 6])
+        probs = AIScorer.win_probabilities(matrix, WEIGHTS)
+        for got, want in zip(probs, reference(matrix, WEIGHTS)):
+            self.assertAlmostEqual(got, want)
+        self.assertAlmostEqual(sum(probs), 1.0)
+
+    def test_columns_match_matrix(self):
+        rng = random.Random(3)
+        for _ in range(50):
+            columns = []
+            for _ in range(rng.randint(1, 6)):
+                keys = [rng.choice('abc') for _ in range(16)]
+                columns.append((keys, {k: [rng.randint(-20, 10) for _ in range(5)] for k in set(keys)}))
+            matrix = AIScorer._build_matrix(columns)
+            self.assertEqual(len(matrix), 80)
+            probs = AIScorer._column_win_probabilities(columns, WEIGHTS)
+            for got, want in zip(probs, reference(matrix, WEIGHTS)):
+                self.assertAlmostEqual(got, want)
+
+    def test_empty(self):
+        self.assertEqual(AIScorer.win_probabilities([], WEIGHTS), [])
+        self.assertEqual(AIScorer.win_probabilities([[] for _ in range(80)], WEIGHTS), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,235 @@
+import os
+import sys
+import io
+import copy
+import time
+import argparse
+import tracemalloc
+import contextlib
+
+# Add project root to path
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from pkh_app.battle_engine import BattleEngine, BattleState
+from pkh_app.ai_scorer import AIScorer
+from pkh_app.simulation import Simulation
+from pkh_app.mechanics import Mechanics
+
+
+TYPES = {
+    'Garchomp': ['Dragon', 'Ground'], 'Rotom-Wash': ['Electric', 'Water'], 'Ferrothorn': ['Grass', 'Steel'],
+    'Tyranitar': ['Rock', 'Dark'], 'Gengar': ['Ghost', 'Poison'], 'Scizor': ['Bug', 'Steel'],
+}
+
+
+def make_mon(species, moves, ability, item, stats, hp, side):
+    return {
+        'species': species, 'name': species, 'level': 50, 'types': list(TYPES[species]),
+        'current_hp': hp, 'max_hp': hp,
+        'moves': moves, 'ability': ability, 'item': item, 'stats': stats,
+        'stat_stages': {}, 'volatiles': [], 'status': None, 'side': side,
+    }
+
+
+def build_sample_state(engine):
+    """3v3 mid-game position with real species/moves used by every benchmark."""
+    player = [
+        make_mon('Garchomp', ['Earthquake', 'Dragon Claw', 'Swords Dance', 'Fire Fang'], 'Rough Skin', 'Life Orb',
+                 {'atk': 150, 'def': 115, 'spa': 80, 'spd': 105, 'spe': 122}, 183, 'player'),
+        make_mon('Rotom-Wash', ['Hydro Pump', 'Thunderbolt', 'Will-O-Wisp', 'Protect'], 'Levitate', 'Leftovers',
+                 {'atk': 65, 'def': 127, 'spa': 125, 'spd': 127, 'spe': 106}, 137, 'player'),
+        make_mon('Ferrothorn', ['Power Whip', 'Gyro Ball', 'Stealth Rock', 'Leech Seed'], 'Iron Barbs', 'Leftovers',
+                 {'atk': 114, 'def': 151, 'spa': 74, 'spd': 136, 'spe': 40}, 149, 'player'),
+    ]
+    ai = [
+        make_mon('Tyranitar', ['Crunch', 'Stone Edge', 'Earthquake', 'Dragon Dance'], 'Sand Stream', 'Choice Band',
+                 {'atk': 154, 'def': 130, 'spa': 95, 'spd': 120, 'spe': 81}, 175, 'ai'),
+        make_mon('Gengar', ['Shadow Ball', 'Sludge Bomb', 'Focus Blast', 'Thunderbolt'], 'Cursed Body', 'Leftovers',
+                 {'atk': 70, 'def': 65, 'spa': 150, 'spd': 80, 'spe': 130}, 135, 'ai'),
+        make_mon('Scizor', ['Bullet Punch', 'U-turn', 'Swords Dance', 'X-Scissor'], 'Technician', 'Leftovers',
+                 {'atk': 150, 'def': 120, 'spa': 60, 'spd': 100, 'spe': 85}, 145, 'ai'),
+    ]
+    state = BattleState(
+        player_active=dict(player[0]),
+        ai_active=dict(ai[0]),
+        player_party=player,
+        ai_party=ai,
+    )
+    engine.enrich_state(state)
+    return state
+
+
+def timeit(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def allocated_bytes(fn):
+    tracemalloc.start()
+    kept = fn()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def bench_copy(engine, state, repeat):
+    legacy = timeit(lambda: copy.deepcopy(state), repeat)
+    current = timeit(state.deep_copy, repeat)
+    # One simulate_branch ply = one apply_turn per player action (greedy pick)
+    # plus the chosen turn. Previously each of those copied the state twice.
+    per_ply = len(engine.get_valid_actions(state, 'player')) + 1
+    print("[copy]")
+    print(f"  copy.deepcopy        : {legacy * 1e6:9.1f} us/copy  {legacy * 2 * per_ply * 1e3:7.2f} ms/ply")
+    print(f"  BattleState.deep_copy: {current * 1e6:9.1f} us/copy  {current * per_ply * 1e3:7.2f} ms/ply")
+    print(f"  speedup              : {legacy / current:9.1f}x per copy")
+    legacy_mem = allocated_bytes(lambda: copy.deepcopy(state))
+    current_mem = allocated_bytes(state.deep_copy)
+    print(f"  memory/node          : {legacy_mem / 1024:9.1f} KiB -> {current_mem / 1024:.1f} KiB")
+
+
+def bench_mon(engine, state, repeat):
+    compact = state.deep_copy().compact()
+    print("[mon]")
+    for label, st in (("dict", state), ("Mon", compact)):
+        copy_t = timeit(st.deep_copy, repeat)
+        mem = allocated_bytes(st.deep_copy)
+        stat_t = timeit(lambda: Mechanics.get_effective_stat(st.player_active, 'atk', st.fields), repeat * 10)
+        print(f"  {label:4} deep_copy {copy_t * 1e6:7.1f} us  {mem / 1024:5.2f} KiB/node  "
+              f"get_effective_stat {stat_t * 1e6:5.2f} us")
+
+
+def bench_hash(engine, state, repeat):
+    compact = state.deep_copy().compact()
+    print("[hash]")
+    for label, st in (("dict", state), ("Mon", compact)):
+        print(f"  {label:4} get_hash {timeit(st.get_hash, repeat * 10) * 1e6:6.2f} us")
+
+
+def bench_search(engine, state, depth, workers=0):
+    print("[search]")
+    for compact in (False, True):
+        sim = Simulation(engine, AIScorer(engine))
+        sim.max_depth = depth
+        sim.compact_mons = compact
+        Mechanics.reset_stat_cache_stats()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = sim.run(state)
+        elapsed = time.perf_counter() - start
+        print(f"  Simulation.run depth<={depth} compact={compact!s:5}: {elapsed:.3f}s  "
+              f"best={result['best_action']} depth={result['final_depth']} ({result['status']})")
+    stat_cache = Mechanics.stat_cache_stats()
+    print(f"    effective-stat cache: {stat_cache['hit_rate']:.1%} hits "
+          f"({stat_cache['hits']} / {stat_cache['hits'] + stat_cache['misses']}), "
+          f"{stat_cache['invalidations']} invalidations")
+    sim = Simulation(engine, AIScorer(engine))
+    sim.max_depth = depth
+    sim.tt_size = 0
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = sim.run(state)
+    print(f"  Simulation.run depth<={depth} no TT        : {time.perf_counter() - start:.3f}s  "
+          f"best={result['best_action']} depth={result['final_depth']} ({result['status']})")
+    if workers > 1:
+        sim = Simulation(engine, AIScorer(engine))
+        sim.max_depth = depth
+        sim.workers = workers
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = sim.run(state)
+        sim.close()
+        print(f"  Simulation.run depth<={depth} workers={workers:<2}   : {time.perf_counter() - start:.3f}s  "
+              f"best={result['best_action']} depth={result['final_depth']} ({result['status']})")
+
+
+def bench_chance(engine, state, depth):
+    print("[chance]")
+    p_action = engine.get_valid_actions(state, 'player')[0]
+    ai_action = engine.get_valid_actions(state, 'ai')[0]
+    with contextlib.redirect_stdout(io.StringIO()):
+        outcomes = engine.apply_turn_distribution(state, p_action, ai_action)
+    print(f"  {p_action} vs {ai_action}: {len(outcomes)} outcomes")
+    for prob, st, _ in outcomes:
+        print(f"    p={prob:.3f}  player hp={st.player_active.get('current_hp')}  "
+              f"ai hp={st.ai_active.get('current_hp')}")
+    for mode in ('sample', 'expectimax'):
+        sim = Simulation(engine, AIScorer(engine))
+        sim.max_depth = depth
+        sim.chance_mode = mode
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = sim.run(state)
+        print(f"  Simulation.run depth<={depth} {mode:10}: {time.perf_counter() - start:.3f}s  "
+              f"best={result['best_action']} scores={ {a: round(v, 1) for a, v in result['scores'].items()} }")
+
+
+class FixedRolls:
+    """Replays precomputed damage rolls so only the scoring itself is timed."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._memo = {}
+
+    def get_damage_rolls(self, attacker, defender, moves, fields):
+        key = (id(attacker), id(defender))
+        if key not in self._memo:
+            self._memo[key] = self.engine.get_damage_rolls(attacker, defender, moves, fields)
+        # score_moves rescales damage_rolls in place
+        return [dict(res, damage_rolls=list(res.get('damage_rolls', []))) for res in self._memo[key]]
+
+
+def bench_scorer(engine, state, repeat):
+    scorer = AIScorer(engine, cache_size=0)
+    sim = Simulation(engine, scorer)
+    fixed = AIScorer(FixedRolls(engine), cache_size=0)
+    cached = AIScorer(engine)
+    with contextlib.redirect_stdout(io.StringIO()):
+        score_t = timeit(lambda: scorer.score_moves(state, 'ai'), repeat)
+        fixed.score_moves(state, 'ai')
+        fixed_t = timeit(lambda: fixed.score_moves(state, 'ai'), repeat)
+        probs_t = timeit(lambda: sim.get_ai_action_probs(state), repeat)
+        hit_t = timeit(lambda: cached.action_distribution(state), repeat)
+    print("[scorer]")
+    print(f"  AIScorer.score_moves           : {score_t * 1e3:7.3f} ms")
+    print(f"    scoring only (fixed rolls)   : {fixed_t * 1e3:7.3f} ms")
+    print(f"  Simulation.get_ai_action_probs : {probs_t * 1e3:7.3f} ms")
+    print(f"  action_distribution (cached)   : {hit_t * 1e3:7.3f} ms  {cached.cache_stats()['hit_rate']:.1%} hits")
+
+
+BENCHES = ['copy', 'mon', 'hash', 'search', 'chance', 'scorer']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the search hot paths.")
+    parser.add_argument("benches", nargs="*", default=BENCHES, help=f"Subset of {BENCHES}")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=0, help="Also time a process-pool search")
+    args = parser.parse_args()
+
+    engine = BattleEngine()
+    state = build_sample_state(engine)
+
+    for name in args.benches:
+        if name == 'copy':
+            bench_copy(engine, state, args.repeat)
+        elif name == 'mon':
+            bench_mon(engine, state, args.repeat)
+        elif name == 'hash':
+            bench_hash(engine, state, args.repeat)
+        elif name == 'search':
+            bench_search(engine, state, args.depth, args.workers)
+        elif name == 'chance':
+            bench_chance(engine, state, args.depth)
+        elif name == 'scorer':
+            bench_scorer(engine, state, args.repeat)
+        else:
+            print(f"Unknown benchmark: {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+import argparse
+
+# Add project root to path
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from pkh_app.game_data import GameData, DATA_DIR
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile data/*.json into the binary game-data bundle.")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory holding the source JSON files")
+    parser.add_argument("--out", default=None, help="Bundle path (default: <data-dir>/game_data.bundle)")
+    parser.add_argument("--check", action="store_true", help="Only report whether the bundle is up to date")
+    args = parser.parse_args()
+
+    data = GameData(args.data_dir, bundle_path=args.out)
+    if args.check:
+        fresh = data.bundle_is_fresh()
+        print(f"{data.bundle_path}: {'up to date' if fresh else 'missing or stale'}")
+        sys.exit(0 if fresh else 1)
+
+    start = time.perf_counter()
+    header = data.build_bundle()
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    GameData(args.data_dir, bundle_path=args.out).get("mechanics")
+    loaded = time.perf_counter() - start
+
+    size = os.path.getsize(data.bundle_path)
+    print(f"Wrote {data.bundle_path} ({size / 1024:.0f} KB, hash {header['hash']})")
+    print(f"Build: {built * 1000:.1f} ms, bundle load: {loaded * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
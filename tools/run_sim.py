@@ -1,6 +1,5 @@
 import os
 import sys
-import json
 import argparse
 import re
 import math
@@ -11,10 +10,16 @@ sys.path.append(BASE_DIR)
 
 from pkh_app.strategy_advisor import StrategyAdvisor
 from pkh_app.state_parser import parse_state
+from pkh_app.game_data import GAME_DATA
 
 def main():
     parser = argparse.ArgumentParser(description="Run Pokemon Battle Simulation on a state file.")
     parser.add_argument("file", help="Path to the battle_state.json file")
+    parser.add_argument("--budget", type=float, default=None,
+                        help="Search time budget in seconds (returns the deepest completed depth)")
+    parser.add_argument("--mode", choices=["deepening", "mcts"], default="deepening",
+                        help="Search algorithm: iterative deepening or Monte Carlo Tree Search")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes for the search")
     args = parser.parse_args()
 
     if not os.path.exists(args.file):
@@ -22,17 +27,8 @@ def main():
         return
 
     # Load metadata for names
-    moves_path = os.path.join(BASE_DIR, "data", "moves.json")
-    species_path = os.path.join(BASE_DIR, "data", "species.json")
-    
-    def load_json(path):
-        if os.path.exists(path):
-            with open(path, 'r') as f:
-                return json.load(f)
-        return {}
-
-    move_names = load_json(moves_path)
-    species_names = load_json(species_path)
+    move_names = GAME_DATA.moves
+    species_names = GAME_DATA.species
 
     print(f"Analyzing state: {args.file}...")
     states_data = parse_state(args.file)
@@ -51,16 +47,23 @@ def main():
         test_cases = [{"name": "Legacy State", "state": states_data}]
 
     advisor = StrategyAdvisor(species_names, move_names)
+    advisor.sim.search_mode = args.mode
+    advisor.sim.workers = args.workers
     
     for case in test_cases:
         name = case.get('name', 'Unnamed Test')
         state_dict = case.get('state', case)
         
         print(f"\n>>> RUNNING TEST: {name}")
-        print("Running Simulation (Iterative Deepening, Max Depth 20)...")
+        if args.mode == "mcts":
+            print(f"Running Simulation (MCTS, {advisor.sim.mcts_iterations} Playouts)...")
+        elif args.budget is not None:
+            print(f"Running Simulation (Iterative Deepening, Max Depth 20, Budget {args.budget:.2f}s)...")
+        else:
+            print("Running Simulation (Iterative Deepening, Max Depth 20)...")
         
         try:
-            result = advisor.run_simulation(state_dict)
+            result = advisor.run_simulation(state_dict, time_budget=args.budget)
         except Exception as e:
             import traceback
             traceback.print_exc()
@@ -87,7 +90,7 @@ def main():
         print("\n" + "="*30)
         print("      STRATEGY ADVISOR")
         print("="*30)
-        print(f"DEPTH REACHED : {depth} turns ({status})")
+        print(f"DEPTH REACHED : {depth} turns ({status}, {result.get('elapsed', 0):.2f}s)")
         print(f"RECOMMENDATION: {format_action(best)}")
         print("-" * 30)
         print("Analysis (Higher is better):")
@@ -96,7 +99,9 @@ def main():
         
         for act, score in sorted_scores:
             marker = ">>" if act == best else "  "
-            print(f" {marker} {format_action(act):<25} : {score:.1f}")
+            visits = result.get('visits')
+            visit_str = f" ({visits.get(act, 0)} visits)" if visits else ""
+            print(f" {marker} {format_action(act):<25} : {score:.1f}{visit_str}")
             
             # Show top lines for this action
             if act in paths:
@@ -138,5 +143,7 @@ def main():
                 print()
         print("="*30)
 
+    advisor.sim.close()
+
 if __name__ == "__main__":
     main()